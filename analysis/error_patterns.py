@@ -73,7 +73,7 @@ def analyze_error_patterns(df: pd.DataFrame, train_split: float = 0.7) -> Dict:
 
     # Train
     print(f"\n[PROCESSING] Training on {len(train_df)} matches...")
-    for _, row in train_df.iterrows():
+    for row in train_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -98,7 +98,7 @@ def analyze_error_patterns(df: pd.DataFrame, train_split: float = 0.7) -> Dict:
     errors_by_tournament = defaultdict(lambda: {'correct': 0, 'total': 0})
     errors_by_closeness = defaultdict(lambda: {'correct': 0, 'total': 0})
 
-    for _, row in test_df.iterrows():
+    for row in test_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -282,7 +282,7 @@ def print_error_analysis(results: Dict):
 if __name__ == "__main__":
     # Load data
     print("\n[LOADING] Loading data...")
-    with UnifiedDataLoader() as loader:
+    with UnifiedDataLoader(use_store=True) as loader:
         df = loader.load_matches(source='auto')
 
     print(f"[OK] Loaded {len(df)} matches")
@@ -77,7 +77,7 @@ def evaluate_configuration(df: pd.DataFrame, config_obj: FeatureConfig,
         )
 
     # Train on training data
-    for _, row in train_df.iterrows():
+    for row in train_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -108,7 +108,7 @@ def evaluate_configuration(df: pd.DataFrame, config_obj: FeatureConfig,
     test_total = 0
 
     # Test set evaluation
-    for _, row in test_df.iterrows():
+    for row in test_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -156,7 +156,7 @@ def evaluate_configuration(df: pd.DataFrame, config_obj: FeatureConfig,
         scale_factors=config.SCALE_FACTORS if config_obj.use_scale else None
     )
 
-    for _, row in train_df.iterrows():
+    for row in train_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -317,7 +317,7 @@ def print_comparison_table(results: List[Dict]):
 if __name__ == "__main__":
     # Load data
     print("\n[LOADING] Loading data...")
-    with UnifiedDataLoader() as loader:
+    with UnifiedDataLoader(use_store=True) as loader:
         df = loader.load_matches(source='auto')
 
     print(f"[OK] Loaded {len(df)} matches")
@@ -51,6 +51,16 @@ SCALE_FACTORS = {
 }
 
 
+# ============================================================================
+# WARM-UP
+# ============================================================================
+
+# Configs precomputed in the background after every import (all variants x
+# these K-factors), so the first dashboard visitor does not pay for them
+WARMUP_VARIANTS = ['tournament_context', 'dynamic_offset', 'scale_factor', 'base']
+WARMUP_K_FACTORS = [K_FACTOR]
+
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
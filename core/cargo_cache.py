@@ -0,0 +1,291 @@
+"""
+Cargo Response Cache for LOL ELO System
+Persistent, content-addressed cache of Leaguepedia Cargo query results
+
+Re-running discovery or re-importing after a fix asks the API for the same
+pages again, each one paced by the rate limit. Responses are stored in a
+small SQLite file next to the main database, keyed by a hash of the
+normalized query parameters.
+
+Freshness:
+- Queries that only touch closed seasons (every year in the WHERE clause is
+  before the current year) are kept for CLOSED_SEASON_TTL.
+- Everything else expires after the TTL of its table (TABLE_TTLS).
+
+The file is bounded by max_bytes; least recently used responses are
+evicted first. In offline mode only cached responses are served (expired
+ones included) and misses return nothing instead of hitting the network.
+
+Environment:
+    LEAGUEPEDIA_OFFLINE=1   replay from the cache only
+    LEAGUEPEDIA_CACHE=0     disable the cache
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class CargoCache:
+    """
+    SQLite-backed response cache for cargoquery requests
+
+    Usage:
+        cache = CargoCache("db/cargo_cache.db")
+        rows = cache.get(params)          # None on miss
+        if rows is None:
+            rows = fetch(params)
+            cache.put(params, rows)
+    """
+
+    # TTL for queries that may still change (current split / unknown season)
+    TABLE_TTLS = {
+        'MatchSchedule': 6 * HOUR,
+        'ScoreboardGames': 6 * HOUR,
+        'ScoreboardPlayers': 6 * HOUR,
+        'Rosters': DAY,
+        'Teams': 7 * DAY,
+    }
+    DEFAULT_TTL = DAY
+    CLOSED_SEASON_TTL = 365 * DAY
+
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    # Parameters whose whitespace and comma spacing carry no meaning
+    LIST_PARAMS = ('tables', 'fields', 'order_by', 'group_by', 'join_on')
+
+    def __init__(self, path, max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        """
+        Open (or create) a cache file
+
+        Args:
+            path: SQLite file of the cache
+            max_bytes: Size budget for stored responses
+            offline: Serve only cached responses, never report a miss as fetchable
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                tables TEXT NOT NULL,
+                params TEXT NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self.conn.commit()
+
+    # ========== KEYS & TTL ==========
+
+    @classmethod
+    def normalize(cls, params: Dict) -> Dict:
+        """Canonical form of query parameters (same query -> same key)"""
+        normalized = {}
+        for name, value in params.items():
+            if name == 'format':
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if name in cls.LIST_PARAMS:
+                    value = re.sub(r'\s*,\s*', ',', re.sub(r'\s+', ' ', value))
+            normalized[name] = value
+        return normalized
+
+    @classmethod
+    def make_key(cls, params: Dict) -> str:
+        """Content address of a query"""
+        return hashlib.sha256(json.dumps(cls.normalize(params), sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def table_names(params: Dict) -> List[str]:
+        """Cargo tables of a query (aliases stripped)"""
+        return [table.split('=')[0].strip() for table in params.get('tables', '').split(',') if table.strip()]
+
+    def ttl_for(self, params: Dict) -> int:
+        """
+        Seconds a response stays fresh
+
+        Args:
+            params: Query parameters
+
+        Returns:
+            CLOSED_SEASON_TTL if the query only names past years, else the
+            shortest TTL of its tables
+        """
+        years = [int(year) for year in re.findall(r'\b(20\d\d)\b', str(params.get('where', '')))]
+        if years and max(years) < datetime.now().year:
+            return self.CLOSED_SEASON_TTL
+
+        return min((self.TABLE_TTLS.get(table, self.DEFAULT_TTL) for table in self.table_names(params)),
+                   default=self.DEFAULT_TTL)
+
+    # ========== ACCESS ==========
+
+    def get(self, params: Dict) -> Optional[List[Dict]]:
+        """
+        Get a cached response
+
+        Args:
+            params: Query parameters
+
+        Returns:
+            Result rows, or None if not cached or expired (offline mode
+            also serves expired responses)
+        """
+        key = self.make_key(params)
+        now = time.time()
+
+        with self._lock:
+            row = self.conn.execute("SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] < now and not self.offline):
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, params: Dict, rows: List[Dict]):
+        """
+        Store a successful response (evicts LRU responses beyond max_bytes)
+
+        Args:
+            params: Query parameters
+            rows: Result rows
+        """
+        body = json.dumps(rows)
+        now = time.time()
+
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO responses
+                (key, tables, params, body, size, fetched_at, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                self.make_key(params),
+                ','.join(self.table_names(params)),
+                json.dumps(self.normalize(params), sort_keys=True),
+                body,
+                len(body),
+                now,
+                now + self.ttl_for(params),
+                now
+            ))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Delete least recently used responses until the size budget holds (caller commits)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        cursor = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at")
+        evict = []
+        for key, size in cursor:
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+
+    # ========== MAINTENANCE ==========
+
+    def prune_expired(self) -> int:
+        """Delete expired responses (returns count)"""
+        with self._lock:
+            cursor = self.conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self.conn.commit()
+            return cursor.rowcount
+
+    def clear(self, table: str = None) -> int:
+        """
+        Delete cached responses
+
+        Args:
+            table: Only responses of queries on this Cargo table (default: all)
+
+        Returns:
+            Number of responses deleted
+        """
+        with self._lock:
+            if table:
+                cursor = self.conn.execute(
+                    "DELETE FROM responses WHERE ',' || tables || ',' LIKE ?", (f"%,{table},%",)
+                )
+            else:
+                cursor = self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict:
+        """Get entry count, size, expired count and hit/miss counters"""
+        with self._lock:
+            entries, size, expired = self.conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires_at < ?), 0)
+                FROM responses
+            """, (time.time(),)).fetchone()
+
+        return {
+            'entries': entries,
+            'bytes': size,
+            'expired': expired,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'offline': self.offline,
+        }
+
+    def close(self):
+        """Close the cache file"""
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect or clear the Cargo response cache')
+    parser.add_argument('--path', type=str, default='db/cargo_cache.db', help='Cache file')
+    parser.add_argument('--clear', nargs='?', const='', metavar='TABLE',
+                        help='Delete cached responses (optionally only for one Cargo table)')
+    parser.add_argument('--prune', action='store_true', help='Delete expired responses')
+
+    args = parser.parse_args()
+    cache = CargoCache(args.path)
+
+    if args.clear is not None:
+        print(f"[OK] Deleted {cache.clear(args.clear or None)} cached responses")
+    if args.prune:
+        print(f"[OK] Deleted {cache.prune_expired()} expired responses")
+
+    stats = cache.stats()
+    print(f"Entries: {stats['entries']} ({stats['expired']} expired)")
+    print(f"Size:    {stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    cache.close()
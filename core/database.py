@@ -4,10 +4,60 @@ Manages storage of matches, teams, players, and tournaments
 """
 
 import sqlite3
-from datetime import datetime
+import calendar
+from datetime import datetime, date as date_type
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import json
+import os
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+
+from core.query_profiler import PROFILER, ProfiledConnection
+
+
+SECONDS_PER_DAY = 86400
+
+
+def date_to_epoch(value) -> Optional[int]:
+    """
+    Convert a match date to the canonical integer epoch stored in date_ts
+
+    Naive datetimes are treated as UTC, matching SQLite's strftime('%s', ...).
+
+    Args:
+        value: datetime, date, pandas Timestamp, ISO string or epoch int
+
+    Returns:
+        Seconds since 1970-01-01 UTC, or None if value is empty/unparseable
+    """
+    if value is None or value == '':
+        return None
+    # NaN / NaT (missing dates in pandas rows) are the only values unequal to themselves
+    if value != value:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    # Convert pandas Timestamp to Python datetime if needed
+    if hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return int(value.timestamp())
+        return calendar.timegm(value.timetuple())
+
+    if isinstance(value, date_type):
+        return calendar.timegm(value.timetuple())
+
+    return None
 
 
 class DatabaseManager:
@@ -16,30 +66,300 @@ class DatabaseManager:
     Handles schema creation, data insertion, and deduplication
     """
 
-    def __init__(self, db_path: str = "db/elo_system.db"):
+    REPLICA_MODES = ('memory', 'readonly')
+    MMAP_SIZE = 1024 * 1024 * 1024  # 1 GB, upper bound for read-only mapping
+    BUSY_TIMEOUT_MS = 30000         # wait this long for another writer's lock
+
+    # Tables moved into sealed season archives, with their unified view names
+    PARTITIONED_TABLES = {'matches': 'all_matches', 'match_players': 'all_match_players'}
+
+    # Secondary indexes that bulk loads may drop and rebuild (see deferred_indexes)
+    DEFERRABLE_INDEXES = {
+        'elo_ratings': {
+            'idx_elo_ratings_config': 'elo_ratings(config_id)',
+            'idx_elo_ratings_team': 'elo_ratings(team_id)',
+            'idx_elo_ratings_date': 'elo_ratings(date)',
+            'idx_elo_ratings_team_date': 'elo_ratings(team_id, date_ts)',
+        },
+    }
+
+    def __init__(self, db_path: str = "db/elo_system.db", replica: str = None,
+                 instrument: bool = None):
         """
         Initialize database manager
 
         Args:
             db_path: Path to SQLite database file
+            replica: Optional read replica for heavy read workloads
+                None: read and write the file directly (default)
+                'memory': copy the file into RAM with the backup API; reads
+                          hit RAM, writes go to the file and are mirrored
+                'readonly': read-only, memory-mapped connection to the file
+            instrument: Record query statistics in core.query_profiler.PROFILER
+                        (default: PROFILER.enabled, set via ELO_DB_PROFILE=1)
         """
+        if replica is not None and replica not in self.REPLICA_MODES:
+            raise ValueError(f"Unknown replica mode: {replica}")
+
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.replica = replica
+        self.instrument = PROFILER.enabled if instrument is None else instrument
+        self._factory = ProfiledConnection if self.instrument else sqlite3.Connection
+        self.archive_dir = self.db_path.parent / "archive"
+        self.matches_table = 'matches'
+        self.match_players_table = 'match_players'
+        self._archive_schemas = []
+        self._batch_depth = 0
+        self._replica_stale = False
         self.conn = None
+        self.write_conn = None
         self._connect()
         self._initialize_schema()
 
+        if replica:
+            self._open_replica()
+
+        self._attach_archives()
+
     def _connect(self):
         """Establish database connection"""
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, factory=self._factory)
         self.conn.row_factory = sqlite3.Row  # Access columns by name
         # Enable foreign keys
         self.conn.execute("PRAGMA foreign_keys = ON")
+        # Imports, job workers and the dashboard write concurrently: wait for
+        # the lock instead of failing, and let readers run beside the writer
+        self.conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.write_conn = self.conn
+
+    def _open_replica(self):
+        """
+        Switch reads to a replica of the (already migrated) file database
+
+        self.conn becomes the replica; self.write_conn stays on the file
+        ('memory') or is dropped ('readonly').
+        """
+        file_conn = self.conn
+
+        if self.replica == 'memory':
+            replica = sqlite3.connect(":memory:", factory=self._factory)
+            file_conn.backup(replica)
+            replica.row_factory = sqlite3.Row
+            replica.execute("PRAGMA foreign_keys = ON")
+            # Writes must go through execute_write (file first, then mirrored);
+            # a direct write to the replica would be lost on the next refresh
+            replica.execute("PRAGMA query_only = ON")
+            self.conn = replica
+        else:
+            file_conn.close()
+            self.write_conn = None
+            uri = f"file:{self.db_path.absolute().as_posix()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, factory=self._factory)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+            self.conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+            self.conn.execute("PRAGMA query_only = ON")
+
+    def refresh_replica(self):
+        """Re-copy the file into the in-memory replica (picks up external writes)"""
+        if self.replica == 'memory':
+            self.conn.close()
+            self.conn = self.write_conn
+            self._open_replica()
+            self._attach_archives()
+
+    def execute_write(self, query: str, params=()) -> sqlite3.Cursor:
+        """
+        Execute a write statement against the file database
+
+        With an in-memory replica the statement is mirrored into the replica
+        so reads in this process see it. Not supported on read-only replicas.
+
+        Args:
+            query: SQL statement
+            params: Statement parameters
+
+        Returns:
+            Cursor of the file database execution (for lastrowid/rowcount)
+        """
+        if self.write_conn is None:
+            raise sqlite3.OperationalError("Database opened as read-only replica")
+
+        cursor = self.write_conn.execute(query, params)
+        if self.write_conn is not self.conn:
+            self._mirror('execute', query, params)
+        return cursor
+
+    def executemany_write(self, query: str, seq_of_params) -> sqlite3.Cursor:
+        """
+        Execute a write statement for many parameter sets (see execute_write)
+
+        Args:
+            query: SQL statement
+            seq_of_params: Sequence of parameter tuples
+
+        Returns:
+            Cursor of the file database execution
+        """
+        if self.write_conn is None:
+            raise sqlite3.OperationalError("Database opened as read-only replica")
+
+        if self.write_conn is not self.conn:
+            seq_of_params = list(seq_of_params)
+        cursor = self.write_conn.executemany(query, seq_of_params)
+        if self.write_conn is not self.conn:
+            self._mirror('executemany', query, seq_of_params)
+        return cursor
+
+    def _mirror(self, method: str, query: str, params):
+        """
+        Apply a write that succeeded on the file to the in-memory replica
+
+        query_only is lifted for the mirrored statement only. If it fails on
+        the replica, the replica is re-copied from the file on the next
+        commit() (a backup can't run inside the open write transaction).
+        """
+        self.conn.execute("PRAGMA query_only = OFF")
+        try:
+            getattr(self.conn, method)(query, params)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Replica out of sync, refreshing on commit: {e}")
+            self._replica_stale = True
+        finally:
+            self.conn.execute("PRAGMA query_only = ON")
+
+    @contextmanager
+    def deferred_indexes(self, table: str):
+        """
+        Drop a table's secondary indexes for a bulk load and rebuild them afterwards
+
+        Building an index once over the loaded rows is much cheaper than
+        maintaining it row by row. The rebuild also runs if the load fails.
+
+        Args:
+            table: Table name (key of DEFERRABLE_INDEXES)
+        """
+        indexes = self.DEFERRABLE_INDEXES.get(table, {})
+
+        for name in indexes:
+            self.execute_write(f"DROP INDEX IF EXISTS {name}")
+        try:
+            yield
+        finally:
+            for name, target in indexes.items():
+                self.execute_write(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    def delete_in_batches(self, table: str, key: Tuple[str, ...], where: str, params=(),
+                          batch_size: int = 5000) -> int:
+        """
+        Delete matching rows in short transactions of batch_size rows
+
+        Keeps the write lock short so readers and other writers are not
+        blocked for the whole delete.
+
+        Args:
+            table: Table name
+            key: Columns identifying a row, e.g. ('id',) or ('team_id', 'matches_played')
+                 (WITHOUT ROWID tables have no rowid)
+            where: WHERE clause selecting the rows
+            params: Parameters of the WHERE clause
+            batch_size: Rows per transaction
+
+        Returns:
+            Number of rows deleted
+        """
+        columns = ', '.join(key)
+        deleted = 0
+        while True:
+            cursor = self.execute_write(f"""
+                DELETE FROM {table}
+                WHERE ({columns}) IN (SELECT {columns} FROM {table} WHERE {where} LIMIT ?)
+            """, tuple(params) + (batch_size,))
+            self.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                return deleted
+
+    @contextmanager
+    def batch_writes(self):
+        """
+        Group many inserts into one transaction
+
+        commit() calls inside the block (insert_match, get_or_create_*) are
+        deferred to a single commit at the end, so a bulk import pays for one
+        fsync per batch instead of one per row. The whole batch is rolled
+        back if the block raises.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        except Exception:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.write_conn.rollback()
+                if self.conn is not self.write_conn:
+                    self.conn.rollback()
+                    self._replica_stale = False
+            raise
+        self._batch_depth -= 1
+        self.commit()
+
+    @contextmanager
+    def foreign_keys_off(self):
+        """
+        Suspend foreign key enforcement for the writes in the block
+
+        For rows whose parents live in a sealed season archive (or are being
+        moved there), which SQLite foreign keys cannot follow. The pragma only
+        takes effect outside a transaction: pending writes are committed
+        first and the block's writes at the end (so not inside batch_writes).
+        Enforcement is switched back on afterwards, also if the block raises.
+        """
+        if self._batch_depth:
+            raise RuntimeError("foreign_keys_off() cannot be used inside batch_writes()")
+
+        connections = [self.write_conn]
+        if self.conn is not self.write_conn:
+            connections.append(self.conn)
+
+        self.commit()
+        for conn in connections:
+            conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            yield
+            self.commit()
+        except BaseException:
+            for conn in connections:
+                conn.rollback()
+            raise
+        finally:
+            for conn in connections:
+                conn.execute("PRAGMA foreign_keys = ON")
+
+    def commit(self):
+        """Commit pending writes (file and replica; deferred inside batch_writes)"""
+        if self._batch_depth:
+            return
+        if self.write_conn is not None:
+            self.write_conn.commit()
+        if self.conn is not self.write_conn:
+            self.conn.commit()
+            if self._replica_stale:
+                self._replica_stale = False
+                self.refresh_replica()
 
     def _initialize_schema(self):
         """Create database schema if not exists"""
         cursor = self.conn.cursor()
 
+        # New databases return pages freed by deleted configs incrementally
+        # (only possible before the first table exists; see enable_incremental_vacuum)
+        cursor.execute("PRAGMA page_count")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
         # Teams table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS teams (
@@ -71,6 +391,7 @@ class DatabaseManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 external_id TEXT UNIQUE,
                 date TIMESTAMP NOT NULL,
+                date_ts INTEGER,
                 team1_id INTEGER NOT NULL,
                 team2_id INTEGER NOT NULL,
                 team1_score INTEGER NOT NULL,
@@ -137,6 +458,10 @@ class DatabaseManager:
                 scale_factors TEXT,
                 parameters TEXT,
                 config_hash TEXT UNIQUE NOT NULL,
+                storage TEXT DEFAULT 'full',
+                data_version INTEGER,
+                pinned BOOLEAN DEFAULT 0,
+                last_accessed_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -153,6 +478,7 @@ class DatabaseManager:
                 wins INTEGER DEFAULT 0,
                 losses INTEGER DEFAULT 0,
                 date TIMESTAMP NOT NULL,
+                date_ts INTEGER,
                 FOREIGN KEY (config_id) REFERENCES elo_configs(id),
                 FOREIGN KEY (team_id) REFERENCES teams(id),
                 FOREIGN KEY (match_id) REFERENCES matches(id),
@@ -160,20 +486,984 @@ class DatabaseManager:
             )
         """)
 
+        # Compact rating history (no rowid, no date column, losses derived)
+        # Keyed by (config, team, matches_played): a team's n-th match in the
+        # replay, so the latest rating and the timeline are primary-key scans.
+        # Dates come from matches.date_ts via match_id.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS elo_ratings_compact (
+                config_id INTEGER NOT NULL,
+                team_id INTEGER NOT NULL,
+                matches_played INTEGER NOT NULL,
+                match_id INTEGER NOT NULL,
+                elo_value REAL NOT NULL,
+                wins INTEGER NOT NULL,
+                PRIMARY KEY (config_id, team_id, matches_played)
+            ) WITHOUT ROWID
+        """)
+
+        # Pre-match predictions per config (written in the same replay as
+        # the ratings). elo values are the ratings *before* the match,
+        # elo_diff = |team1_elo - team2_elo|, p_team1 = expected score of team1.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS predictions (
+                config_id INTEGER NOT NULL,
+                match_id INTEGER NOT NULL,
+                team1_id INTEGER,
+                team2_id INTEGER,
+                team1_elo REAL NOT NULL,
+                team2_elo REAL NOT NULL,
+                elo_diff REAL NOT NULL,
+                p_team1 REAL NOT NULL,
+                predicted_winner_id INTEGER,
+                correct INTEGER NOT NULL,
+                PRIMARY KEY (config_id, match_id)
+            ) WITHOUT ROWID
+        """)
+
+        # Add columns introduced after the initial schema
+        self._migrate_schema(cursor)
+
         # Indices for performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_date_ts ON matches(date_ts, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_team1_date ON matches(team1_id, date_ts)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_team2_date ON matches(team2_id, date_ts)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament ON matches(tournament_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_tournament_date ON matches(tournament_id, date_ts, id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_teams ON matches(team1_id, team2_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_external_id ON matches(external_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_elo_ratings_config ON elo_ratings(config_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_elo_ratings_team ON elo_ratings(team_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_elo_ratings_date ON elo_ratings(date)")
+        for indexes in self.DEFERRABLE_INDEXES.values():
+            for name, target in indexes.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_elo_configs_hash ON elo_configs(config_hash)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_players_match ON match_players(match_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_players_player ON match_players(player_id)")
 
+        # Keep date_ts in sync for rows written without it (raw SQL, older scripts)
+        for table in ('matches', 'elo_ratings'):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_date_ts_insert
+                AFTER INSERT ON {table}
+                WHEN NEW.date_ts IS NULL
+                BEGIN
+                    UPDATE {table} SET date_ts = CAST(strftime('%s', NEW.date) AS INTEGER)
+                    WHERE id = NEW.id;
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_date_ts_update
+                AFTER UPDATE OF date ON {table}
+                BEGIN
+                    UPDATE {table} SET date_ts = CAST(strftime('%s', NEW.date) AS INTEGER)
+                    WHERE id = NEW.id;
+                END
+            """)
+
+        # Sealed season archives (see archive_season)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archive_partitions (
+                season INTEGER PRIMARY KEY,
+                filename TEXT NOT NULL,
+                match_count INTEGER NOT NULL,
+                min_date_ts INTEGER,
+                max_date_ts INTEGER,
+                sealed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Background jobs (see core/job_runner.py). At most one queued or
+        # running job per dedup_key, so identical requests share one run.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                dedup_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                progress REAL NOT NULL DEFAULT 0,
+                message TEXT,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                heartbeat_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active ON jobs(dedup_key)
+            WHERE status IN ('queued', 'running')
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+
+        # Per-tournament import checkpoints (see core/import_ledger.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_ledger (
+                source TEXT NOT NULL,
+                key TEXT NOT NULL,
+                name TEXT,
+                status TEXT NOT NULL,
+                rows_found INTEGER,
+                rows_inserted INTEGER,
+                content_hash TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                error TEXT,
+                last_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                PRIMARY KEY (source, key)
+            )
+        """)
+
+        # Watermarks of incremental syncs (see core/leaguepedia_sync.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                name TEXT PRIMARY KEY,
+                watermark TEXT,
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Materialized statistics maintained by triggers
+        self._initialize_stats_schema(cursor)
+
+        # Match change log (data version for cached derived data)
+        self._initialize_change_log_schema(cursor)
+
+        # Per-team schedule / head-to-head index
+        self._initialize_team_matches_schema(cursor)
+
+        # Full-text name search (teams, aliases, players, tournaments)
+        self._initialize_search_schema(cursor)
+
         self.conn.commit()
 
+    # Tables whose row counts are kept in stats_summary (scope 'table')
+    COUNTED_TABLES = ('teams', 'players', 'tournaments', 'match_players')
+
+    def _initialize_stats_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the stats_summary table and the triggers that maintain it
+
+        stats_summary holds one row per (scope, key):
+        - ('table', name): row counts (matches also carry the date range)
+        - ('source', source), ('tournament', name), ('region', region),
+          ('year', 'YYYY'): match counts, date range, last import time
+        - ('integrity', check): counts of rows failing a data quality check
+        Tournament rows also carry the number of distinct teams.
+
+        Updates move a match between buckets (date ranges it bounded are
+        recomputed from the active matches). Deletes decrement counts but
+        leave date ranges as-is; call rebuild_stats() after bulk deletes for
+        exact ranges.
+        """
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_summary'
+        """)
+        needs_backfill = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stats_summary (
+                scope TEXT NOT NULL,
+                key TEXT NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                team_count INTEGER NOT NULL DEFAULT 0,
+                min_date_ts INTEGER,
+                max_date_ts INTEGER,
+                last_import_at TIMESTAMP,
+                PRIMARY KEY (scope, key)
+            ) WITHOUT ROWID
+        """)
+
+        # Distinct teams per tournament (feeds stats_summary.team_count)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_teams (
+                tournament_id INTEGER NOT NULL,
+                team_id INTEGER NOT NULL,
+                PRIMARY KEY (tournament_id, team_id)
+            ) WITHOUT ROWID
+        """)
+
+        for table in self.COUNTED_TABLES:
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    INSERT INTO stats_summary (scope, key, row_count)
+                    VALUES ('table', '{table}', 1)
+                    ON CONFLICT(scope, key) DO UPDATE SET row_count = row_count + 1;
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    UPDATE stats_summary SET row_count = row_count - 1
+                    WHERE scope = 'table' AND key = '{table}';
+                END
+            """)
+
+        # The date_ts trigger may not have run yet, so derive it from date if needed
+        new_ts = "COALESCE(NEW.date_ts, CAST(strftime('%s', NEW.date) AS INTEGER))"
+        old_ts = "COALESCE(OLD.date_ts, CAST(strftime('%s', OLD.date) AS INTEGER))"
+
+        add_new = f"""
+            INSERT INTO stats_summary
+                (scope, key, row_count, min_date_ts, max_date_ts, last_import_at)
+            SELECT
+                s.scope,
+                COALESCE(s.key, strftime('%Y', d.ts, 'unixepoch'), 'Unknown'),
+                1, d.ts, d.ts, CURRENT_TIMESTAMP
+            FROM (SELECT {new_ts} AS ts) d
+            CROSS JOIN (
+                SELECT 'table' AS scope, 'matches' AS key
+                UNION ALL SELECT 'source', COALESCE(NEW.source, 'unknown')
+                UNION ALL SELECT 'tournament', COALESCE(
+                    (SELECT name FROM tournaments WHERE id = NEW.tournament_id), 'Unknown')
+                UNION ALL SELECT 'region', COALESCE(
+                    (SELECT region FROM tournaments WHERE id = NEW.tournament_id), 'Unknown')
+                UNION ALL SELECT 'year', NULL
+            ) s
+            WHERE 1
+            ON CONFLICT(scope, key) DO UPDATE SET
+                row_count = row_count + 1,
+                min_date_ts = MIN(COALESCE(min_date_ts, excluded.min_date_ts),
+                                  COALESCE(excluded.min_date_ts, min_date_ts)),
+                max_date_ts = MAX(COALESCE(max_date_ts, excluded.max_date_ts),
+                                  COALESCE(excluded.max_date_ts, max_date_ts)),
+                last_import_at = excluded.last_import_at;
+
+            INSERT OR IGNORE INTO tournament_teams (tournament_id, team_id)
+            SELECT NEW.tournament_id, NEW.team1_id WHERE NEW.tournament_id IS NOT NULL
+            UNION SELECT NEW.tournament_id, NEW.team2_id WHERE NEW.tournament_id IS NOT NULL;
+
+            INSERT INTO stats_summary (scope, key, row_count)
+            SELECT 'integrity', 'invalid_scores', 1
+            WHERE NEW.team1_score < 0 OR NEW.team2_score < 0
+            ON CONFLICT(scope, key) DO UPDATE SET row_count = row_count + 1;
+        """
+
+        old_buckets = f"""
+            (scope = 'table' AND key = 'matches')
+            OR (scope = 'source' AND key = COALESCE(OLD.source, 'unknown'))
+            OR (scope = 'tournament' AND key = COALESCE(
+                (SELECT name FROM tournaments WHERE id = OLD.tournament_id), 'Unknown'))
+            OR (scope = 'region' AND key = COALESCE(
+                (SELECT region FROM tournaments WHERE id = OLD.tournament_id), 'Unknown'))
+            OR (scope = 'year' AND key = COALESCE(strftime('%Y', {old_ts}, 'unixepoch'), 'Unknown'))
+            OR (scope = 'integrity' AND key = 'invalid_scores'
+                AND (OLD.team1_score < 0 OR OLD.team2_score < 0))
+        """
+
+        # Bucket of a match row m (joined with its tournament t) for range recomputation
+        in_bucket = """
+            CASE stats_summary.scope
+                WHEN 'table' THEN 1
+                WHEN 'source' THEN COALESCE(m.source, 'unknown') = stats_summary.key
+                WHEN 'tournament' THEN COALESCE(t.name, 'Unknown') = stats_summary.key
+                WHEN 'region' THEN COALESCE(t.region, 'Unknown') = stats_summary.key
+                WHEN 'year' THEN COALESCE(strftime('%Y', m.date_ts, 'unixepoch'), 'Unknown') = stats_summary.key
+            END
+        """
+
+        # Earlier versions lost the date range when a match without date was added
+        cursor.execute("""
+            SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_stats_matches_insert'
+        """)
+        row = cursor.fetchone()
+        if row and 'COALESCE(excluded.min_date_ts, min_date_ts)' not in row[0]:
+            cursor.execute("DROP TRIGGER trg_stats_matches_insert")
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_matches_insert
+            AFTER INSERT ON matches
+            BEGIN
+                {add_new}
+            END
+        """)
+
+        # Corrections (upsert_match, manual edits) move a match between buckets:
+        # take the old row out - shrinking date ranges it bounded - and add the new one.
+        # Skips the date_ts backfill of trg_matches_date_ts_* (same effective date).
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_matches_update
+            AFTER UPDATE OF date_ts, source, tournament_id, team1_id, team2_id,
+                            team1_score, team2_score ON matches
+            WHEN {old_ts} IS NOT {new_ts}
+              OR OLD.source IS NOT NEW.source
+              OR OLD.tournament_id IS NOT NEW.tournament_id
+              OR OLD.team1_id IS NOT NEW.team1_id
+              OR OLD.team2_id IS NOT NEW.team2_id
+              OR (OLD.team1_score < 0 OR OLD.team2_score < 0) IS NOT (NEW.team1_score < 0 OR NEW.team2_score < 0)
+            BEGIN
+                UPDATE stats_summary SET row_count = row_count - 1
+                WHERE {old_buckets};
+
+                UPDATE stats_summary SET
+                    min_date_ts = CASE WHEN min_date_ts = {old_ts} THEN (
+                        SELECT MIN(m.date_ts) FROM matches m
+                        LEFT JOIN tournaments t ON m.tournament_id = t.id WHERE {in_bucket}
+                    ) ELSE min_date_ts END,
+                    max_date_ts = CASE WHEN max_date_ts = {old_ts} THEN (
+                        SELECT MAX(m.date_ts) FROM matches m
+                        LEFT JOIN tournaments t ON m.tournament_id = t.id WHERE {in_bucket}
+                    ) ELSE max_date_ts END
+                WHERE scope != 'integrity' AND {old_ts} IN (min_date_ts, max_date_ts)
+                  AND ({old_buckets});
+
+                DELETE FROM tournament_teams
+                WHERE tournament_id = OLD.tournament_id
+                  AND team_id IN (OLD.team1_id, OLD.team2_id)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM matches m
+                      WHERE m.tournament_id = OLD.tournament_id
+                        AND tournament_teams.team_id IN (m.team1_id, m.team2_id)
+                  );
+
+                {add_new}
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_tournament_teams_insert
+            AFTER INSERT ON tournament_teams
+            BEGIN
+                UPDATE stats_summary SET team_count = team_count + 1
+                WHERE scope = 'tournament'
+                  AND key = (SELECT name FROM tournaments WHERE id = NEW.tournament_id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_tournament_teams_delete
+            AFTER DELETE ON tournament_teams
+            BEGIN
+                UPDATE stats_summary SET team_count = team_count - 1
+                WHERE scope = 'tournament'
+                  AND key = (SELECT name FROM tournaments WHERE id = OLD.tournament_id);
+            END
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_stats_matches_delete
+            AFTER DELETE ON matches
+            BEGIN
+                UPDATE stats_summary SET row_count = row_count - 1
+                WHERE (scope = 'table' AND key = 'matches')
+                   OR (scope = 'source' AND key = COALESCE(OLD.source, 'unknown'))
+                   OR (scope = 'tournament' AND key = COALESCE(
+                        (SELECT name FROM tournaments WHERE id = OLD.tournament_id), 'Unknown'))
+                   OR (scope = 'region' AND key = COALESCE(
+                        (SELECT region FROM tournaments WHERE id = OLD.tournament_id), 'Unknown'))
+                   OR (scope = 'year' AND key = COALESCE(strftime('%Y', OLD.date_ts, 'unixepoch'), 'Unknown'))
+                   OR (scope = 'integrity' AND key = 'invalid_scores'
+                       AND (OLD.team1_score < 0 OR OLD.team2_score < 0));
+            END
+        """)
+
+        if needs_backfill:
+            self._rebuild_stats(cursor)
+
+    def _rebuild_stats(self, cursor: sqlite3.Cursor):
+        """Recompute stats_summary and tournament_teams from the base tables"""
+        cursor.execute("DELETE FROM stats_summary")
+        cursor.execute("DELETE FROM tournament_teams")
+
+        for table in self.COUNTED_TABLES:
+            cursor.execute(f"""
+                INSERT INTO stats_summary (scope, key, row_count)
+                SELECT 'table', '{table}', COUNT(*) FROM {self._unified(table)}
+            """)
+
+        matches = self.matches_table
+        cursor.execute(f"""
+            INSERT INTO stats_summary (scope, key, row_count, min_date_ts, max_date_ts, last_import_at)
+            SELECT 'table', 'matches', COUNT(*), MIN(date_ts), MAX(date_ts), MAX(created_at)
+            FROM {matches}
+        """)
+
+        grouped_scopes = {
+            'source': "COALESCE(m.source, 'unknown')",
+            'tournament': "COALESCE(t.name, 'Unknown')",
+            'region': "COALESCE(t.region, 'Unknown')",
+            'year': "COALESCE(strftime('%Y', m.date_ts, 'unixepoch'), 'Unknown')",
+        }
+        for scope, key_expr in grouped_scopes.items():
+            cursor.execute(f"""
+                INSERT INTO stats_summary (scope, key, row_count, min_date_ts, max_date_ts, last_import_at)
+                SELECT '{scope}', {key_expr}, COUNT(*), MIN(m.date_ts), MAX(m.date_ts), MAX(m.created_at)
+                FROM {matches} m
+                LEFT JOIN tournaments t ON m.tournament_id = t.id
+                GROUP BY 2
+            """)
+
+        cursor.execute(f"""
+            INSERT INTO stats_summary (scope, key, row_count)
+            SELECT 'integrity', 'invalid_scores', COUNT(*)
+            FROM {matches} WHERE team1_score < 0 OR team2_score < 0
+        """)
+
+        # Inserting tournament_teams bumps team_count through its trigger
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO tournament_teams (tournament_id, team_id)
+            SELECT tournament_id, team1_id FROM {matches} WHERE tournament_id IS NOT NULL
+            UNION
+            SELECT tournament_id, team2_id FROM {matches} WHERE tournament_id IS NOT NULL
+        """)
+
+    def rebuild_stats(self):
+        """
+        Recompute materialized statistics and the team_matches index from
+        scratch (e.g. after bulk deletes)
+        """
+        if self.write_conn is None:
+            raise sqlite3.OperationalError("Database opened as read-only replica")
+
+        cursor = self.write_conn.cursor()
+        self._rebuild_stats(cursor)
+        self._rebuild_team_matches(cursor)
+        self.write_conn.commit()
+        if self.replica == 'memory':
+            self.refresh_replica()
+
+    def get_summary(self, scope: str) -> List[Dict]:
+        """
+        Get materialized statistics for one scope (O(rows in scope), no table scans)
+
+        Args:
+            scope: 'table', 'source', 'tournament', 'region', 'year' or 'integrity'
+
+        Returns:
+            List of dicts with key, matches, teams, first/last match date and
+            last import time, largest first
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT key, row_count, team_count,
+                   datetime(min_date_ts, 'unixepoch'), datetime(max_date_ts, 'unixepoch'),
+                   last_import_at
+            FROM stats_summary
+            WHERE scope = ?
+            ORDER BY row_count DESC
+        """, (scope,))
+
+        return [
+            {
+                'key': row[0],
+                'count': row[1],
+                'team_count': row[2],
+                'first_date': row[3],
+                'last_date': row[4],
+                'last_import_at': row[5]
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def _initialize_change_log_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the match_changes log and the triggers that append to it
+
+        Every insert, delete and rating-relevant update of a match appends
+        one row. The AUTOINCREMENT sequence is the data version: it only
+        ever grows, also when old log rows are pruned. date_ts is the
+        earliest date the change affects (old and new date for updates),
+        so derived data only has to be recomputed from there on.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS match_changes (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                match_id INTEGER NOT NULL,
+                date_ts INTEGER
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_match_changes_insert
+            AFTER INSERT ON matches
+            BEGIN
+                INSERT INTO match_changes (match_id, date_ts)
+                VALUES (NEW.id, COALESCE(NEW.date_ts, CAST(strftime('%s', NEW.date) AS INTEGER)));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_match_changes_update
+            AFTER UPDATE OF date_ts, team1_id, team2_id, team1_score, team2_score,
+                            winner_id, tournament_id, stage ON matches
+            BEGIN
+                INSERT INTO match_changes (match_id, date_ts)
+                VALUES (NEW.id, MIN(COALESCE(OLD.date_ts, NEW.date_ts), COALESCE(NEW.date_ts, OLD.date_ts)));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_match_changes_delete
+            AFTER DELETE ON matches
+            BEGIN
+                INSERT INTO match_changes (match_id, date_ts) VALUES (OLD.id, OLD.date_ts);
+            END
+        """)
+
+    def get_data_version(self) -> int:
+        """
+        Get the current data version of the matches (0 before the first change)
+
+        Returns:
+            Monotonic version number, bumped by every match change
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'match_changes'")
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def get_changes_since(self, version: int) -> Optional[Dict]:
+        """
+        Summarize the match changes after a data version
+
+        Args:
+            version: Data version the caller's derived data was built from
+
+        Returns:
+            None if nothing changed, else dict with count and since_ts (the
+            earliest affected match date; None if a change had no date)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*), MIN(date_ts), SUM(date_ts IS NULL)
+            FROM match_changes WHERE version > ?
+        """, (version,))
+        count, since_ts, undated = cursor.fetchone()
+
+        if not count:
+            return None
+
+        return {'count': count, 'since_ts': None if undated else since_ts}
+
+    def prune_change_log(self, version: int):
+        """
+        Drop change log rows up to a data version no consumer needs anymore
+
+        Args:
+            version: Oldest data version still in use
+        """
+        self.execute_write("DELETE FROM match_changes WHERE version <= ?", (version,))
+        self.commit()
+
+    def incremental_vacuum(self, max_pages: int = None) -> int:
+        """
+        Return free pages to the file system (auto_vacuum = INCREMENTAL only)
+
+        Unlike VACUUM this does not rewrite the database, so it is cheap
+        enough to run after every bulk delete.
+
+        Args:
+            max_pages: Free at most this many pages (default: all)
+
+        Returns:
+            Number of pages freed (0 if incremental vacuum is not enabled)
+        """
+        cursor = self.write_conn.cursor()
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            return 0
+
+        cursor.execute("PRAGMA freelist_count")
+        before = cursor.fetchone()[0]
+        # executescript steps the pragma to completion (execute frees a single page)
+        self.write_conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages or 0)});")
+        cursor.execute("PRAGMA freelist_count")
+        return before - cursor.fetchone()[0]
+
+    def enable_incremental_vacuum(self):
+        """
+        Switch an existing database to auto_vacuum = INCREMENTAL
+
+        Requires one full VACUUM (databases created by this version already
+        use incremental mode).
+        """
+        self.write_conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.write_conn.execute("VACUUM")
+
+    # Entity tables covered by the search index: kind -> table
+    SEARCH_KINDS = {'team': 'teams', 'player': 'players', 'tournament': 'tournaments'}
+    ALIAS_FILE = "config/team_name_mappings.json"
+
+    def _initialize_team_matches_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the team_matches adjacency table and its maintenance triggers
+
+        Every match appears twice, once from each team's point of view,
+        clustered by (team_id, date_ts) so a team's schedule, recent form
+        and head-to-head records are index range reads instead of
+        team1_id = ? OR team2_id = ? scans over matches.
+        """
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'team_matches'
+        """)
+        needs_backfill = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS team_matches (
+                team_id INTEGER NOT NULL,
+                date_ts INTEGER NOT NULL,
+                match_id INTEGER NOT NULL,
+                opponent_id INTEGER NOT NULL,
+                won INTEGER NOT NULL,
+                score_for INTEGER,
+                score_against INTEGER,
+                tournament_id INTEGER,
+                PRIMARY KEY (team_id, date_ts, match_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_team_matches_opponent
+            ON team_matches(team_id, opponent_id, date_ts)
+        """)
+
+        # date_ts may still be NULL on insert (set afterwards by trg_matches_date_ts_insert)
+        new_ts = "COALESCE(NEW.date_ts, CAST(strftime('%s', NEW.date) AS INTEGER))"
+        old_ts = "COALESCE(OLD.date_ts, CAST(strftime('%s', OLD.date) AS INTEGER))"
+
+        # Matches whose date SQLite can't parse have no adjacency rows (as in _rebuild_team_matches)
+        insert_rows = f"""
+            INSERT OR REPLACE INTO team_matches
+                (team_id, date_ts, match_id, opponent_id, won, score_for, score_against, tournament_id)
+            SELECT NEW.team1_id, {new_ts}, NEW.id, NEW.team2_id, NEW.winner_id = NEW.team1_id,
+                   NEW.team1_score, NEW.team2_score, NEW.tournament_id
+            WHERE {new_ts} IS NOT NULL
+            UNION ALL
+            SELECT NEW.team2_id, {new_ts}, NEW.id, NEW.team1_id, NEW.winner_id = NEW.team2_id,
+                   NEW.team2_score, NEW.team1_score, NEW.tournament_id
+            WHERE {new_ts} IS NOT NULL;
+        """
+        delete_rows = f"""
+            DELETE FROM team_matches
+            WHERE team_id IN (OLD.team1_id, OLD.team2_id)
+              AND date_ts = {old_ts} AND match_id = OLD.id;
+        """
+
+        # Earlier versions failed inserts of matches with an unparseable date (NOT NULL date_ts)
+        for name in ('trg_team_matches_insert', 'trg_team_matches_update'):
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+            row = cursor.fetchone()
+            if row and 'IS NOT NULL' not in row[0]:
+                cursor.execute(f"DROP TRIGGER {name}")
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_team_matches_insert
+            AFTER INSERT ON matches
+            WHEN {new_ts} IS NOT NULL
+            BEGIN
+                {insert_rows}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_team_matches_update
+            AFTER UPDATE OF date, date_ts, team1_id, team2_id, team1_score, team2_score,
+                            winner_id, tournament_id ON matches
+            BEGIN
+                {delete_rows}
+                {insert_rows}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_team_matches_delete
+            AFTER DELETE ON matches
+            BEGIN
+                {delete_rows}
+            END
+        """)
+
+        if needs_backfill:
+            self._rebuild_team_matches(cursor)
+
+    def _rebuild_team_matches(self, cursor: sqlite3.Cursor):
+        """Repopulate team_matches from all matches (active and archived)"""
+        cursor.execute("DELETE FROM team_matches")
+        for team, opponent, score_for, score_against in (
+            ('team1_id', 'team2_id', 'team1_score', 'team2_score'),
+            ('team2_id', 'team1_id', 'team2_score', 'team1_score'),
+        ):
+            cursor.execute(f"""
+                INSERT OR REPLACE INTO team_matches
+                    (team_id, date_ts, match_id, opponent_id, won, score_for, score_against, tournament_id)
+                SELECT {team}, date_ts, id, {opponent}, winner_id = {team},
+                       {score_for}, {score_against}, tournament_id
+                FROM {self.matches_table}
+                WHERE date_ts IS NOT NULL
+            """)
+
+    def _initialize_search_schema(self, cursor: sqlite3.Cursor):
+        """
+        Create the FTS5 trigram search index and its maintenance triggers
+
+        search_index rows: term (indexed text), kind, entity_id, name.
+        For entity names term == name; team aliases from ALIAS_FILE map
+        term -> canonical name. SQLite builds without FTS5 fall back to
+        LIKE scans in search().
+        """
+        cursor.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'
+        """)
+        needs_backfill = cursor.fetchone() is None
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                    term, kind UNINDEXED, entity_id UNINDEXED, name UNINDEXED,
+                    tokenize = 'trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"[WARNING] Search index unavailable ({e}), using LIKE search")
+            self.has_search_index = False
+            return
+
+        self.has_search_index = True
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        for kind, table in self.SEARCH_KINDS.items():
+            # Aliases may be loaded before their canonical team is imported
+            link_aliases = """
+                    UPDATE search_index SET entity_id = NEW.id
+                    WHERE kind = 'team' AND name = NEW.name AND entity_id IS NULL;
+            """ if kind == 'team' else ""
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    INSERT INTO search_index (term, kind, entity_id, name)
+                    VALUES (NEW.name, '{kind}', NEW.id, NEW.name);
+                    {link_aliases}
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_update
+                AFTER UPDATE OF name ON {table}
+                BEGIN
+                    UPDATE search_index SET term = NEW.name, name = NEW.name
+                    WHERE kind = '{kind}' AND entity_id = OLD.id AND term = OLD.name;
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_search_{table}_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    DELETE FROM search_index WHERE kind = '{kind}' AND entity_id = OLD.id;
+                END
+            """)
+
+        if needs_backfill:
+            self._rebuild_search_index(cursor)
+        else:
+            self._sync_aliases(cursor)
+
+    def _rebuild_search_index(self, cursor: sqlite3.Cursor):
+        """Repopulate search_index from the entity tables and the alias file"""
+        cursor.execute("DELETE FROM search_index")
+        for kind, table in self.SEARCH_KINDS.items():
+            cursor.execute(f"""
+                INSERT INTO search_index (term, kind, entity_id, name)
+                SELECT name, '{kind}', id, name FROM {table}
+            """)
+        cursor.execute("DELETE FROM search_meta WHERE key = 'alias_mtime'")
+        self._sync_aliases(cursor)
+
+    def _sync_aliases(self, cursor: sqlite3.Cursor):
+        """Reload team aliases into search_index when the alias file changed"""
+        alias_file = Path(self.ALIAS_FILE)
+        mtime = str(alias_file.stat().st_mtime) if alias_file.exists() else ''
+
+        cursor.execute("SELECT value FROM search_meta WHERE key = 'alias_mtime'")
+        row = cursor.fetchone()
+        if row and row[0] == mtime:
+            return
+
+        aliases = []
+        if alias_file.exists():
+            try:
+                with open(alias_file, 'r', encoding='utf-8') as f:
+                    mappings = json.load(f).get('mappings', [])
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Could not read team aliases: {e}")
+                mappings = []
+
+            for mapping in mappings:
+                canonical = mapping['canonical_name']
+                for alias in mapping.get('aliases', []):
+                    if alias != canonical:
+                        aliases.append((alias, canonical))
+
+        # Alias rows are the team rows whose term differs from the name
+        cursor.execute("DELETE FROM search_index WHERE kind = 'team' AND term != name")
+        cursor.executemany("""
+            INSERT INTO search_index (term, kind, entity_id, name)
+            VALUES (?, 'team', (SELECT id FROM teams WHERE name = ?), ?)
+        """, [(alias, canonical, canonical) for alias, canonical in aliases])
+        cursor.execute("""
+            INSERT OR REPLACE INTO search_meta (key, value) VALUES ('alias_mtime', ?)
+        """, (mtime,))
+
+    def rebuild_search_index(self):
+        """Rebuild the search index from scratch (e.g. after editing aliases)"""
+        if self.write_conn is None:
+            raise sqlite3.OperationalError("Database opened as read-only replica")
+        if not self.has_search_index:
+            return
+
+        self._rebuild_search_index(self.write_conn.cursor())
+        self.write_conn.commit()
+        if self.replica == 'memory':
+            self.refresh_replica()
+
+    def search(self, query: str, kinds: List[str] = None, limit: int = 10,
+               fuzzy: bool = True) -> List[Dict]:
+        """
+        Ranked name search over teams (incl. aliases), players and tournaments
+
+        Ranking: exact match, then prefix, then substring, then fuzzy
+        (trigram overlap re-scored with SequenceMatcher). Shorter names
+        win ties.
+
+        Args:
+            query: Search text (case-insensitive)
+            kinds: Restrict to 'team', 'player' and/or 'tournament'
+            limit: Maximum number of results
+            fuzzy: Add typo-tolerant matches when there are too few hits
+
+        Returns:
+            List of dicts with kind, id, name, matched (the indexed term that
+            matched, e.g. an alias) and score (0-3, higher is better)
+        """
+        query = (query or '').strip()
+        if not query:
+            return []
+
+        kinds = list(kinds) if kinds else list(self.SEARCH_KINDS)
+        unknown = set(kinds) - set(self.SEARCH_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown search kinds: {sorted(unknown)}")
+
+        if not self.has_search_index:
+            rows = self._search_like(query, kinds, limit * 5)
+        elif len(query) >= 3:
+            # Trigram phrase query = case-insensitive substring match
+            rows = self._search_fts('"' + query.replace('"', '""') + '"', kinds, limit * 5)
+        else:
+            # Too short for trigrams; scan index terms by prefix
+            rows = self._search_fts(None, kinds, limit * 5, prefix=query)
+
+        best = {}
+        lowered = query.lower()
+
+        def consider(row, score):
+            key = (row[1], row[3])
+            if key not in best or best[key]['score'] < score:
+                best[key] = {
+                    'kind': row[1],
+                    'id': row[2],
+                    'name': row[3],
+                    'matched': row[0],
+                    'score': score
+                }
+
+        for row in rows:
+            term = row[0].lower()
+            if term == lowered:
+                score = 3.0
+            elif term.startswith(lowered):
+                score = 2.0
+            else:
+                score = 1.0
+            consider(row, score)
+
+        if fuzzy and len(best) < limit and len(query) >= 3 and self.has_search_index:
+            # Any shared trigram makes a candidate; bm25 ranks by overlap
+            trigrams = {lowered[i:i + 3] for i in range(len(lowered) - 2)}
+            match = " OR ".join('"' + t.replace('"', '""') + '"' for t in trigrams)
+            for row in self._search_fts(match, kinds, 50):
+                ratio = SequenceMatcher(None, lowered, row[0].lower()).ratio()
+                if ratio >= 0.6:
+                    consider(row, round(ratio, 3))
+
+        results = sorted(best.values(), key=lambda r: (-r['score'], len(r['name']), r['name']))
+        return results[:limit]
+
+    def _search_fts(self, match: Optional[str], kinds: List[str], limit: int,
+                    prefix: str = None) -> List[Tuple]:
+        """Query search_index by FTS match expression or term prefix"""
+        cursor = self.conn.cursor()
+        placeholders = ",".join("?" * len(kinds))
+
+        if match is not None:
+            cursor.execute(f"""
+                SELECT term, kind, entity_id, name FROM search_index
+                WHERE search_index MATCH ? AND kind IN ({placeholders})
+                ORDER BY bm25(search_index)
+                LIMIT ?
+            """, [match] + kinds + [limit])
+        else:
+            escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            cursor.execute(f"""
+                SELECT term, kind, entity_id, name FROM search_index
+                WHERE term LIKE ? ESCAPE '\\' AND kind IN ({placeholders})
+                ORDER BY length(term)
+                LIMIT ?
+            """, [escaped + '%'] + kinds + [limit])
+
+        return [tuple(row) for row in cursor.fetchall()]
+
+    def _search_like(self, query: str, kinds: List[str], limit: int) -> List[Tuple]:
+        """Fallback search without FTS5: substring scan of the entity tables"""
+        cursor = self.conn.cursor()
+        rows = []
+        for kind in kinds:
+            cursor.execute(f"""
+                SELECT name, '{kind}', id, name FROM {self.SEARCH_KINDS[kind]}
+                WHERE name LIKE ?
+                ORDER BY length(name)
+                LIMIT ?
+            """, (f"%{query}%", limit))
+            rows.extend(tuple(row) for row in cursor.fetchall())
+        return rows
+
+    def _migrate_schema(self, cursor: sqlite3.Cursor):
+        """
+        Upgrade databases created with an older schema
+
+        Adds the integer date_ts column to matches and elo_ratings and
+        backfills it from the text date column. Adds the storage mode, data
+        version and retention (pinned, last_accessed_at) columns to elo_configs.
+        """
+        cursor.execute("PRAGMA table_info(elo_configs)")
+        config_columns = {row[1] for row in cursor.fetchall()}
+        if 'storage' not in config_columns:
+            cursor.execute("ALTER TABLE elo_configs ADD COLUMN storage TEXT DEFAULT 'full'")
+        if 'data_version' not in config_columns:
+            cursor.execute("ALTER TABLE elo_configs ADD COLUMN data_version INTEGER")
+        if 'pinned' not in config_columns:
+            cursor.execute("ALTER TABLE elo_configs ADD COLUMN pinned BOOLEAN DEFAULT 0")
+        if 'last_accessed_at' not in config_columns:
+            cursor.execute("ALTER TABLE elo_configs ADD COLUMN last_accessed_at TIMESTAMP")
+
+        for table in ('matches', 'elo_ratings'):
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+
+            if 'date_ts' not in columns:
+                print(f"[MIGRATE] Adding date_ts to {table}...")
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN date_ts INTEGER")
+
+            cursor.execute(f"""
+                UPDATE {table}
+                SET date_ts = CAST(strftime('%s', date) AS INTEGER)
+                WHERE date_ts IS NULL
+            """)
+
     def get_or_create_team(self, name: str, region: str = None) -> int:
         """
         Get team ID or create new team
@@ -195,11 +1485,11 @@ class DatabaseManager:
             return result[0]
 
         # Create new team
-        cursor.execute(
+        cursor = self.execute_write(
             "INSERT INTO teams (name, region) VALUES (?, ?)",
             (name, region)
         )
-        self.conn.commit()
+        self.commit()
         return cursor.lastrowid
 
     def get_or_create_tournament(self, name: str, region: str = None,
@@ -229,12 +1519,12 @@ class DatabaseManager:
             return result[0]
 
         # Create new tournament
-        cursor.execute(
+        cursor = self.execute_write(
             """INSERT INTO tournaments (name, region, year, split, tier, tournament_type)
                VALUES (?, ?, ?, ?, ?, ?)""",
             (name, region, year, split, tier, tournament_type)
         )
-        self.conn.commit()
+        self.commit()
         return cursor.lastrowid
 
     def get_or_create_player(self, name: str, role: str = None) -> int:
@@ -258,11 +1548,11 @@ class DatabaseManager:
             return result[0]
 
         # Create new player
-        cursor.execute(
+        cursor = self.execute_write(
             "INSERT INTO players (name, role) VALUES (?, ?)",
             (name, role)
         )
-        self.conn.commit()
+        self.commit()
         return cursor.lastrowid
 
     def match_exists(self, external_id: str = None,
@@ -286,20 +1576,22 @@ class DatabaseManager:
         # If external_id is provided, ONLY use this for duplicate check
         if external_id:
             cursor.execute(
-                "SELECT id FROM matches WHERE external_id = ?",
+                f"SELECT id FROM {self.matches_table} WHERE external_id = ?",
                 (external_id,)
             )
             return cursor.fetchone() is not None
 
         # Fallback: Check by teams + date (for Google Sheets data without external_id)
-        if team1 and team2 and date:
-            cursor.execute("""
-                SELECT m.id FROM matches m
+        date_ts = date_to_epoch(date)
+        if team1 and team2 and date_ts is not None:
+            day_start = date_ts - date_ts % SECONDS_PER_DAY
+            cursor.execute(f"""
+                SELECT m.id FROM {self.matches_table} m
                 JOIN teams t1 ON m.team1_id = t1.id
                 JOIN teams t2 ON m.team2_id = t2.id
                 WHERE (t1.name = ? AND t2.name = ? OR t1.name = ? AND t2.name = ?)
-                  AND DATE(m.date) = DATE(?)
-            """, (team1, team2, team2, team1, date))
+                  AND m.date_ts >= ? AND m.date_ts < ?
+            """, (team1, team2, team2, team1, day_start, day_start + SECONDS_PER_DAY))
             return cursor.fetchone() is not None
 
         return False
@@ -367,26 +1659,108 @@ class DatabaseManager:
 
         # Determine Bo format if not provided
         if bo_format is None:
-            max_score = max(team1_score, team2_score)
-            if max_score == 1:
-                bo_format = "Bo1"
-            elif max_score <= 2:
-                bo_format = "Bo3"
-            else:
-                bo_format = "Bo5"
+            bo_format = self._bo_format(team1_score, team2_score)
 
         # Insert match
-        cursor.execute("""
+        cursor = self.execute_write("""
             INSERT INTO matches
-            (external_id, date, team1_id, team2_id, team1_score, team2_score,
+            (external_id, date, date_ts, team1_id, team2_id, team1_score, team2_score,
              winner_id, tournament_id, stage, patch, bo_format, source)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (external_id, date, team1_id, team2_id, team1_score, team2_score,
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (external_id, date, date_to_epoch(date), team1_id, team2_id, team1_score, team2_score,
               winner_id, tournament_id, stage, patch, bo_format, source))
 
-        self.conn.commit()
+        self.commit()
         return cursor.lastrowid
 
+    @staticmethod
+    def _bo_format(team1_score: int, team2_score: int) -> str:
+        """Best-of format implied by a final score"""
+        max_score = max(team1_score, team2_score)
+        if max_score == 1:
+            return "Bo1"
+        elif max_score <= 2:
+            return "Bo3"
+        return "Bo5"
+
+    def upsert_match(self,
+                     team1_name: str,
+                     team2_name: str,
+                     team1_score: int,
+                     team2_score: int,
+                     date: datetime,
+                     tournament_name: str = None,
+                     stage: str = None,
+                     patch: str = None,
+                     external_id: str = None,
+                     source: str = "leaguepedia",
+                     region: str = None,
+                     tournament_type: str = None) -> Tuple[Optional[int], str]:
+        """
+        Insert a match or update the stored one with the same external ID
+
+        Corrections on the source side (score, date, teams, stage) are
+        written in place; the change-log triggers then bump the data version
+        so ratings refresh incrementally from the match date.
+
+        Args:
+            Same as insert_match (external_id identifies the stored match)
+
+        Returns:
+            Tuple of (match ID, 'inserted' | 'updated' | 'unchanged')
+        """
+        if hasattr(date, 'to_pydatetime'):
+            date = date.to_pydatetime()
+
+        row = None
+        if external_id:
+            row = self.conn.execute("""
+                SELECT id, team1_id, team2_id, team1_score, team2_score, date_ts, stage, patch
+                FROM matches WHERE external_id = ?
+            """, (external_id,)).fetchone()
+
+        if row is None:
+            match_id = self.insert_match(team1_name, team2_name, team1_score, team2_score, date,
+                                         tournament_name=tournament_name, stage=stage, patch=patch,
+                                         external_id=external_id, source=source, region=region,
+                                         tournament_type=tournament_type)
+            # None: known without external ID, or sealed in an archive partition
+            return match_id, 'inserted' if match_id else 'unchanged'
+
+        team1_id = self.get_or_create_team(team1_name, region)
+        team2_id = self.get_or_create_team(team2_name, region)
+        date_ts = date_to_epoch(date)
+
+        current = (row['team1_id'], row['team2_id'], row['team1_score'], row['team2_score'],
+                   row['date_ts'], row['stage'] or '', row['patch'] or '')
+        if current == (team1_id, team2_id, team1_score, team2_score, date_ts, stage or '', patch or ''):
+            return row['id'], 'unchanged'
+
+        self.execute_write("""
+            UPDATE matches
+            SET date = ?, date_ts = ?, team1_id = ?, team2_id = ?, team1_score = ?, team2_score = ?,
+                winner_id = ?, stage = ?, patch = ?, bo_format = ?
+            WHERE id = ?
+        """, (date, date_ts, team1_id, team2_id, team1_score, team2_score,
+              team1_id if team1_score > team2_score else team2_id, stage, patch,
+              self._bo_format(team1_score, team2_score), row['id']))
+
+        self.commit()
+        return row['id'], 'updated'
+
+    def get_sync_watermark(self, name: str) -> Optional[str]:
+        """Watermark of an incremental sync (None if it never ran)"""
+        row = self.conn.execute("SELECT watermark FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_sync_watermark(self, name: str, watermark: str):
+        """Store the watermark of an incremental sync (joins an open batch_writes transaction)"""
+        self.execute_write("""
+            INSERT INTO sync_state (name, watermark, synced_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(name) DO UPDATE SET watermark = excluded.watermark, synced_at = excluded.synced_at
+        """, (name, watermark))
+        self.commit()
+
     def insert_match_player(self, match_id: int, player_name: str,
                            team_name: str, role: str = None,
                            champion: str = None, kills: int = None,
@@ -439,7 +1813,7 @@ class DatabaseManager:
         items_json = json.dumps(items) if items else None
 
         # Insert
-        cursor.execute("""
+        cursor = self.execute_write("""
             INSERT INTO match_players
             (match_id, player_id, team_id, role, champion, kills, deaths, assists,
              gold, cs, damage_to_champions, vision_score, items, won)
@@ -447,7 +1821,7 @@ class DatabaseManager:
         """, (match_id, player_id, team_id, role, champion, kills, deaths, assists,
               gold, cs, damage_to_champions, vision_score, items_json, won))
 
-        self.conn.commit()
+        self.commit()
         return cursor.lastrowid
 
     def get_all_matches(self, limit: int = None) -> List[Dict]:
@@ -457,50 +1831,199 @@ class DatabaseManager:
         Args:
             limit: Optional limit on number of matches
 
+        Returns:
+            List of match dictionaries
+        """
+        return self.get_matches_between(limit=limit)
+
+    def get_matches_between(self, start=None, end=None,
+                            limit: int = None) -> List[Dict]:
+        """
+        Get matches in chronological order within a date range
+
+        Uses an integer range scan on idx_matches_date_ts.
+
+        Args:
+            start: Inclusive lower bound (datetime, ISO string or epoch), None for open
+            end: Exclusive upper bound (datetime, ISO string or epoch), None for open
+            limit: Optional limit on number of matches
+
         Returns:
             List of match dictionaries
         """
         cursor = self.conn.cursor()
 
-        query = """
+        where_parts = []
+        params = []
+        if start is not None:
+            where_parts.append("m.date_ts >= ?")
+            params.append(date_to_epoch(start))
+        if end is not None:
+            where_parts.append("m.date_ts < ?")
+            params.append(date_to_epoch(end))
+
+        query = self._match_select_sql()
+
+        if where_parts:
+            query += " WHERE " + " AND ".join(where_parts)
+
+        query += " ORDER BY m.date_ts, m.id"
+
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        cursor.execute(query, params)
+
+        return [self._match_dict(row) for row in cursor.fetchall()]
+
+    def _match_select_sql(self) -> str:
+        """SELECT ... FROM matches (with team/tournament names) used by the match readers"""
+        return f"""
             SELECT
                 m.id, m.external_id, m.date, m.team1_score, m.team2_score,
                 t1.name as team1_name, t2.name as team2_name,
                 tw.name as winner_name,
                 tour.name as tournament_name,
-                m.stage, m.patch, m.bo_format, m.source
-            FROM matches m
+                m.stage, m.patch, m.bo_format, m.source, m.date_ts
+            FROM {self.matches_table} m
             JOIN teams t1 ON m.team1_id = t1.id
             JOIN teams t2 ON m.team2_id = t2.id
             JOIN teams tw ON m.winner_id = tw.id
             LEFT JOIN tournaments tour ON m.tournament_id = tour.id
-            ORDER BY m.date
         """
 
-        if limit:
-            query += f" LIMIT {limit}"
+    @staticmethod
+    def _match_dict(row) -> Dict:
+        """Convert a _match_select_sql() row to a match dictionary"""
+        return {
+            'id': row[0],
+            'external_id': row[1],
+            'date': row[2],
+            'date_ts': row[13],
+            'team1_name': row[5],
+            'team2_name': row[6],
+            'team1_score': row[3],
+            'team2_score': row[4],
+            'winner': row[7],
+            'tournament': row[8],
+            'stage': row[9],
+            'patch': row[10],
+            'bo_format': row[11],
+            'source': row[12]
+        }
+
+    # Filters accepted by get_matches_page
+    PAGE_FILTERS = ('team', 'opponent', 'tournament', 'source', 'start', 'end')
+
+    def get_matches_page(self, filters: Dict = None, after: Tuple = None,
+                         limit: int = 50, newest_first: bool = True) -> Dict:
+        """
+        Get one page of matches using keyset pagination (no OFFSET)
 
-        cursor.execute(query)
+        Each page is an index range read that starts right after the last
+        row of the previous page, so every page costs the same no matter
+        how deep into the history it is. Team filters read the team_matches
+        index; other filters walk idx_matches_date_ts / the tournament index.
+        Archived seasons are paged per partition and merged. Matches without
+        a date_ts (date SQLite could not parse) are not part of the keyset
+        order and are left out, as they are in team_matches.
 
-        matches = []
-        for row in cursor.fetchall():
-            matches.append({
-                'id': row[0],
-                'external_id': row[1],
-                'date': row[2],
-                'team1_name': row[5],
-                'team2_name': row[6],
-                'team1_score': row[3],
-                'team2_score': row[4],
-                'winner': row[7],
-                'tournament': row[8],
-                'stage': row[9],
-                'patch': row[10],
-                'bo_format': row[11],
-                'source': row[12]
-            })
+        Args:
+            filters: Optional dict with any of
+                team, opponent (requires team), tournament (names),
+                source, start (inclusive), end (exclusive) dates
+            after: Cursor (date, id) of the last row already shown, usually
+                   the previous page's next_cursor; None for the first page
+            limit: Page size
+            newest_first: Page backwards in time (default) or forwards
 
-        return matches
+        Returns:
+            Dict with matches (same format as get_all_matches) and
+            next_cursor ((date_ts, id), or None on the last page)
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v not in (None, '')}
+        unknown = set(filters) - set(self.PAGE_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown match filters: {sorted(unknown)}")
+        if 'opponent' in filters and 'team' not in filters:
+            raise ValueError("Filter 'opponent' requires 'team'")
+        if 'team' in filters and 'source' in filters:
+            raise ValueError("Filters 'team' and 'source' cannot be combined")
+
+        limit = int(limit)
+        op, direction = ('<', 'DESC') if newest_first else ('>', 'ASC')
+
+        def keyset_where(alias: str, id_column: str) -> Tuple[List[str], List]:
+            where, params = [f"{alias}.date_ts IS NOT NULL"], []
+            if after is not None:
+                where.append(f"({alias}.date_ts, {alias}.{id_column}) {op} (?, ?)")
+                params.extend([date_to_epoch(after[0]), int(after[1])])
+            if 'start' in filters:
+                where.append(f"{alias}.date_ts >= ?")
+                params.append(date_to_epoch(filters['start']))
+            if 'end' in filters:
+                where.append(f"{alias}.date_ts < ?")
+                params.append(date_to_epoch(filters['end']))
+            if 'tournament' in filters:
+                where.append(f"{alias}.tournament_id = (SELECT id FROM tournaments WHERE name = ?)")
+                params.append(filters['tournament'])
+            return where, params
+
+        cursor = self.conn.cursor()
+        keys = []
+
+        if 'team' in filters:
+            # team_matches covers active and archived matches
+            where, params = keyset_where('tm', 'match_id')
+            where.insert(0, "tm.team_id = (SELECT id FROM teams WHERE name = ?)")
+            params.insert(0, filters['team'])
+            if 'opponent' in filters:
+                where.append("tm.opponent_id = (SELECT id FROM teams WHERE name = ?)")
+                params.append(filters['opponent'])
+
+            cursor.execute(f"""
+                SELECT tm.date_ts, tm.match_id FROM team_matches tm
+                WHERE {' AND '.join(where)}
+                ORDER BY tm.date_ts {direction}, tm.match_id {direction}
+                LIMIT ?
+            """, params + [limit + 1])
+            keys = [tuple(row) for row in cursor.fetchall()]
+        else:
+            where, params = keyset_where('m', 'id')
+            if 'source' in filters:
+                where.append("m.source = ?")
+                params.append(filters['source'])
+            where_sql = f"WHERE {' AND '.join(where)}"
+
+            # One bounded index read per partition, merged in Python
+            for schema in ['main'] + self._archive_schemas:
+                cursor.execute(f"""
+                    SELECT m.date_ts, m.id FROM {schema}.matches m
+                    {where_sql}
+                    ORDER BY m.date_ts {direction}, m.id {direction}
+                    LIMIT ?
+                """, params + [limit + 1])
+                keys.extend(tuple(row) for row in cursor.fetchall())
+
+            keys.sort(reverse=newest_first)
+            keys = keys[:limit + 1]
+
+        has_more = len(keys) > limit
+        keys = keys[:limit]
+        if not keys:
+            return {'matches': [], 'next_cursor': None}
+
+        placeholders = ",".join("?" * len(keys))
+        cursor.execute(
+            self._match_select_sql() + f" WHERE m.id IN ({placeholders})",
+            [match_id for _, match_id in keys]
+        )
+        by_id = {row[0]: self._match_dict(row) for row in cursor.fetchall()}
+
+        return {
+            'matches': [by_id[match_id] for _, match_id in keys if match_id in by_id],
+            'next_cursor': keys[-1] if has_more else None
+        }
 
     def get_stats(self) -> Dict:
         """
@@ -509,28 +2032,27 @@ class DatabaseManager:
         Returns:
             Dictionary with counts
         """
-        cursor = self.conn.cursor()
-
-        stats = {}
+        # Read from the trigger-maintained stats_summary (no table scans)
+        tables = {entry['key']: entry for entry in self.get_summary('table')}
 
-        cursor.execute("SELECT COUNT(*) FROM matches")
-        stats['total_matches'] = cursor.fetchone()[0]
+        def count(table):
+            return tables[table]['count'] if table in tables else 0
 
-        cursor.execute("SELECT COUNT(*) FROM teams")
-        stats['total_teams'] = cursor.fetchone()[0]
+        stats = {
+            'total_matches': count('matches'),
+            'total_teams': count('teams'),
+            'total_players': count('players'),
+            'total_tournaments': count('tournaments'),
+            'total_match_players': count('match_players'),
+        }
 
-        cursor.execute("SELECT COUNT(*) FROM players")
-        stats['total_players'] = cursor.fetchone()[0]
+        matches = tables.get('matches', {})
+        stats['date_range'] = (matches.get('first_date'), matches.get('last_date'))
+        stats['last_import_at'] = matches.get('last_import_at')
 
-        cursor.execute("SELECT COUNT(*) FROM tournaments")
-        stats['total_tournaments'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT MIN(date), MAX(date) FROM matches")
-        result = cursor.fetchone()
-        stats['date_range'] = (result[0], result[1])
-
-        cursor.execute("SELECT source, COUNT(*) FROM matches GROUP BY source")
-        stats['by_source'] = {row[0]: row[1] for row in cursor.fetchall()}
+        stats['by_source'] = {
+            entry['key']: entry['count'] for entry in self.get_summary('source') if entry['count']
+        }
 
         return stats
 
@@ -546,17 +2068,17 @@ class DatabaseManager:
         """
         cursor = self.conn.cursor()
 
-        query = """
+        query = f"""
             SELECT
                 m.id, m.external_id, m.date,
                 t1.name as team1_name, t2.name as team2_name,
                 m.team1_score, m.team2_score
-            FROM matches m
+            FROM {self.matches_table} m
             JOIN teams t1 ON m.team1_id = t1.id
             JOIN teams t2 ON m.team2_id = t2.id
             LEFT JOIN tournaments tour ON m.tournament_id = tour.id
             WHERE tour.name = ?
-            ORDER BY m.date
+            ORDER BY m.date_ts, m.id
         """
 
         cursor.execute(query, (tournament_name,))
@@ -575,6 +2097,187 @@ class DatabaseManager:
 
         return matches
 
+    def get_team_schedule(self, team_name: str, limit: int = None,
+                          start=None, end=None, opponent: str = None) -> List[Dict]:
+        """
+        Get a team's matches, newest first (range read on team_matches)
+
+        Args:
+            team_name: Team name
+            limit: Optional number of matches
+            start: Inclusive lower date bound (datetime, ISO string or epoch)
+            end: Exclusive upper date bound
+            opponent: Only matches against this team
+
+        Returns:
+            List of dicts with match_id, date, date_ts, opponent, result
+            ('W'/'L'), score (team's score first) and tournament
+        """
+        cursor = self.conn.cursor()
+
+        query = """
+            SELECT tm.match_id, datetime(tm.date_ts, 'unixepoch'), tm.date_ts,
+                   o.name, tm.won, tm.score_for, tm.score_against, tour.name
+            FROM team_matches tm
+            JOIN teams o ON o.id = tm.opponent_id
+            LEFT JOIN tournaments tour ON tour.id = tm.tournament_id
+            WHERE tm.team_id = (SELECT id FROM teams WHERE name = ?)
+        """
+        params = [team_name]
+
+        if opponent is not None:
+            query += " AND tm.opponent_id = (SELECT id FROM teams WHERE name = ?)"
+            params.append(opponent)
+        if start is not None:
+            query += " AND tm.date_ts >= ?"
+            params.append(date_to_epoch(start))
+        if end is not None:
+            query += " AND tm.date_ts < ?"
+            params.append(date_to_epoch(end))
+
+        query += " ORDER BY tm.date_ts DESC, tm.match_id DESC"
+
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        cursor.execute(query, params)
+
+        return [
+            {
+                'match_id': row[0],
+                'date': row[1],
+                'date_ts': row[2],
+                'opponent': row[3],
+                'result': 'W' if row[4] else 'L',
+                'score': f"{row[5]}-{row[6]}",
+                'tournament': row[7]
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def get_head_to_head(self, team1: str, team2: str, limit: int = None) -> Dict:
+        """
+        Get the head-to-head record between two teams
+
+        Args:
+            team1: Team name (results are from this team's point of view)
+            team2: Opponent name
+            limit: Number of recent matches to include (counts cover all matches)
+
+        Returns:
+            Dict with team1_wins, team2_wins, total and matches (newest first)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(won), 0)
+            FROM team_matches
+            WHERE team_id = (SELECT id FROM teams WHERE name = ?)
+              AND opponent_id = (SELECT id FROM teams WHERE name = ?)
+        """, (team1, team2))
+        total, team1_wins = cursor.fetchone()
+
+        return {
+            'team1': team1,
+            'team2': team2,
+            'team1_wins': team1_wins,
+            'team2_wins': total - team1_wins,
+            'total': total,
+            'matches': self.get_team_schedule(team1, limit=limit, opponent=team2) if total else []
+        }
+
+    def get_team_form(self, team_name: str, n: int = 5) -> Dict:
+        """
+        Get a team's most recent results
+
+        Args:
+            team_name: Team name
+            n: Number of matches
+
+        Returns:
+            Dict with form (e.g. 'WWLWL', newest first), wins and losses
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT won FROM team_matches
+            WHERE team_id = (SELECT id FROM teams WHERE name = ?)
+            ORDER BY date_ts DESC, match_id DESC
+            LIMIT ?
+        """, (team_name, int(n)))
+
+        results = [row[0] for row in cursor.fetchall()]
+        return {
+            'form': ''.join('W' if won else 'L' for won in results),
+            'wins': sum(results),
+            'losses': len(results) - sum(results)
+        }
+
+    def get_team_forms(self, team_names: List[str], n: int = 5) -> Dict[str, Dict]:
+        """
+        Get the most recent results of many teams in one query (see get_team_form)
+
+        Args:
+            team_names: Team names
+            n: Number of matches per team
+
+        Returns:
+            Dict team name -> dict with form, wins and losses (teams without
+            matches get an empty form)
+        """
+        names = list(dict.fromkeys(team_names))
+        results = {name: [] for name in names}
+
+        cursor = self.conn.cursor()
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            cursor.execute(f"""
+                SELECT name, won FROM (
+                    SELECT t.name, tm.won,
+                           ROW_NUMBER() OVER (PARTITION BY tm.team_id
+                                              ORDER BY tm.date_ts DESC, tm.match_id DESC) AS position
+                    FROM teams t
+                    JOIN team_matches tm ON tm.team_id = t.id
+                    WHERE t.name IN ({','.join('?' * len(chunk))})
+                )
+                WHERE position <= ?
+                ORDER BY name, position
+            """, (*chunk, int(n)))
+            for name, won in cursor.fetchall():
+                results[name].append(won)
+
+        return {
+            name: {
+                'form': ''.join('W' if won else 'L' for won in won_list),
+                'wins': sum(won_list),
+                'losses': len(won_list) - sum(won_list)
+            }
+            for name, won_list in results.items()
+        }
+
+    def get_record_vs_regions(self, team_name: str) -> List[Dict]:
+        """
+        Get a team's win/loss record grouped by opponent region
+
+        Args:
+            team_name: Team name
+
+        Returns:
+            List of dicts with region, wins, losses and matches, most played first
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT COALESCE(o.region, 'Unknown'), SUM(tm.won), COUNT(*)
+            FROM team_matches tm
+            JOIN teams o ON o.id = tm.opponent_id
+            WHERE tm.team_id = (SELECT id FROM teams WHERE name = ?)
+            GROUP BY 1
+            ORDER BY 3 DESC
+        """, (team_name,))
+
+        return [
+            {'region': row[0], 'wins': row[1], 'losses': row[2] - row[1], 'matches': row[2]}
+            for row in cursor.fetchall()
+        ]
+
     def get_all_tournament_names(self) -> List[str]:
         """
         Get all unique tournament names from database
@@ -594,8 +2297,223 @@ class DatabaseManager:
 
         return [row[0] for row in cursor.fetchall()]
 
+    # ========== SEASON ARCHIVES ==========
+
+    @property
+    def has_archives(self) -> bool:
+        """Whether sealed season archives are attached"""
+        return bool(self._archive_schemas)
+
+    def _unified(self, table: str) -> str:
+        """Name to read a partitioned table through (view over main + archives)"""
+        if self._archive_schemas and table in self.PARTITIONED_TABLES:
+            return self.PARTITIONED_TABLES[table]
+        return table
+
+    def _attach_archives(self):
+        """
+        Attach sealed season archives read-only and create the unified views
+
+        Views are TEMP because persistent views cannot reference attached
+        databases. Foreign keys stay enforced; writes of rows that reference
+        archived matches (rating snapshots) use foreign_keys_off().
+        """
+        self._archive_schemas = []
+
+        cursor = (self.write_conn or self.conn).cursor()
+        cursor.execute("SELECT season, filename FROM archive_partitions ORDER BY season")
+        partitions = cursor.fetchall()
+
+        connections = [self.conn]
+        if self.write_conn is not None and self.write_conn is not self.conn:
+            connections.append(self.write_conn)
+
+        for season, filename in partitions:
+            path = self.archive_dir / filename
+            if not path.exists():
+                print(f"[WARNING] Archive for season {season} missing: {path}")
+                continue
+
+            schema = f"archive_{season}"
+            uri = f"{path.absolute().as_uri()}?mode=ro"
+            for conn in connections:
+                conn.execute("ATTACH DATABASE ? AS " + schema, (uri,))
+            self._archive_schemas.append(schema)
+
+        if self._archive_schemas:
+            for conn in connections:
+                # query_only (read-only replica) would also block TEMP views
+                query_only = conn.execute("PRAGMA query_only").fetchone()[0]
+                conn.execute("PRAGMA query_only = OFF")
+                for table, view in self.PARTITIONED_TABLES.items():
+                    conn.execute(f"DROP VIEW IF EXISTS temp.{view}")
+                    conn.execute(f"CREATE TEMP VIEW {view} AS {self._union_sql(conn, table)}")
+                conn.execute(f"PRAGMA query_only = {int(query_only)}")
+
+        self.matches_table = self._unified('matches')
+        self.match_players_table = self._unified('match_players')
+
+    def _union_sql(self, conn: sqlite3.Connection, table: str) -> str:
+        """
+        UNION ALL of a table across main and all attached archives
+
+        Columns are taken from main; columns an older archive lacks are
+        filled with NULL so schema migrations do not break the view.
+        """
+        main_columns = [row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+
+        parts = [f"SELECT {', '.join(main_columns)} FROM main.{table}"]
+        for schema in self._archive_schemas:
+            archive_columns = {row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")}
+            select = [
+                column if column in archive_columns else f"NULL AS {column}"
+                for column in main_columns
+            ]
+            parts.append(f"SELECT {', '.join(select)} FROM {schema}.{table}")
+
+        return " UNION ALL ".join(parts)
+
+    def get_partitions(self) -> List[Dict]:
+        """
+        Get sealed season archives
+
+        Returns:
+            List of dicts with season, file, match count, date range and seal time
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT season, filename, match_count,
+                   datetime(min_date_ts, 'unixepoch'), datetime(max_date_ts, 'unixepoch'),
+                   sealed_at
+            FROM archive_partitions
+            ORDER BY season
+        """)
+
+        return [
+            {
+                'season': row[0],
+                'file': str(self.archive_dir / row[1]),
+                'match_count': row[2],
+                'first_date': row[3],
+                'last_date': row[4],
+                'sealed_at': row[5],
+                'attached': f"archive_{row[0]}" in self._archive_schemas
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def archive_season(self, season: int) -> int:
+        """
+        Seal a closed season into its own read-only archive database
+
+        Matches (and their player rows) dated in the given calendar year are
+        copied to db/archive/<db name>_<season>.db, removed from the active
+        database and read back through the all_matches / all_match_players
+        views. New imports keep writing to the active file only.
+
+        Args:
+            season: Calendar year to seal (must be before the current year)
+
+        Returns:
+            Number of matches archived
+        """
+        if self.replica is not None:
+            raise sqlite3.OperationalError("Archive seasons from a direct (non-replica) connection")
+
+        season = int(season)
+        if season >= datetime.now().year:
+            raise ValueError(f"Season {season} is not closed yet")
+
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM archive_partitions WHERE season = ?", (season,))
+        if cursor.fetchone():
+            raise ValueError(f"Season {season} is already archived")
+
+        # One attach slot stays free for the archive being written
+        max_archives = self.conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - 1
+        if len(self._archive_schemas) >= max_archives:
+            raise ValueError(f"SQLite allows at most {max_archives} attached season archives")
+
+        start_ts = date_to_epoch(date_type(season, 1, 1))
+        end_ts = date_to_epoch(date_type(season + 1, 1, 1))
+
+        cursor.execute("""
+            SELECT COUNT(*), MIN(date_ts), MAX(date_ts) FROM main.matches
+            WHERE date_ts >= ? AND date_ts < ?
+        """, (start_ts, end_ts))
+        match_count, min_ts, max_ts = cursor.fetchone()
+        if match_count == 0:
+            print(f"[WARNING] No matches for season {season} in the active database")
+            return 0
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        filename = f"{self.db_path.stem}_{season}.db"
+        path = self.archive_dir / filename
+        if path.exists():
+            # Leftover from an interrupted run (never registered)
+            os.chmod(path, 0o644)
+            path.unlink()
+
+        # 1. Write the archive file
+        self.conn.commit()
+        self.conn.execute("ATTACH DATABASE ? AS archive_new", (str(path),))
+        try:
+            cursor.execute("""
+                CREATE TABLE archive_new.matches AS
+                SELECT * FROM main.matches WHERE date_ts >= ? AND date_ts < ?
+            """, (start_ts, end_ts))
+            cursor.execute("""
+                CREATE TABLE archive_new.match_players AS
+                SELECT * FROM main.match_players
+                WHERE match_id IN (SELECT id FROM archive_new.matches)
+            """)
+            cursor.execute("CREATE UNIQUE INDEX archive_new.idx_matches_id ON matches(id)")
+            cursor.execute("CREATE INDEX archive_new.idx_matches_date_ts ON matches(date_ts, id)")
+            cursor.execute("CREATE INDEX archive_new.idx_matches_team1_date ON matches(team1_id, date_ts)")
+            cursor.execute("CREATE INDEX archive_new.idx_matches_team2_date ON matches(team2_id, date_ts)")
+            cursor.execute("CREATE INDEX archive_new.idx_matches_tournament ON matches(tournament_id, date_ts, id)")
+            cursor.execute("CREATE INDEX archive_new.idx_matches_external_id ON matches(external_id)")
+            cursor.execute("CREATE INDEX archive_new.idx_match_players_match ON match_players(match_id)")
+            cursor.execute("CREATE INDEX archive_new.idx_match_players_player ON match_players(player_id)")
+            self.conn.commit()
+        finally:
+            self.conn.execute("DETACH DATABASE archive_new")
+
+        os.chmod(path, 0o444)
+
+        # 2. Remove the rows from the active file and register the archive
+        #    in one transaction (foreign keys would reject the delete: ratings
+        #    keep referencing the moved matches, so they are off for the move only).
+        #    Moving rows is not a data change: the deletes are dropped from
+        #    the change log and the data version is restored.
+        data_version = self.get_data_version()
+        with self.foreign_keys_off():
+            cursor.execute("""
+                DELETE FROM main.match_players WHERE match_id IN (
+                    SELECT id FROM main.matches WHERE date_ts >= ? AND date_ts < ?
+                )
+            """, (start_ts, end_ts))
+            cursor.execute("DELETE FROM main.matches WHERE date_ts >= ? AND date_ts < ?", (start_ts, end_ts))
+            cursor.execute("DELETE FROM match_changes WHERE version > ?", (data_version,))
+            cursor.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'match_changes'", (data_version,))
+            cursor.execute("""
+                INSERT INTO archive_partitions (season, filename, match_count, min_date_ts, max_date_ts)
+                VALUES (?, ?, ?, ?, ?)
+            """, (season, filename, match_count, min_ts, max_ts))
+
+        # 3. Re-attach all archives and recount statistics across partitions
+        for schema in self._archive_schemas:
+            self.conn.execute(f"DETACH DATABASE {schema}")
+        self._attach_archives()
+        self.rebuild_stats()
+
+        print(f"[OK] Archived {match_count} matches of season {season} to {path}")
+        return match_count
+
     def close(self):
         """Close database connection"""
+        if self.write_conn and self.write_conn is not self.conn:
+            self.write_conn.close()
         if self.conn:
             self.conn.close()
 
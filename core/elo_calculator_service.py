@@ -6,9 +6,13 @@ Provides instant access to pre-calculated ratings
 
 import hashlib
 import json
+import time
+from contextlib import nullcontext
+from itertools import islice
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from core.database import DatabaseManager
+from core.database import DatabaseManager, date_to_epoch
+from core.rating_cache import RATING_CACHE
 
 
 class EloCalculatorService:
@@ -20,6 +24,11 @@ class EloCalculatorService:
     - ELO configs table: Which calculation method was used
     - ELO ratings table: Calculated results (cached)
 
+    Rating history storage modes:
+    - 'full': elo_ratings, one row per team per match with date and losses
+    - 'compact': elo_ratings_compact, WITHOUT ROWID with integer keys only
+      (dates come from matches, losses = matches - wins)
+
     Usage:
         service = EloCalculatorService()
         ratings = service.calculate_or_load_elos(
@@ -29,10 +38,41 @@ class EloCalculatorService:
         )
     """
 
-    def __init__(self, db: DatabaseManager = None):
-        """Initialize service"""
+    STORAGE_MODES = ('full', 'compact')
+
+    # Retention of calculated configs (see enforce_retention)
+    RETENTION_MAX_CONFIGS = 50
+    RETENTION_MAX_BYTES = 512 * 1024 * 1024
+    ACCESS_TOUCH_SECONDS = 300      # min interval between last_accessed_at writes
+
+    # Per-config history tables: table -> columns identifying a row (config_id first,
+    # so batched deletes never reach rows of other configs)
+    CONFIG_TABLES = {
+        'elo_ratings': ('id',),
+        'elo_ratings_compact': ('config_id', 'team_id', 'matches_played'),
+        'predictions': ('config_id', 'match_id'),
+    }
+
+    # Approximate on-disk bytes per row including indexes (measured on 20k matches)
+    ROW_BYTES = {'elo_ratings': 130, 'elo_ratings_compact': 28, 'predictions': 60}
+
+    # (database file, config_id) -> time of the last last_accessed_at write
+    _touched: Dict[Tuple[str, int], float] = {}
+
+    def __init__(self, db: DatabaseManager = None, rating_storage: str = 'full'):
+        """
+        Initialize service
+
+        Args:
+            db: DatabaseManager instance (creates new if None)
+            rating_storage: History storage for newly calculated configs ('full' or 'compact')
+        """
+        if rating_storage not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown rating storage: {rating_storage}")
+
         self.db = db or DatabaseManager()
         self._close_db_on_exit = db is None
+        self.rating_storage = rating_storage
 
     def calculate_or_load_elos(self,
                                 variant: str = 'tournament_context',
@@ -40,7 +80,8 @@ class EloCalculatorService:
                                 use_scale_factors: bool = True,
                                 use_regional_offsets: bool = False,
                                 scale_factors: Dict = None,
-                                force_recalculate: bool = False) -> Tuple[int, Dict]:
+                                force_recalculate: bool = False,
+                                matches: List[Dict] = None) -> Tuple[int, Dict]:
         """
         Calculate or load ELO ratings
 
@@ -51,11 +92,94 @@ class EloCalculatorService:
             use_regional_offsets: Whether to apply regional offsets to the base variant
             scale_factors: Scale factor configuration
             force_recalculate: If True, recalculate even if cached
+            matches: Preloaded get_all_matches() rows to replay (see warm_up)
 
         Returns:
             Tuple of (config_id, ratings_dict)
             ratings_dict: {team_name: {'elo': float, 'matches': int, 'wins': int, 'losses': int}}
         """
+        config = self.build_config(variant, k_factor, use_scale_factors,
+                                   use_regional_offsets, scale_factors)
+
+        # Generate config hash
+        config_hash = self._hash_config(config)
+
+        # Data version the results will reflect (taken before reading matches)
+        data_version = self.db.get_data_version()
+        cache_key = RATING_CACHE.make_key(self.db.db_path, 'ratings', config_hash, data_version)
+
+        if not force_recalculate:
+            cached = RATING_CACHE.get(cache_key)
+            if cached and self._config_exists(cached[0]):
+                self._touch_config(cached[0])
+                return cached
+
+        # Check if already calculated
+        config_id = self._get_config_id(config_hash)
+        since_ts = None
+
+        if config_id and not force_recalculate:
+            stored_version = self._get_config_data_version(config_id)
+            changes = None
+            if stored_version is not None and stored_version < data_version:
+                changes = self.db.get_changes_since(stored_version)
+
+            if stored_version is None or stored_version > data_version:
+                # Calculated before data versions existed (or on another database)
+                print(f"[MIGRATE] No usable data version for {variant} K={k_factor}, recalculating")
+            elif changes is None:
+                if stored_version != data_version:
+                    self._set_config_data_version(config_id, data_version)
+                print(f"[CACHE] Loading ELOs for {variant} K={k_factor}")
+                result = (config_id, self._load_ratings_from_db(config_id))
+                RATING_CACHE.put(cache_key, result)
+                self._touch_config(config_id)
+                return result
+            else:
+                # Matches before the earliest change keep their snapshots
+                since_ts = changes['since_ts']
+                print(f"[REFRESH] {changes['count']} match changes since ELOs for {variant} K={k_factor}")
+
+        # Need to calculate
+        print(f"[CALC] Calculating ELOs for {variant} K={k_factor}")
+
+        # Save or get config
+        if not config_id:
+            config_id = self._save_config(config, config_hash)
+            # New configs count against the storage budget
+            self.enforce_retention(keep=(config_id,))
+        elif since_ts is None:
+            # Clear old ratings for this config
+            self._clear_ratings_for_config(config_id)
+            self._set_config_storage(config_id, self.rating_storage)
+
+        # Calculate ELOs (the replay is cheap compared to writing its history)
+        ratings = self._calculate_elos(config, matches)
+
+        # Save to database (only snapshots from since_ts on for a refresh)
+        self._save_ratings_to_db(config_id, ratings, data_version, since_ts)
+        self._prune_change_log()
+
+        result = (config_id, ratings)
+        RATING_CACHE.put(cache_key, result)
+        self._touch_config(config_id)
+        return result
+
+    @staticmethod
+    def build_config(variant: str = 'tournament_context',
+                     k_factor: float = 24,
+                     use_scale_factors: bool = True,
+                     use_regional_offsets: bool = False,
+                     scale_factors: Dict = None) -> Dict:
+        """
+        Build the config dict (cache identity) for a set of ELO parameters
+
+        Args:
+            Same as calculate_or_load_elos
+
+        Returns:
+            Config dict with default scale factors filled in
+        """
         # Default scale factors
         if scale_factors is None:
             scale_factors = {
@@ -64,8 +188,7 @@ class EloCalculatorService:
                 '3-0': 1.00, '3-1': 0.90, '3-2': 0.80,
             }
 
-        # Create config
-        config = {
+        return {
             'variant': variant,
             'k_factor': k_factor,
             'use_scale_factors': use_scale_factors,
@@ -73,35 +196,37 @@ class EloCalculatorService:
             'scale_factors': scale_factors if use_scale_factors else None
         }
 
-        # Generate config hash
-        config_hash = self._hash_config(config)
+    def get_current_config_id(self, **params) -> Optional[int]:
+        """
+        Get the config ID if its stored ratings are calculated and up to date
 
-        # Check if already calculated
-        config_id = self._get_config_id(config_hash)
+        Args:
+            **params: Same parameters as calculate_or_load_elos (without force_recalculate)
 
-        if config_id and not force_recalculate:
-            print(f"[CACHE] Loading ELOs for {variant} K={k_factor}")
-            return config_id, self._load_ratings_from_db(config_id)
+        Returns:
+            Config ID, or None if calculate_or_load_elos would have to (re)calculate
+        """
+        config_hash = self._hash_config(self.build_config(**params))
+        data_version = self.db.get_data_version()
 
-        # Need to calculate
-        print(f"[CALC] Calculating ELOs for {variant} K={k_factor}")
+        cached = RATING_CACHE.get(RATING_CACHE.make_key(self.db.db_path, 'ratings', config_hash, data_version))
+        if cached and self._config_exists(cached[0]):
+            return cached[0]
 
-        # Save or get config
+        config_id = self._get_config_id(config_hash)
         if not config_id:
-            config_id = self._save_config(config, config_hash)
-        else:
-            # Clear old ratings for this config
-            self._clear_ratings_for_config(config_id)
+            return None
 
-        # Calculate ELOs
-        ratings = self._calculate_elos(config)
+        stored_version = self._get_config_data_version(config_id)
 
-        # Save to database
-        self._save_ratings_to_db(config_id, ratings)
+        if stored_version is None or stored_version > data_version:
+            return None
+        if stored_version < data_version and self.db.get_changes_since(stored_version):
+            return None
+        return config_id
 
-        return config_id, ratings
-
-    def _hash_config(self, config: Dict) -> str:
+    @staticmethod
+    def _hash_config(config: Dict) -> str:
         """Generate hash for config"""
         config_str = json.dumps(config, sort_keys=True)
         return hashlib.md5(config_str.encode()).hexdigest()
@@ -113,16 +238,31 @@ class EloCalculatorService:
         result = cursor.fetchone()
         return result[0] if result else None
 
-    def _save_config(self, config: Dict, config_hash: str) -> int:
-        """Save config to database"""
+    def _config_exists(self, config_id: int) -> bool:
+        """Check that a config (e.g. from the rating cache) was not deleted meanwhile"""
         cursor = self.db.conn.cursor()
+        cursor.execute("SELECT 1 FROM elo_configs WHERE id = ?", (config_id,))
+        return cursor.fetchone() is not None
+
+    def _touch_config(self, config_id: int):
+        """Record an access for retention (throttled, process-wide)"""
+        key = (str(self.db.db_path), config_id)
+        now = time.time()
+        if now - self._touched.get(key, 0) < self.ACCESS_TOUCH_SECONDS:
+            return
+        self._touched[key] = now
+        self.db.execute_write("UPDATE elo_configs SET last_accessed_at = CURRENT_TIMESTAMP WHERE id = ?",
+                              (config_id,))
+        self.db.commit()
 
+    def _save_config(self, config: Dict, config_hash: str) -> int:
+        """Save config to database"""
         name = f"{config['variant'].replace('_', ' ').title()} (K={config['k_factor']})"
 
-        cursor.execute("""
+        cursor = self.db.execute_write("""
             INSERT INTO elo_configs
-            (name, variant, k_factor, use_scale_factors, scale_factors, parameters, config_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (name, variant, k_factor, use_scale_factors, scale_factors, parameters, config_hash, storage)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             name,
             config['variant'],
@@ -130,21 +270,63 @@ class EloCalculatorService:
             config['use_scale_factors'],
             json.dumps(config['scale_factors']) if config['scale_factors'] else None,
             json.dumps(config),
-            config_hash
+            config_hash,
+            self.rating_storage
         ))
 
-        self.db.conn.commit()
+        self.db.commit()
         return cursor.lastrowid
 
+    def _get_config_data_version(self, config_id: int) -> Optional[int]:
+        """Get the data version a config's stored ratings were calculated from"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT data_version FROM elo_configs WHERE id = ?", (config_id,))
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def _set_config_data_version(self, config_id: int, data_version: int):
+        """Mark a config's stored ratings as up to date with a data version"""
+        self.db.execute_write("UPDATE elo_configs SET data_version = ? WHERE id = ?", (data_version, config_id))
+        self.db.commit()
+
+    def _prune_change_log(self):
+        """Drop match change log rows every config has already caught up with"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT MIN(data_version) FROM elo_configs")
+        oldest = cursor.fetchone()[0]
+        if oldest is not None:
+            self.db.prune_change_log(oldest)
+
+    def _get_config_storage(self, config_id: int) -> str:
+        """Get the history storage mode of a config"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT storage FROM elo_configs WHERE id = ?", (config_id,))
+        result = cursor.fetchone()
+        return (result[0] if result else None) or 'full'
+
+    def _set_config_storage(self, config_id: int, storage: str):
+        """Set the history storage mode of a config"""
+        self.db.execute_write("UPDATE elo_configs SET storage = ? WHERE id = ?", (storage, config_id))
+        self.db.commit()
+
     def _clear_ratings_for_config(self, config_id: int):
         """Clear all ratings for a config"""
-        cursor = self.db.conn.cursor()
-        cursor.execute("DELETE FROM elo_ratings WHERE config_id = ?", (config_id,))
-        self.db.conn.commit()
+        self.db.execute_write("DELETE FROM elo_ratings WHERE config_id = ?", (config_id,))
+        self.db.execute_write("DELETE FROM elo_ratings_compact WHERE config_id = ?", (config_id,))
+        self.db.execute_write("DELETE FROM predictions WHERE config_id = ?", (config_id,))
+        self.db.commit()
 
-    def _calculate_elos(self, config: Dict) -> Dict:
-        """Calculate ELO ratings for all matches"""
-        # Import ELO variant
+    @staticmethod
+    def create_calculator(config: Dict):
+        """
+        Create a fresh (unrated) ELO calculator for a config
+
+        Args:
+            config: Config dict (see build_config)
+
+        Returns:
+            Variant wrapper with update_ratings() / get_rating()
+        """
         variant = config['variant']
         use_regional_offsets = config.get('use_regional_offsets', False)
 
@@ -196,8 +378,96 @@ class EloCalculatorService:
         else:
             raise ValueError(f"Unknown variant: {variant}")
 
+        return elo
+
+    def get_calculator(self, matches: List[Dict] = None, **params):
+        """
+        Get a calculator replayed over all matches (shared, read-only)
+
+        Served from the process-wide rating cache, so pages that need the
+        calculator state itself (e.g. regional offsets and their history)
+        do not replay every match on each render.
+
+        Args:
+            matches: Preloaded get_all_matches() rows to replay on a miss
+            **params: Same parameters as calculate_or_load_elos (without force_recalculate)
+
+        Returns:
+            Variant wrapper as returned by create_calculator, after all matches
+        """
+        config = self.build_config(**params)
+        cache_key = RATING_CACHE.make_key(self.db.db_path, 'calculator',
+                                          self._hash_config(config), self.db.get_data_version())
+
+        def replay():
+            elo = self.create_calculator(config)
+            for match in matches if matches is not None else self.db.get_all_matches(limit=None):
+                self._update_calculator(elo, config['variant'], match)
+            return elo
+
+        return RATING_CACHE.get_or_compute(cache_key, replay)
+
+    def warm_up(self, configs: List[Dict], calculators: List[Dict] = (),
+                progress=None) -> List[int]:
+        """
+        Bring a set of configs up to date and into the rating cache
+
+        Fused path for post-import warm-up: matches are loaded once and
+        replayed for every config that is missing or outdated; current
+        configs are only loaded into the cache.
+
+        Args:
+            configs: calculate_or_load_elos parameter dicts
+            calculators: get_calculator parameter dicts to warm as well
+            progress: Optional callback(fraction, message)
+
+        Returns:
+            Config IDs in the order of configs
+        """
+        matches = None
+        config_ids = []
+        total = len(configs) + len(calculators)
+
+        for i, params in enumerate(list(configs) + list(calculators)):
+            label = f"{params['variant']} K={params['k_factor']}"
+            if progress:
+                progress(i / total, f"Warming up {label} ({i + 1}/{total})")
+
+            if i < len(configs):
+                if matches is None and not self.get_current_config_id(**params):
+                    matches = self.db.get_all_matches(limit=None)
+                config_ids.append(self.calculate_or_load_elos(matches=matches, **params)[0])
+            else:
+                # Replays (with the shared matches if loaded) only on a cache miss
+                self.get_calculator(matches=matches, **params)
+
+        return config_ids
+
+    @staticmethod
+    def _update_calculator(elo, variant: str, match: Dict):
+        """Feed one match (get_all_matches row) into a calculator"""
+        if variant == 'tournament_context':
+            elo.update_ratings(
+                match['team1_name'], match['team2_name'],
+                match['team1_score'], match['team2_score'],
+                tournament=match.get('tournament'),
+                stage=match.get('stage')
+            )
+        else:
+            elo.update_ratings(
+                match['team1_name'], match['team2_name'],
+                match['team1_score'], match['team2_score']
+            )
+
+    def _calculate_elos(self, config: Dict, matches: List[Dict] = None) -> Dict:
+        """Calculate ELO ratings for all matches (optionally preloaded)"""
+        variant = config['variant']
+        use_regional_offsets = config.get('use_regional_offsets', False)
+        elo = self.create_calculator(config)
+
         # Load matches chronologically
-        matches = self.db.get_all_matches(limit=None)
+        if matches is None:
+            matches = self.db.get_all_matches(limit=None)
 
         # Track ratings after each match
         ratings_history = []
@@ -213,19 +483,13 @@ class EloCalculatorService:
             if team2 not in team_stats:
                 team_stats[team2] = {'matches': 0, 'wins': 0, 'losses': 0}
 
+            # Pre-match prediction from the current ratings
+            pre1 = elo.get_rating(team1)
+            pre2 = elo.get_rating(team2)
+            p_team1 = 1 / (1 + 10 ** ((pre2 - pre1) / 400))
+
             # Update ratings
-            if variant == 'tournament_context':
-                elo.update_ratings(
-                    team1, team2,
-                    match['team1_score'], match['team2_score'],
-                    tournament=match.get('tournament'),
-                    stage=match.get('stage')
-                )
-            else:
-                elo.update_ratings(
-                    team1, team2,
-                    match['team1_score'], match['team2_score']
-                )
+            self._update_calculator(elo, variant, match)
 
             # Update stats
             team_stats[team1]['matches'] += 1
@@ -242,6 +506,7 @@ class EloCalculatorService:
             ratings_history.append({
                 'match_id': match['id'],
                 'date': match['date'],
+                'date_ts': match['date_ts'],
                 'team1': team1,
                 'team2': team2,
                 'elo1': elo.get_rating(team1),
@@ -252,6 +517,10 @@ class EloCalculatorService:
                 'wins2': team_stats[team2]['wins'],
                 'losses1': team_stats[team1]['losses'],
                 'losses2': team_stats[team2]['losses'],
+                'pre_elo1': pre1,
+                'pre_elo2': pre2,
+                'p_team1': p_team1,
+                'team1_won': match['winner'] == team1,
             })
 
         # Build final ratings dict (latest ELO for each team)
@@ -299,58 +568,184 @@ class EloCalculatorService:
 
         return final_ratings
 
-    def _save_ratings_to_db(self, config_id: int, ratings: Dict):
-        """Save ratings to database"""
-        cursor = self.db.conn.cursor()
+    # Rows per executemany call when streaming snapshots into the database
+    WRITE_CHUNK_SIZE = 10000
+
+    def _save_ratings_to_db(self, config_id: int, ratings: Dict,
+                            data_version: int = None, since_ts: int = None):
+        """
+        Save rating history and predictions in one transaction
+
+        Team ids are resolved with a single query and rows are streamed into
+        executemany in chunks. When the new rows outnumber the existing
+        elo_ratings table (e.g. the first config), its secondary indexes are
+        dropped for the load and rebuilt once afterwards.
 
+        Args:
+            config_id: Config ID
+            ratings: Result of _calculate_elos (with '_history')
+            data_version: Data version the ratings reflect
+            since_ts: Only replace stored snapshots of matches from this date on
+                (earlier matches are unchanged, so their snapshots are too)
+        """
         history = ratings.pop('_history')
+        team_ids = self._get_team_ids()
+        compact = self._get_config_storage(config_id) == 'compact'
+
+        # Full snapshots of archived matches reference match rows in another file
+        with self.db.foreign_keys_off() if self.db.has_archives and not compact else nullcontext():
+            if since_ts is not None:
+                self._delete_ratings_from(config_id, since_ts)
+                history = [s for s in history if s['date_ts'] is None or s['date_ts'] >= since_ts]
+
+            if compact:
+                self._save_compact_ratings(config_id, history, team_ids)
+                label = " (compact)"
+            else:
+                cursor = self.db.conn.cursor()
+                cursor.execute("SELECT COUNT(*) FROM elo_ratings")
+                existing = cursor.fetchone()[0]
+
+                if 2 * len(history) > existing:
+                    with self.db.deferred_indexes('elo_ratings'):
+                        self._save_full_ratings(config_id, history, team_ids)
+                else:
+                    self._save_full_ratings(config_id, history, team_ids)
+                label = ""
 
-        # Batch insert for performance
+            self._save_predictions(config_id, history, team_ids)
+
+            if data_version is not None:
+                self.db.execute_write("UPDATE elo_configs SET data_version = ? WHERE id = ?",
+                                      (data_version, config_id))
+
+            self.db.commit()
+        print(f"  [OK] Saved {len(history)} match snapshots to database{label}")
+
+    def _delete_ratings_from(self, config_id: int, since_ts: int):
+        """
+        Delete a config's snapshots and predictions except those of matches before since_ts
+        (caller commits)
+
+        Matches dated before since_ts are untouched by definition, so anything
+        else (later, moved or deleted matches) is rewritten.
+        """
+        for table in ('elo_ratings', 'elo_ratings_compact', 'predictions'):
+            self.db.execute_write(f"""
+                DELETE FROM {table}
+                WHERE config_id = ?
+                  AND match_id NOT IN (SELECT id FROM {self.db.matches_table} WHERE date_ts < ?)
+            """, (config_id, since_ts))
+
+    def _get_team_ids(self) -> Dict[str, int]:
+        """Get {team_name: team_id} for all teams"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT name, id FROM teams")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def _write_chunked(self, query: str, rows):
+        """executemany over an iterable of rows, WRITE_CHUNK_SIZE rows at a time (caller commits)"""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.WRITE_CHUNK_SIZE))
+            if not chunk:
+                break
+            self.db.executemany_write(query, chunk)
+
+    def _save_full_ratings(self, config_id: int, history: List[Dict], team_ids: Dict[str, int]):
+        """Save rating history to elo_ratings (caller commits)"""
+        rows = [
+            (
+                config_id,
+                team_ids[snapshot['team' + side]],
+                snapshot['match_id'],
+                snapshot['elo' + side],
+                snapshot['matches' + side],
+                snapshot['wins' + side],
+                snapshot['losses' + side],
+                snapshot['date'],
+                snapshot['date_ts']
+            )
+            for snapshot in history
+            for side in ('1', '2')
+            if snapshot['team' + side] in team_ids
+        ]
+
+        # Team by team, chronological within a team: keeps the
+        # (config, team, match) and team indexes append-mostly instead of
+        # scattering every insert
+        rows.sort(key=lambda row: (row[1], row[4]))
+
+        self._write_chunked("""
+            INSERT OR REPLACE INTO elo_ratings
+            (config_id, team_id, match_id, elo_value, matches_played, wins, losses, date, date_ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def _save_compact_ratings(self, config_id: int, history: List[Dict], team_ids: Dict[str, int]):
+        """Save rating history to the compact table (caller commits)"""
+        rows = []
+        for snapshot in history:
+            for side in ('1', '2'):
+                team_id = team_ids.get(snapshot['team' + side])
+                if team_id:
+                    rows.append((
+                        config_id,
+                        team_id,
+                        snapshot['matches' + side],
+                        snapshot['match_id'],
+                        snapshot['elo' + side],
+                        snapshot['wins' + side]
+                    ))
+
+        # Insert in primary key order so the WITHOUT ROWID b-tree is appended to
+        rows.sort(key=lambda row: (row[1], row[2]))
+
+        self._write_chunked("""
+            INSERT OR REPLACE INTO elo_ratings_compact
+            (config_id, team_id, matches_played, match_id, elo_value, wins)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def _save_predictions(self, config_id: int, history: List[Dict], team_ids: Dict[str, int]):
+        """Save the pre-match predictions of a replay (caller commits)"""
+        rows = []
         for snapshot in history:
-            # Team 1
-            team1_id = self._get_team_id(snapshot['team1'])
-            if team1_id:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO elo_ratings
-                    (config_id, team_id, match_id, elo_value, matches_played, wins, losses, date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    config_id,
-                    team1_id,
-                    snapshot['match_id'],
-                    snapshot['elo1'],
-                    snapshot['matches1'],
-                    snapshot['wins1'],
-                    snapshot['losses1'],
-                    snapshot['date']
-                ))
-
-            # Team 2
-            team2_id = self._get_team_id(snapshot['team2'])
-            if team2_id:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO elo_ratings
-                    (config_id, team_id, match_id, elo_value, matches_played, wins, losses, date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    config_id,
-                    team2_id,
-                    snapshot['match_id'],
-                    snapshot['elo2'],
-                    snapshot['matches2'],
-                    snapshot['wins2'],
-                    snapshot['losses2'],
-                    snapshot['date']
-                ))
-
-        self.db.conn.commit()
-        print(f"  [OK] Saved {len(history)} match snapshots to database")
+            team1_id = team_ids.get(snapshot['team1'])
+            team2_id = team_ids.get(snapshot['team2'])
+            team1_favored = snapshot['p_team1'] > 0.5
+            rows.append((
+                config_id,
+                snapshot['match_id'],
+                team1_id,
+                team2_id,
+                snapshot['pre_elo1'],
+                snapshot['pre_elo2'],
+                abs(snapshot['pre_elo1'] - snapshot['pre_elo2']),
+                snapshot['p_team1'],
+                team1_id if team1_favored else team2_id,
+                int(team1_favored == snapshot['team1_won'])
+            ))
+
+        # Primary key order (history is chronological, not by match id)
+        rows.sort(key=lambda row: row[1])
+
+        self._write_chunked("""
+            INSERT OR REPLACE INTO predictions
+            (config_id, match_id, team1_id, team2_id, team1_elo, team2_elo,
+             elo_diff, p_team1, predicted_winner_id, correct)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
 
     def _load_ratings_from_db(self, config_id: int) -> Dict:
         """Load latest ratings from database"""
+        if self._get_config_storage(config_id) == 'compact':
+            return self._load_compact_ratings(config_id)
+
         cursor = self.db.conn.cursor()
 
-        # Get latest rating for each team
+        # Latest rating per team = highest matches_played (a refresh rewrites
+        # undated snapshots with new ids, so MAX(id) is not the latest)
         cursor.execute("""
             SELECT
                 t.name,
@@ -358,15 +753,17 @@ class EloCalculatorService:
                 r.matches_played,
                 r.wins,
                 r.losses
-            FROM elo_ratings r
-            JOIN teams t ON r.team_id = t.id
-            WHERE r.config_id = ?
-            AND r.id IN (
-                SELECT MAX(id)
+            FROM (
+                SELECT team_id, MAX(matches_played) AS last_played
                 FROM elo_ratings
                 WHERE config_id = ?
                 GROUP BY team_id
-            )
+            ) latest
+            JOIN elo_ratings r
+              ON r.config_id = ?
+             AND r.team_id = latest.team_id
+             AND r.matches_played = latest.last_played
+            JOIN teams t ON r.team_id = t.id
             ORDER BY r.elo_value DESC
         """, (config_id, config_id))
 
@@ -381,25 +778,353 @@ class EloCalculatorService:
 
         return ratings
 
-    def _get_team_id(self, team_name: str) -> Optional[int]:
-        """Get team ID by name"""
+    def _load_compact_ratings(self, config_id: int) -> Dict:
+        """Load latest ratings from the compact table"""
         cursor = self.db.conn.cursor()
-        cursor.execute("SELECT id FROM teams WHERE name = ?", (team_name,))
-        result = cursor.fetchone()
-        return result[0] if result else None
+
+        # Latest row per team = highest matches_played (primary key order)
+        cursor.execute("""
+            SELECT
+                t.name,
+                r.elo_value,
+                r.matches_played,
+                r.wins,
+                r.matches_played - r.wins
+            FROM (
+                SELECT team_id, MAX(matches_played) AS last_played
+                FROM elo_ratings_compact
+                WHERE config_id = ?
+                GROUP BY team_id
+            ) latest
+            JOIN elo_ratings_compact r
+              ON r.config_id = ?
+             AND r.team_id = latest.team_id
+             AND r.matches_played = latest.last_played
+            JOIN teams t ON r.team_id = t.id
+            ORDER BY r.elo_value DESC
+        """, (config_id, config_id))
+
+        ratings = {}
+        for row in cursor.fetchall():
+            ratings[row[0]] = {
+                'elo': row[1],
+                'matches': row[2],
+                'wins': row[3],
+                'losses': row[4]
+            }
+
+        return ratings
+
+    def get_rating_after_match(self, config_id: int, team_name: str,
+                               match_id: int) -> Optional[Dict]:
+        """
+        Get a team's rating snapshot right after a given match
+
+        Args:
+            config_id: Config ID
+            team_name: Team name
+            match_id: Match ID (from matches table)
+
+        Returns:
+            Dict with elo, matches, wins, losses, date_ts or None if the team
+            did not play that match
+        """
+        cursor = self.db.conn.cursor()
+
+        if self._get_config_storage(config_id) == 'compact':
+            cursor.execute(f"""
+                SELECT r.elo_value, r.matches_played, r.wins,
+                       r.matches_played - r.wins, m.date_ts
+                FROM elo_ratings_compact r
+                JOIN teams t ON r.team_id = t.id
+                JOIN {self.db.matches_table} m ON r.match_id = m.id
+                WHERE r.config_id = ? AND t.name = ? AND r.match_id = ?
+            """, (config_id, team_name, match_id))
+        else:
+            cursor.execute("""
+                SELECT r.elo_value, r.matches_played, r.wins, r.losses, r.date_ts
+                FROM elo_ratings r
+                JOIN teams t ON r.team_id = t.id
+                WHERE r.config_id = ? AND t.name = ? AND r.match_id = ?
+            """, (config_id, team_name, match_id))
+
+        row = cursor.fetchone()
+        if not row:
+            return None
+
+        return {
+            'elo': row[0],
+            'matches': row[1],
+            'wins': row[2],
+            'losses': row[3],
+            'date_ts': row[4]
+        }
+
+    def get_team_timeline(self, config_id: int, team_name: str) -> List[Dict]:
+        """
+        Get a team's full rating timeline in chronological order
+
+        Args:
+            config_id: Config ID
+            team_name: Team name
+
+        Returns:
+            List of dicts with match_id, date_ts, elo, matches, wins, losses
+        """
+        cursor = self.db.conn.cursor()
+
+        if self._get_config_storage(config_id) == 'compact':
+            cursor.execute(f"""
+                SELECT r.match_id, m.date_ts, r.elo_value, r.matches_played,
+                       r.wins, r.matches_played - r.wins
+                FROM elo_ratings_compact r
+                JOIN teams t ON r.team_id = t.id
+                JOIN {self.db.matches_table} m ON r.match_id = m.id
+                WHERE r.config_id = ? AND t.name = ?
+                ORDER BY r.matches_played
+            """, (config_id, team_name))
+        else:
+            cursor.execute("""
+                SELECT r.match_id, r.date_ts, r.elo_value, r.matches_played,
+                       r.wins, r.losses
+                FROM elo_ratings r
+                JOIN teams t ON r.team_id = t.id
+                WHERE r.config_id = ? AND t.name = ?
+                ORDER BY r.matches_played
+            """, (config_id, team_name))
+
+        return [
+            {
+                'match_id': row[0],
+                'date_ts': row[1],
+                'elo': row[2],
+                'matches': row[3],
+                'wins': row[4],
+                'losses': row[5]
+            }
+            for row in cursor.fetchall()
+        ]
+
+    # Matchup buckets by absolute pre-match ELO difference (upper bound, label)
+    ELO_DIFF_BUCKETS = (
+        (25, 'Toss-up (<25)'),
+        (50, 'Close (25-50)'),
+        (100, 'Moderate (50-100)'),
+        (150, 'Large (100-150)'),
+        (None, 'Stomp (>150)'),
+    )
+
+    # 1 if team1 won (derived from the favourite and whether it was right)
+    _OUTCOME_SQL = "((p.p_team1 > 0.5) = (p.correct = 1))"
+
+    def _prediction_from_sql(self, start=None, end=None) -> Tuple[str, List]:
+        """FROM/WHERE clause (predictions joined with matches) and params for a date range"""
+        sql = f"""
+            FROM predictions p
+            JOIN {self.db.matches_table} m ON p.match_id = m.id
+            JOIN teams t1 ON m.team1_id = t1.id
+            JOIN teams t2 ON m.team2_id = t2.id
+            LEFT JOIN tournaments tour ON m.tournament_id = tour.id
+            WHERE p.config_id = ?
+        """
+        params = []
+        if start is not None:
+            sql += " AND m.date_ts >= ?"
+            params.append(date_to_epoch(start))
+        if end is not None:
+            sql += " AND m.date_ts < ?"
+            params.append(date_to_epoch(end))
+        return sql, params
+
+    def get_predictions(self, config_id: int, start=None, end=None) -> List[Dict]:
+        """
+        Get the stored pre-match predictions of a config in chronological order
+
+        The dicts carry the keys MetricsCalculator expects ('predicted',
+        'actual', 'probability', 'outcome', 'league'), so no replay is needed.
+
+        Args:
+            config_id: Config ID
+            start: Inclusive lower date bound (datetime, ISO string or epoch)
+            end: Exclusive upper date bound
+
+        Returns:
+            List of prediction dicts
+        """
+        from_sql, params = self._prediction_from_sql(start, end)
+
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT p.match_id, m.date, t1.name, t2.name, p.team1_elo, p.team2_elo,
+                   p.elo_diff, p.p_team1, p.correct, {self._OUTCOME_SQL},
+                   tour.name, m.stage, m.team1_score, m.team2_score
+            {from_sql}
+            ORDER BY m.date_ts, m.id
+        """, [config_id] + params)
+
+        predictions = []
+        for row in cursor.fetchall():
+            team1, team2, outcome = row[2], row[3], row[9]
+            predictions.append({
+                'match_id': row[0],
+                'date': row[1],
+                'team1': team1,
+                'team2': team2,
+                'elo1': row[4],
+                'elo2': row[5],
+                'elo_diff': row[6],
+                'probability': row[7],
+                'outcome': outcome,
+                'predicted': team1 if row[7] > 0.5 else team2,
+                'actual': team1 if outcome else team2,
+                'correct': bool(row[8]),
+                'tournament': row[10],
+                'league': row[10] or 'Unknown',
+                'stage': row[11],
+                'score': f"{row[12]}-{row[13]}"
+            })
+
+        return predictions
+
+    def get_prediction_accuracy(self, config_id: int, by: str = 'tournament',
+                                start=None, end=None) -> List[Dict]:
+        """
+        Aggregate stored predictions (accuracy, confidence, Brier score) per group
+
+        Args:
+            config_id: Config ID
+            by: 'tournament', 'stage', 'year', 'closeness' or 'elo_diff'
+            start: Inclusive lower date bound
+            end: Exclusive upper date bound
+
+        Returns:
+            List of dicts with key, total, correct, accuracy, avg_confidence, brier
+        """
+        buckets = " ".join(
+            f"WHEN p.elo_diff < {upper} THEN '{label}'" if upper is not None else f"ELSE '{label}'"
+            for upper, label in self.ELO_DIFF_BUCKETS
+        )
+        groups = {
+            'tournament': ("COALESCE(tour.name, 'Unknown')", "total DESC"),
+            'stage': ("COALESCE(m.stage, 'Unknown')", "total DESC"),
+            'year': ("strftime('%Y', m.date_ts, 'unixepoch')", "key"),
+            'closeness': ("CASE WHEN ABS(m.team1_score - m.team2_score) >= 2 "
+                          "THEN 'Stomp' ELSE 'Close' END", "key DESC"),
+            'elo_diff': (f"CASE {buckets} END", "MIN(p.elo_diff)"),
+        }
+        if by not in groups:
+            raise ValueError(f"Unknown grouping: {by}")
+
+        key_sql, order_sql = groups[by]
+        from_sql, params = self._prediction_from_sql(start, end)
+
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT {key_sql} AS key,
+                   COUNT(*) AS total,
+                   SUM(p.correct),
+                   AVG(MAX(p.p_team1, 1 - p.p_team1)),
+                   AVG((p.p_team1 - {self._OUTCOME_SQL}) * (p.p_team1 - {self._OUTCOME_SQL}))
+            {from_sql}
+            GROUP BY key
+            ORDER BY {order_sql}
+        """, [config_id] + params)
+
+        return [
+            {
+                'key': row[0],
+                'total': row[1],
+                'correct': row[2],
+                'accuracy': row[2] / row[1],
+                'avg_confidence': row[3],
+                'brier': row[4]
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def get_calibration(self, config_id: int, n_bins: int = 10,
+                        start=None, end=None) -> Dict:
+        """
+        Calibration curve over stored predictions (equal-count bins of p_team1)
+
+        Same output format as MetricsCalculator.calculate_confidence_calibration.
+
+        Args:
+            config_id: Config ID
+            n_bins: Number of bins
+            start: Inclusive lower date bound
+            end: Exclusive upper date bound
+
+        Returns:
+            Dict with bins, predicted, actual, counts
+        """
+        from_sql, params = self._prediction_from_sql(start, end)
+
+        cursor = self.db.conn.cursor()
+        cursor.execute(f"""
+            SELECT AVG(probability), AVG(outcome), COUNT(*)
+            FROM (
+                SELECT p.p_team1 AS probability,
+                       {self._OUTCOME_SQL} AS outcome,
+                       NTILE(?) OVER (ORDER BY p.p_team1) AS bin
+                {from_sql}
+            )
+            GROUP BY bin
+            ORDER BY bin
+        """, [n_bins, config_id] + params)
+
+        rows = cursor.fetchall()
+        return {
+            'bins': [f"{row[0]:.1%}" for row in rows],
+            'predicted': [row[0] for row in rows],
+            'actual': [row[1] for row in rows],
+            'counts': [row[2] for row in rows]
+        }
+
+    def compact_config(self, config_id: int):
+        """
+        Convert a config's stored history from full to compact storage
+
+        Args:
+            config_id: Config ID
+        """
+        if self._get_config_storage(config_id) == 'compact':
+            return
+
+        self.db.execute_write("""
+            INSERT OR REPLACE INTO elo_ratings_compact
+            (config_id, team_id, matches_played, match_id, elo_value, wins)
+            SELECT config_id, team_id, matches_played, match_id, elo_value, wins
+            FROM elo_ratings
+            WHERE config_id = ?
+        """, (config_id,))
+        self.db.execute_write("DELETE FROM elo_ratings WHERE config_id = ?", (config_id,))
+        self.db.execute_write("UPDATE elo_configs SET storage = 'compact' WHERE id = ?", (config_id,))
+        self.db.commit()
 
     def get_available_configs(self) -> List[Dict]:
-        """Get list of available ELO configs"""
+        """Get list of available ELO configs ('stale': matches changed since calculation)"""
         cursor = self.db.conn.cursor()
         cursor.execute("""
             SELECT
                 id, name, variant, k_factor, use_scale_factors,
                 created_at,
-                (SELECT COUNT(*) FROM elo_ratings WHERE config_id = elo_configs.id) as rating_count
+                CASE storage
+                    WHEN 'compact' THEN
+                        (SELECT COUNT(*) FROM elo_ratings_compact WHERE config_id = elo_configs.id)
+                    ELSE
+                        (SELECT COUNT(*) FROM elo_ratings WHERE config_id = elo_configs.id)
+                END as rating_count,
+                storage,
+                data_version,
+                pinned,
+                last_accessed_at
             FROM elo_configs
             ORDER BY created_at DESC
         """)
 
+        data_version = self.db.get_data_version()
+
         configs = []
         for row in cursor.fetchall():
             configs.append({
@@ -409,17 +1134,119 @@ class EloCalculatorService:
                 'k_factor': row[3],
                 'use_scale_factors': bool(row[4]),
                 'created_at': row[5],
-                'rating_count': row[6]
+                'rating_count': row[6],
+                'storage': row[7] or 'full',
+                'stale': row[8] != data_version,
+                'pinned': bool(row[9]),
+                'last_accessed_at': row[10]
             })
 
         return configs
 
-    def delete_config(self, config_id: int):
-        """Delete a config and all its ratings"""
+    def delete_config(self, config_id: int, batch_size: int = 5000):
+        """
+        Delete a config and all its ratings
+
+        History rows are deleted in short batches. The config is marked as
+        not calculated first, so an interrupted delete is recalculated
+        instead of loaded with partial history.
+
+        Args:
+            config_id: Config to delete
+            batch_size: Rows per delete transaction
+        """
         cursor = self.db.conn.cursor()
-        cursor.execute("DELETE FROM elo_ratings WHERE config_id = ?", (config_id,))
-        cursor.execute("DELETE FROM elo_configs WHERE id = ?", (config_id,))
-        self.db.conn.commit()
+        cursor.execute("SELECT config_hash FROM elo_configs WHERE id = ?", (config_id,))
+        row = cursor.fetchone()
+        if row:
+            RATING_CACHE.invalidate(self.db.db_path, row[0])
+
+        self._set_config_data_version(config_id, None)
+
+        for table, key in self.CONFIG_TABLES.items():
+            self.db.delete_in_batches(table, key, "config_id = ?", (config_id,), batch_size)
+
+        self.db.execute_write("DELETE FROM elo_configs WHERE id = ?", (config_id,))
+        self.db.commit()
+
+    def pin_config(self, config_id: int, pinned: bool = True):
+        """Exempt a config from eviction (or remove the exemption)"""
+        self.db.execute_write("UPDATE elo_configs SET pinned = ? WHERE id = ?", (int(pinned), config_id))
+        self.db.commit()
+
+    def get_storage_usage(self) -> List[Dict]:
+        """
+        Get the stored history size of every config
+
+        Returns:
+            List of dicts with id, name, pinned, last_accessed_at, rows and
+            bytes (estimate from ROW_BYTES), least recently used first
+        """
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT id, name, pinned, COALESCE(last_accessed_at, created_at)
+            FROM elo_configs
+            ORDER BY COALESCE(last_accessed_at, created_at), id
+        """)
+        usage = {
+            row[0]: {'id': row[0], 'name': row[1], 'pinned': bool(row[2]),
+                     'last_accessed_at': row[3], 'rows': 0, 'bytes': 0}
+            for row in cursor.fetchall()
+        }
+
+        for table in self.CONFIG_TABLES:
+            cursor.execute(f"SELECT config_id, COUNT(*) FROM {table} GROUP BY config_id")
+            for config_id, count in cursor.fetchall():
+                if config_id in usage:
+                    usage[config_id]['rows'] += count
+                    usage[config_id]['bytes'] += count * self.ROW_BYTES[table]
+
+        return list(usage.values())
+
+    def enforce_retention(self, max_configs: int = None, max_bytes: int = None,
+                          keep=()) -> List[int]:
+        """
+        Evict least recently used configs until the storage budget holds
+
+        Pinned configs and configs in keep are never evicted (but count
+        towards the budget). Freed pages are returned to the file system
+        with an incremental vacuum.
+
+        Args:
+            max_configs: Max stored configs (default: RETENTION_MAX_CONFIGS)
+            max_bytes: Max estimated history bytes (default: RETENTION_MAX_BYTES)
+            keep: Config IDs to keep regardless (e.g. the one being calculated)
+
+        Returns:
+            IDs of the evicted configs
+        """
+        max_configs = self.RETENTION_MAX_CONFIGS if max_configs is None else max_configs
+        max_bytes = self.RETENTION_MAX_BYTES if max_bytes is None else max_bytes
+
+        usage = self.get_storage_usage()
+        count = len(usage)
+        total_bytes = sum(config['bytes'] for config in usage)
+
+        evicted = []
+        for config in usage:
+            if count <= max_configs and total_bytes <= max_bytes:
+                break
+            if config['pinned'] or config['id'] in keep:
+                continue
+
+            print(f"[EVICT] Removing {config['name']} (config {config['id']}, "
+                  f"last used {config['last_accessed_at']}, ~{config['bytes'] / 1024 / 1024:.1f} MB)")
+            self.delete_config(config['id'])
+            evicted.append(config['id'])
+            count -= 1
+            total_bytes -= config['bytes']
+
+        if evicted:
+            self._prune_change_log()
+            pages = self.db.incremental_vacuum()
+            print(f"[OK] Evicted {len(evicted)} configs, freed {pages} pages")
+
+        return evicted
 
     def close(self):
         """Close database connection"""
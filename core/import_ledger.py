@@ -0,0 +1,203 @@
+"""
+Import Ledger for LOL ELO System
+Durable per-tournament checkpoints for long-running imports
+
+Each imported unit (a tournament OverviewPage, a league season) gets one
+row in the import_ledger table with its status, row counts, a hash of the
+fetched content and the time of the last attempt. Importers write the row
+in the same transaction as the unit's matches, so after a crash, Ctrl-C or
+a rate-limit give-up a re-run continues where it stopped:
+
+- 'done' / 'no_data' units of a season that had ended when they were
+  imported are skipped without any request
+- units of a running season are fetched again; if the content hash is
+  unchanged nothing is written
+- 'failed' units (query gave up, parse/write error) are always retried
+
+Usage:
+    ledger = ImportLedger(db)
+    if ledger.should_import('matchschedule', url, name):
+        ...
+        ledger.record('matchschedule', url, 'done', name=name, rows_found=n)
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.database import DatabaseManager
+
+
+STATUSES = ('done', 'no_data', 'failed')
+
+
+def content_hash(rows: List[Dict]) -> str:
+    """Order-independent hash of fetched Cargo rows"""
+    encoded = sorted(json.dumps(row, sort_keys=True) for row in rows)
+    return hashlib.sha256('\n'.join(encoded).encode('utf-8')).hexdigest()
+
+
+def season_year(text: str) -> Optional[int]:
+    """Latest year named in a tournament name/page (None if none)"""
+    years = [int(year) for year in re.findall(r'\b(20\d\d)\b', text or '')]
+    return max(years) if years else None
+
+
+class ImportLedger:
+    """Read and write import checkpoints (import_ledger table)"""
+
+    def __init__(self, db: DatabaseManager):
+        """
+        Initialize ledger
+
+        Args:
+            db: DatabaseManager instance (writable for record/reset)
+        """
+        self.db = db
+
+    def get(self, source: str, key: str) -> Optional[Dict]:
+        """Ledger entry of one unit (None if never attempted)"""
+        row = self.db.conn.execute(
+            "SELECT * FROM import_ledger WHERE source = ? AND key = ?", (source, key)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def entries(self, source: str, status: str = None) -> Dict[str, Dict]:
+        """All entries of a source, keyed by unit key"""
+        query = "SELECT * FROM import_ledger WHERE source = ?"
+        params = [source]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        return {row['key']: dict(row) for row in self.db.conn.execute(query, params)}
+
+    @staticmethod
+    def is_final(entry: Optional[Dict], name: str = None) -> bool:
+        """
+        Whether a unit can be skipped without fetching
+
+        True for 'done'/'no_data' entries completed after their season's
+        year had ended (nothing can change any more).
+        """
+        if not entry or entry['status'] not in ('done', 'no_data') or not entry['completed_at']:
+            return False
+
+        year = season_year(f"{name or entry['name'] or ''} {entry['key']}")
+        completed_year = int(str(entry['completed_at'])[:4])
+        return year is not None and completed_year > year
+
+    def should_import(self, source: str, key: str, name: str = None, recheck: bool = False) -> bool:
+        """Whether a unit needs to be (re-)imported"""
+        return recheck or not self.is_final(self.get(source, key), name)
+
+    def plan(self, source: str, units: List[Dict], key_field: str = 'url',
+             recheck: bool = False) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split units into those to import and those to skip
+
+        Args:
+            source: Ledger source (e.g. 'matchschedule')
+            units: Manifest entries
+            key_field: Field holding the unit key
+            recheck: Import everything regardless of the ledger
+
+        Returns:
+            Tuple of (to_import, skipped)
+        """
+        known = {} if recheck else self.entries(source)
+        todo, skipped = [], []
+        for unit in units:
+            if self.is_final(known.get(unit[key_field]), unit.get('name')):
+                skipped.append(unit)
+            else:
+                todo.append(unit)
+        return todo, skipped
+
+    def known_hashes(self, source: str) -> Dict[str, str]:
+        """Content hashes of completed units (to detect unchanged re-fetches)"""
+        return {key: entry['content_hash'] for key, entry in self.entries(source).items()
+                if entry['status'] in ('done', 'no_data') and entry['content_hash']}
+
+    def record(self, source: str, key: str, status: str, name: str = None,
+               rows_found: int = None, rows_inserted: int = None,
+               content_hash: str = None, error: str = None):
+        """
+        Record an attempt (joins an open DatabaseManager.batch_writes transaction)
+
+        Args:
+            source: Ledger source
+            key: Unit key
+            status: 'done', 'no_data' or 'failed'
+            name: Display name
+            rows_found: Rows fetched
+            rows_inserted: Rows newly written
+            content_hash: Hash of the fetched rows (kept from before on failures)
+            error: Error message of a failed attempt
+        """
+        if status not in STATUSES:
+            raise ValueError(f"Unknown ledger status: {status}")
+
+        completed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if status != 'failed' else None
+
+        self.db.execute_write("""
+            INSERT INTO import_ledger
+            (source, key, name, status, rows_found, rows_inserted, content_hash, error, completed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source, key) DO UPDATE SET
+                name = COALESCE(excluded.name, name),
+                status = excluded.status,
+                rows_found = COALESCE(excluded.rows_found, rows_found),
+                rows_inserted = excluded.rows_inserted,
+                content_hash = COALESCE(excluded.content_hash, content_hash),
+                error = excluded.error,
+                attempts = attempts + 1,
+                last_attempt_at = CURRENT_TIMESTAMP,
+                completed_at = COALESCE(excluded.completed_at, completed_at)
+        """, (source, key, name, status, rows_found, rows_inserted, content_hash,
+              error[:500] if error else None, completed_at))
+        self.db.commit()
+
+    def summary(self, source: str = None) -> Dict[str, int]:
+        """Number of entries per status"""
+        query = "SELECT status, COUNT(*) FROM import_ledger"
+        params = []
+        if source:
+            query += " WHERE source = ?"
+            params.append(source)
+        rows = self.db.conn.execute(query + " GROUP BY status", params).fetchall()
+        return {status: count for status, count in rows}
+
+    def reset(self, source: str, status: str = None) -> int:
+        """Forget entries of a source (optionally only one status) so they are re-imported"""
+        query = "DELETE FROM import_ledger WHERE source = ?"
+        params = [source]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        cursor = self.db.execute_write(query, params)
+        self.db.commit()
+        return cursor.rowcount
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect or reset import checkpoints')
+    parser.add_argument('--source', type=str, default='matchschedule', help='Ledger source')
+    parser.add_argument('--reset', nargs='?', const='', metavar='STATUS',
+                        help='Forget entries (optionally only one status, e.g. failed)')
+    parser.add_argument('--db', type=str, default='db/elo_system.db', help='Database file')
+
+    args = parser.parse_args()
+
+    with DatabaseManager(args.db) as db:
+        ledger = ImportLedger(db)
+
+        if args.reset is not None:
+            print(f"[OK] Reset {ledger.reset(args.source, args.reset or None)} ledger entries")
+
+        print(f"Ledger '{args.source}': {ledger.summary(args.source)}")
+        for key, entry in sorted(ledger.entries(args.source, 'failed').items()):
+            print(f"  [FAILED] {entry['name'] or key} ({entry['attempts']} attempts): {entry['error']}")
@@ -0,0 +1,842 @@
+"""
+Import Pipeline for LOL ELO System
+Staged fetch -> parse -> write import of Leaguepedia MatchSchedule tournaments
+
+The sequential importers fetch a tournament, parse it and insert it row by
+row in one thread, so the CPU and SQLite idle during rate-limit waits and
+the network idles during inserts. The pipeline overlaps the stages:
+
+    fetcher (1 thread)  --fetch queue-->  parse workers (N threads)
+        --write queue-->  writer (1 thread, batched transactions)
+
+- Only the fetcher talks to the API, so pacing stays with the shared rate
+  limiter and end-to-end time approaches the pure network time.
+- Small tournaments are fetched together (OverviewPage IN (...)) and split
+  up again by OverviewPage, so a region's history needs far fewer requests.
+- Parse workers resolve team names, parse/estimate dates and build rows.
+- A single writer owns its own DatabaseManager and commits once per batch.
+- Queues are bounded, so a slow stage throttles the ones before it.
+- Every tournament is checkpointed in the import ledger together with its
+  matches; re-runs skip finished tournaments of ended seasons, skip writes
+  for unchanged content and retry failures (see core/import_ledger.py).
+
+Input is a tournament manifest, e.g. the found_tournaments of
+*_discovery_results.json:
+
+    pipeline = ImportPipeline(loader, team_resolver=TeamResolver())
+    stats = pipeline.run(load_manifest("major_regions_discovery_results.json"))
+    pipeline.print_metrics()
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.database import DatabaseManager
+from core.import_ledger import ImportLedger, content_hash
+
+
+MATCH_FIELDS = ("Team1,Team2,Team1Score,Team2Score,Winner,DateTime_UTC,BestOf,Phase,Round,Tab,"
+                "OverviewPage,Patch,MatchId,UniqueMatch")
+
+
+# ========== MANIFEST ==========
+
+def load_manifest(path) -> List[Dict]:
+    """
+    Load tournaments from a discovery results file
+
+    Args:
+        path: *_discovery_results.json (found_tournaments with name/url)
+
+    Returns:
+        List of tournament dicts (name, url, sample_matches, ...)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+
+    return [t for t in results.get('found_tournaments', []) if t.get('name') and t.get('url')]
+
+
+# ========== DATES ==========
+
+def parse_schedule_date(value: str) -> Optional[datetime]:
+    """
+    Parse a MatchSchedule DateTime UTC value
+
+    Handles the AM/PM format with single-digit hours ("2024-01-20 8:00:00 PM")
+    and the 24-hour format.
+
+    Returns:
+        datetime or None if empty/unparseable
+    """
+    if not value:
+        return None
+
+    # Normalize single-digit hours to double-digit (8:00:00 -> 08:00:00)
+    parts = value.split(' ')
+    if len(parts) == 3:  # Date, Time, AM/PM
+        time_components = parts[1].split(':')
+        if len(time_components) == 3 and len(time_components[0]) == 1:
+            value = f"{parts[0]} 0{parts[1]} {parts[2]}"
+
+    for fmt in ("%Y-%m-%d %I:%M:%S %p", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def estimate_tournament_duration(tournament_name: str) -> int:
+    """
+    Estimate tournament duration in days based on tournament type.
+
+    Args:
+        tournament_name: Tournament name
+
+    Returns:
+        Estimated duration in days
+    """
+    name_lower = tournament_name.lower()
+
+    # Playoffs are shorter
+    if 'playoff' in name_lower:
+        return 7  # ~1 week for playoffs
+    elif 'regional' in name_lower or 'final' in name_lower:
+        return 5  # ~5 days for regional finals
+    elif 'msi' in name_lower or 'mid-season' in name_lower:
+        return 14  # ~2 weeks for MSI
+    elif 'world' in name_lower:
+        return 30  # ~1 month for Worlds
+    elif 'iem' in name_lower:
+        return 4  # ~4 days for IEM
+    elif 'kespa' in name_lower or 'demacia' in name_lower or 'rift rival' in name_lower:
+        return 5  # ~5 days for cups
+    else:
+        # Regular season
+        return 56  # ~8 weeks for regular season
+
+
+def estimate_date_from_tournament(tournament_name: str, match_index: int, total_matches: int) -> datetime:
+    """
+    Estimate a date based on tournament name and match position.
+    Distributes matches realistically over tournament duration.
+
+    Args:
+        tournament_name: Tournament name (e.g., "LPL 2013 Spring", "LCK 2020 Summer Playoffs")
+        match_index: Index of this match (0-based)
+        total_matches: Total number of matches in tournament
+
+    Returns:
+        Estimated datetime object
+    """
+    # Extract year from tournament name
+    year_match = re.search(r'20\d{2}|2013|2014|2015', tournament_name)
+    year = int(year_match.group()) if year_match else 2020
+
+    name_lower = tournament_name.lower()
+
+    # Determine start month and day based on split/phase
+    if 'winter' in name_lower:
+        month, day = 1, 15
+    elif 'spring' in name_lower:
+        if 'playoff' in name_lower:
+            month, day = 4, 15  # Spring Playoffs
+        elif 'regional' in name_lower or 'final' in name_lower:
+            month, day = 5, 1  # Spring Regional Finals
+        else:
+            month, day = 3, 15  # Spring Regular Season
+    elif 'summer' in name_lower:
+        if 'playoff' in name_lower:
+            month, day = 8, 15  # Summer Playoffs
+        elif 'regional' in name_lower or 'final' in name_lower:
+            month, day = 9, 15  # Summer Regional Finals
+        else:
+            month, day = 7, 15  # Summer Regular Season
+    elif 'msi' in name_lower or 'mid-season' in name_lower:
+        month, day = 5, 15  # MSI
+    elif 'world' in name_lower:
+        month, day = 10, 15  # Worlds
+    elif 'iem' in name_lower:
+        # IEM tournaments vary, use tournament name hints
+        if 'katowice' in name_lower:
+            month, day = 3, 1
+        elif 'cologne' in name_lower or 'gamescom' in name_lower:
+            month, day = 8, 1
+        elif 'oakland' in name_lower or 'san jose' in name_lower:
+            month, day = 11, 15
+        else:
+            month, day = 6, 1  # Default for other IEM events
+    elif 'kespa' in name_lower or 'demacia' in name_lower or 'rift rival' in name_lower:
+        month, day = 6, 15  # Mid-year cups
+    elif 'playoff' in name_lower:
+        month, day = 8, 15  # Generic playoffs
+    elif 'regional' in name_lower:
+        month, day = 9, 15  # Generic regional finals
+    else:
+        # Default to mid-year if can't determine
+        month, day = 6, 15
+
+    # Base date (tournament start)
+    base_date = datetime(year, month, day, 15, 0, 0)  # Start at 3 PM
+
+    # Get tournament duration
+    duration_days = estimate_tournament_duration(tournament_name)
+
+    # Distribute matches evenly across tournament duration
+    if total_matches <= 1:
+        day_offset = 0
+        match_of_day = 0
+    else:
+        matches_per_day = max(1, total_matches / duration_days)
+        day_offset = int(match_index / matches_per_day)
+        match_of_day = int(match_index % matches_per_day)
+
+    # Calculate match time (typically 3 PM, 6 PM, 9 PM for multiple matches per day)
+    hour_offset = match_of_day * 3  # 3 hours between matches
+
+    return base_date + timedelta(days=day_offset, hours=hour_offset)
+
+
+# ========== METRICS ==========
+
+class StageMetrics:
+    """Throughput counters of one pipeline stage (thread-safe)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.rows = 0
+        self.busy = 0.0     # seconds spent working
+        self.waiting = 0.0  # seconds blocked on the input queue
+        self._lock = threading.Lock()
+
+    def record(self, busy: float, waiting: float, items: int = 1, rows: int = 0):
+        """Add one unit of work"""
+        with self._lock:
+            self.items += items
+            self.rows += rows
+            self.busy += busy
+            self.waiting += waiting
+
+    def as_dict(self) -> Dict:
+        """Counters plus rows per busy second"""
+        with self._lock:
+            return {
+                'items': self.items,
+                'rows': self.rows,
+                'busy_seconds': round(self.busy, 2),
+                'wait_seconds': round(self.waiting, 2),
+                'rows_per_second': round(self.rows / self.busy, 1) if self.busy else 0.0,
+            }
+
+
+# ========== PIPELINE ==========
+
+class ImportPipeline:
+    """
+    Fetch/parse/write pipeline over a tournament manifest
+
+    Subclasses may override fetch_group() (what to request) and
+    parse_tournament() (how to turn responses into rows).
+    """
+
+    PAGE_ROWS = 500      # rows per Cargo page (LeaguepediaLoader.CARGO_PAGE_SIZE)
+    MAX_GROUP = 25       # tournaments per batched query (keeps the URL short)
+    SAMPLE_LIMIT = 5     # discovery fetched at most this many sample matches
+
+    def __init__(self, loader, db_path=None, team_resolver=None, parse_workers: int = 2,
+                 queue_size: int = 8, batch_size: int = 500, include_players: bool = False,
+                 progress_every: int = 10, group_queries: bool = True,
+                 ledger_source: str = 'matchschedule', use_ledger: bool = True, recheck: bool = False):
+        """
+        Initialize pipeline
+
+        Args:
+            loader: LeaguepediaLoader (the fetcher uses its Cargo client, cache and limiter)
+            db_path: Database file to write (default: the loader's database)
+            team_resolver: TeamResolver for team names (default: names as returned)
+            parse_workers: Number of parse/resolve threads
+            queue_size: Tournaments buffered between stages
+            batch_size: Matches per write transaction
+            include_players: Also fetch ScoreboardPlayers and insert match players
+            progress_every: Print a progress line every N written tournaments
+            group_queries: Fetch small tournaments together in one query
+            ledger_source: Source name of the tournaments in the import ledger
+            use_ledger: Skip/checkpoint tournaments via the import ledger
+            recheck: Fetch and compare every tournament, even finished ones
+        """
+        self.loader = loader
+        self.db_path = str(db_path or loader.db.db_path)
+        self.team_resolver = team_resolver
+        self.parse_workers = max(1, parse_workers)
+        self.batch_size = batch_size
+        self.include_players = include_players
+        self.progress_every = progress_every
+        self.group_queries = group_queries
+        self.ledger_source = ledger_source
+        self.use_ledger = use_ledger
+        self.recheck = recheck
+        self._known_hashes = {}
+
+        self.fetch_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.metrics = {name: StageMetrics(name) for name in ('fetch', 'parse', 'write')}
+        self.stats = self._new_stats()
+        self._stats_lock = threading.Lock()
+        self.total = 0
+        self.elapsed = 0.0
+        self.requests = 0
+
+        # Set on a writer error or Ctrl-C: stages stop working and drain the queues
+        self._stop = threading.Event()
+        self._error = None
+
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {
+            'tournaments_total': 0,
+            'tournaments_imported': 0,
+            'tournaments_failed': 0,
+            'tournaments_no_data': 0,
+            'tournaments_skipped': 0,
+            'tournaments_unchanged': 0,
+            'total_matches_found': 0,
+            'matches_inserted': 0,
+            'matches_failed': 0,
+            'matches_skipped': 0,
+            'matches_with_estimated_dates': 0,
+            'players_inserted': 0,
+        }
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    # ========== RUN ==========
+
+    def run(self, tournaments: Iterable[Dict]) -> Dict:
+        """
+        Import all tournaments of a manifest
+
+        Args:
+            tournaments: Tournament dicts with 'name' and 'url' (OverviewPage with spaces)
+
+        Returns:
+            Statistics dict (same keys as the sequential importers, plus
+            'pipeline' with stage metrics)
+
+        Raises:
+            Exception: The error that stopped the writer (after all stages ended;
+                       tournaments not written are counted as failed)
+        """
+        tournaments = list(tournaments)
+        self.stats['tournaments_total'] = len(tournaments)
+
+        if self.use_ledger:
+            with DatabaseManager(self.db_path) as db:
+                ledger = ImportLedger(db)
+                tournaments, skipped = ledger.plan(self.ledger_source, tournaments, recheck=self.recheck)
+                self._known_hashes = {} if self.recheck else ledger.known_hashes(self.ledger_source)
+            if skipped:
+                print(f"[INFO] Skipping {len(skipped)} tournaments already imported (import ledger)")
+            self.stats['tournaments_skipped'] = len(skipped)
+
+        self.total = len(tournaments)
+        limiter = getattr(self.loader, 'limiter', None)
+        requests_before = limiter.requests if limiter else 0
+        start = time.time()
+
+        threads = [threading.Thread(target=self._fetch_stage, args=(tournaments,), name="import-fetch", daemon=True)]
+        threads += [threading.Thread(target=self._parse_stage, name=f"import-parse-{i + 1}", daemon=True)
+                    for i in range(self.parse_workers)]
+        threads.append(threading.Thread(target=self._write_stage, name="import-write", daemon=True))
+
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            # Finished tournaments are checkpointed - a re-run continues from here
+            print("\n[WARNING] Interrupted - stopping import stages (Ctrl-C again to exit immediately)")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            raise
+
+        self.elapsed = time.time() - start
+        self.requests = limiter.requests - requests_before if limiter else 0
+        self.stats['pipeline'] = self.get_metrics()
+
+        if self._error is not None:
+            raise self._error
+        return self.stats
+
+    def get_metrics(self) -> Dict:
+        """Stage metrics and wall time"""
+        metrics = {name: stage.as_dict() for name, stage in self.metrics.items()}
+        metrics['wall_seconds'] = round(self.elapsed, 2)
+        metrics['api_requests'] = self.requests
+        return metrics
+
+    def print_metrics(self):
+        """Print a per-stage throughput table"""
+        print(f"\n[PIPELINE] Stage metrics ({self.elapsed:.1f}s wall time)")
+        print(f"  {'Stage':8s} {'Items':>7s} {'Rows':>8s} {'Busy s':>9s} {'Wait s':>9s} {'Rows/s':>9s}")
+        for name, stage in self.metrics.items():
+            m = stage.as_dict()
+            print(f"  {name:8s} {m['items']:7d} {m['rows']:8d} {m['busy_seconds']:9.1f} "
+                  f"{m['wait_seconds']:9.1f} {m['rows_per_second']:9.1f}")
+
+        print(f"  API requests: {self.requests} for {self.total} tournaments (cache hits not counted)")
+
+        network = self.metrics['fetch'].busy
+        if self.elapsed:
+            print(f"  Network (fetch) time: {network:.1f}s = {network / self.elapsed:.0%} of wall time")
+
+    # ========== STAGES ==========
+
+    def _fetch_stage(self, tournaments: List[Dict]):
+        """Fetcher thread: the only stage that talks to the API"""
+        try:
+            for group in self.plan_groups(tournaments):
+                if self._stop.is_set():
+                    return
+                started = time.time()
+                try:
+                    fetched_group = self.fetch_group(group)
+                except Exception as e:
+                    # Recorded as failed (not as "no data"), so the next run retries it
+                    names = ', '.join(t['name'] for t in group)
+                    print(f"[ERROR] Fetching {names} failed: {e}")
+                    fetched_group = [{'tournament': t, 'error': f"fetch: {e}"} for t in group]
+
+                rows = sum(len(f.get('matches', [])) + len(f.get('players', [])) for f in fetched_group)
+                self.metrics['fetch'].record(time.time() - started, 0.0, items=len(group), rows=rows)
+
+                # Blocks while the parse workers are behind
+                for fetched in fetched_group:
+                    blocked = time.time()
+                    self.fetch_queue.put(fetched)
+                    self.metrics['fetch'].record(0.0, time.time() - blocked, items=0)
+        finally:
+            for _ in range(self.parse_workers):
+                self.fetch_queue.put(None)
+
+    def _parse_stage(self):
+        """Parse worker: resolve names and build insert rows"""
+        try:
+            while True:
+                blocked = time.time()
+                fetched = self.fetch_queue.get()
+                waited = time.time() - blocked
+                if fetched is None:
+                    return
+
+                started = time.time()
+                if self._stop.is_set():
+                    # Keep draining so the fetcher never blocks on a full queue
+                    self.write_queue.put(self._failed(fetched['tournament'], "stopped"))
+                    continue
+                try:
+                    parsed = self._parse(fetched)
+                except Exception as e:
+                    print(f"[ERROR] Parsing {fetched['tournament']['name']} failed: {e}")
+                    parsed = self._failed(fetched['tournament'], f"parse: {e}")
+
+                self.metrics['parse'].record(time.time() - started, waited, rows=len(parsed['rows']))
+                self.write_queue.put(parsed)
+        finally:
+            self.write_queue.put(None)
+
+    @staticmethod
+    def _failed(tournament: Dict, error: str) -> Dict:
+        return {'tournament': tournament, 'rows': [], 'error': error}
+
+    def _parse(self, fetched: Dict) -> Dict:
+        """Parse a fetched tournament unless it failed or is unchanged since the last import"""
+        if 'error' in fetched:
+            return self._failed(fetched['tournament'], fetched['error'])
+
+        digest = content_hash(fetched['matches'] + fetched.get('players', []))
+        if self._known_hashes.get(fetched['tournament']['url']) == digest:
+            return {'tournament': fetched['tournament'], 'rows': [], 'found': len(fetched['matches']),
+                    'hash': digest, 'unchanged': True}
+
+        parsed = self.parse_tournament(fetched)
+        parsed['hash'] = digest
+        return parsed
+
+    def _write_stage(self):
+        """
+        Writer thread: single DB connection, one transaction per batch
+
+        A write error (e.g. 'database is locked' outside a transaction) stops
+        the pipeline: the error is kept for run() to raise, and the writer
+        keeps draining the queue so no other stage blocks on it.
+        """
+        db = None
+        finished_workers = 0
+        written = 0
+
+        try:
+            db = DatabaseManager(self.db_path)
+        except Exception as e:
+            self._abort(e)
+
+        try:
+            while finished_workers < self.parse_workers:
+                blocked = time.time()
+                parsed = self.write_queue.get()
+                waited = time.time() - blocked
+                if parsed is None:
+                    finished_workers += 1
+                    continue
+
+                # Collect whatever else is ready, up to batch_size matches
+                batch = [parsed]
+                size = len(parsed['rows'])
+                while size < self.batch_size:
+                    try:
+                        parsed = self.write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if parsed is None:
+                        finished_workers += 1
+                        continue
+                    batch.append(parsed)
+                    size += len(parsed['rows'])
+
+                if self._stop.is_set():
+                    self._count(tournaments_failed=len(batch))
+                    continue
+
+                started = time.time()
+                try:
+                    self._write_batch(db, batch)
+                except Exception as e:
+                    print(f"[ERROR] Writer stopped: {e}")
+                    traceback.print_exc()
+                    self._abort(e)
+                    self._count(tournaments_failed=len(batch))
+                    continue
+                self.metrics['write'].record(time.time() - started, waited, items=len(batch), rows=size)
+
+                for parsed in batch:
+                    written += 1
+                    if self.progress_every and written % self.progress_every == 0:
+                        self._print_progress(written)
+        finally:
+            if db is not None:
+                db.close()
+
+    def _abort(self, error: Exception):
+        """Stop all stages; run() raises the first error after they ended"""
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _print_progress(self, written: int):
+        fetch, parse, write = (self.metrics[name].as_dict() for name in ('fetch', 'parse', 'write'))
+        print(f"[PIPELINE] {written}/{self.total} tournaments | "
+              f"fetched {fetch['rows']} rows ({fetch['busy_seconds']:.0f}s) | "
+              f"parsed {parse['rows']} | written {write['rows']} ({write['busy_seconds']:.1f}s) | "
+              f"queued {self.fetch_queue.qsize()}/{self.write_queue.qsize()}")
+
+    # ========== FETCH / PARSE / WRITE ==========
+
+    @classmethod
+    def expected_matches(cls, tournament: Dict) -> int:
+        """
+        Expected MatchSchedule rows of a tournament (for grouping)
+
+        Uses the discovery count if present. A sample below SAMPLE_LIMIT is
+        the complete tournament; otherwise the size is estimated from the
+        tournament type. Estimates only affect how many requests are needed,
+        never the result (batched queries are paged like any other).
+        """
+        if tournament.get('match_count') is not None:
+            return int(tournament['match_count'])
+
+        sample = tournament.get('sample_matches')
+        if sample is not None and sample < cls.SAMPLE_LIMIT:
+            return int(sample)
+
+        name = tournament['name'].lower()
+        if 'world' in name:
+            return 80
+        if 'msi' in name or 'mid-season' in name:
+            return 60
+        if any(word in name for word in ('playoff', 'regional', 'final', 'qualifier', 'promotion')):
+            return 15
+        return 90  # regular season
+
+    def plan_groups(self, tournaments: List[Dict]) -> List[List[Dict]]:
+        """
+        Pack tournaments into groups whose expected rows fit one Cargo page
+
+        Args:
+            tournaments: Manifest entries (order is kept within groups)
+
+        Returns:
+            List of tournament groups (large tournaments stay alone)
+        """
+        if not self.group_queries:
+            return [[tournament] for tournament in tournaments]
+
+        groups, group, rows = [], [], 0
+        for tournament in tournaments:
+            expected = self.expected_matches(tournament)
+            if group and (rows + expected > self.PAGE_ROWS or len(group) >= self.MAX_GROUP):
+                groups.append(group)
+                group, rows = [], 0
+            group.append(tournament)
+            rows += expected
+
+        if group:
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def _page_key(page: str) -> str:
+        """OverviewPage as compared by Cargo (underscores = spaces, case-insensitive)"""
+        return page.replace('_', ' ').strip().lower()
+
+    @staticmethod
+    def _overview_filter(pages: List[str]) -> str:
+        if len(pages) == 1:
+            return f"OverviewPage='{pages[0]}'"
+        return "OverviewPage IN (" + ','.join(f"'{page}'" for page in pages) + ")"
+
+    def fetch_group(self, group: List[Dict]) -> List[Dict]:
+        """
+        Request everything needed for a group of tournaments
+
+        One (paged) query per table for the whole group; rows are split up
+        by OverviewPage afterwards.
+
+        Args:
+            group: Manifest entries with 'name' and 'url'
+
+        Returns:
+            One dict per tournament with 'tournament', 'matches' and 'players'
+            (raw Cargo rows)
+        """
+        # MatchSchedule uses SPACES in OverviewPage
+        urls = [tournament['url'] for tournament in group]
+        matches_by_page = {self._page_key(url): [] for url in urls}
+        for match in self.loader.iter_cargo(
+            tables="MatchSchedule",
+            fields=MATCH_FIELDS,
+            where=self._overview_filter(urls),
+            order_by="OverviewPage, DateTime_UTC ASC" if len(urls) > 1 else "DateTime_UTC ASC",
+            raise_errors=True
+        ):
+            page = self._page_key(match.get('OverviewPage', '')) if len(urls) > 1 else self._page_key(urls[0])
+            matches_by_page.setdefault(page, []).append(match)
+
+        players_by_page = {self._page_key(url): [] for url in urls}
+        with_matches = [url for url in urls if matches_by_page[self._page_key(url)]]
+        if self.include_players and with_matches:
+            # ScoreboardPlayers uses UNDERSCORES in OverviewPage
+            for player in self.loader.iter_cargo(
+                tables="ScoreboardPlayers",
+                fields="UniqueMatch,Link,Role,Team,OverviewPage",
+                where=self._overview_filter([url.replace(' ', '_') for url in with_matches]),
+                order_by="DateTime_UTC ASC",
+                raise_errors=True
+            ):
+                page = self._page_key(player.get('OverviewPage', '')) if len(urls) > 1 else self._page_key(urls[0])
+                players_by_page.setdefault(page, []).append(player)
+
+        return [
+            {'tournament': tournament, 'matches': matches_by_page[self._page_key(tournament['url'])],
+             'players': players_by_page[self._page_key(tournament['url'])]}
+            for tournament in group
+        ]
+
+    def _resolve(self, team_name: str, match_date: str) -> str:
+        if self.team_resolver is None:
+            return team_name
+        return self.team_resolver.resolve(team_name, match_date)
+
+    def parse_tournament(self, fetched: Dict) -> Dict:
+        """
+        Turn raw Cargo rows into insert_match/insert_match_player arguments
+
+        Args:
+            fetched: One tournament of fetch_group()
+
+        Returns:
+            Dict with 'tournament', 'found' (match count) and 'rows'
+            (insert_match kwargs plus a 'players' list)
+        """
+        tournament = fetched['tournament']
+        name, url = tournament['name'], tournament['url']
+        matches = fetched['matches']
+
+        players_by_match = {}
+        for player in fetched.get('players', []):
+            unique_match = player.get('UniqueMatch', '')
+            if unique_match:
+                players_by_match.setdefault(unique_match, []).append(player)
+
+        rows = []
+        skipped = estimated = 0
+
+        for match_index, match in enumerate(matches):
+            team1_orig = match.get('Team1', '').strip()
+            team2_orig = match.get('Team2', '').strip()
+
+            if not team1_orig or not team2_orig:
+                skipped += 1
+                continue
+
+            # API returns 'DateTime UTC' with space, not 'DateTime_UTC' with underscore!
+            match_date = match.get('DateTime UTC', '') or match.get('DateTime_UTC', '')
+
+            date_obj = parse_schedule_date(match_date)
+            if not date_obj:
+                date_obj = estimate_date_from_tournament(name, match_index, len(matches))
+                estimated += 1
+
+            unique_match = match.get('UniqueMatch', '')
+            tab = match.get('Tab', '')
+            external_id = (unique_match or match.get('MatchId', '')
+                           or f"{url}_{tab}_{match_date}_{team1_orig}_{team2_orig}")
+
+            # Deduplicate players by (player_name, role)
+            unique_players = {}
+            for player in players_by_match.get(unique_match, []) if unique_match else []:
+                player_name = player.get('Link', '').strip()
+                role = player.get('Role', '').strip()
+                if player_name and (player_name, role) not in unique_players:
+                    team = self._resolve(player.get('Team', '').strip(), match_date)
+                    unique_players[(player_name, role)] = (player_name, role, team)
+
+            rows.append({
+                'team1_name': self._resolve(team1_orig, match_date),
+                'team2_name': self._resolve(team2_orig, match_date),
+                'team1_score': int(match.get('Team1Score', 0) or 0),
+                'team2_score': int(match.get('Team2Score', 0) or 0),
+                'date': date_obj,
+                'tournament_name': name,
+                'stage': tab or match.get('Phase', '') or match.get('Round', ''),
+                'patch': match.get('Patch', ''),
+                'external_id': external_id,
+                'source': 'leaguepedia',
+                'players': list(unique_players.values()),
+            })
+
+        return {
+            'tournament': tournament,
+            'found': len(matches),
+            'rows': rows,
+            'skipped': skipped,
+            'estimated': estimated,
+        }
+
+    def _write_batch(self, db: DatabaseManager, batch: List[Dict]):
+        """Write a batch in one transaction; on failure retry tournament by tournament"""
+        ledger = ImportLedger(db) if self.use_ledger else None
+
+        try:
+            with db.batch_writes():
+                results = [self._write_tournament(db, ledger, parsed) for parsed in batch]
+        except Exception:
+            results = []
+            for parsed in batch:
+                try:
+                    with db.batch_writes():
+                        results.append(self._write_tournament(db, ledger, parsed))
+                except Exception as e:
+                    print(f"[ERROR] Writing {parsed['tournament']['name']} failed: {e}")
+                    traceback.print_exc()
+                    failed = self._failed(parsed['tournament'], f"write: {e}")
+                    results.append(self._write_tournament(db, ledger, failed))
+
+        for parsed, (inserted, duplicates, players) in results:
+            self._report(parsed, inserted, duplicates, players)
+
+    def _write_tournament(self, db: DatabaseManager, ledger: Optional[ImportLedger], parsed: Dict):
+        """Insert one tournament's rows and its ledger checkpoint (caller holds the transaction)"""
+        tournament = parsed['tournament']
+        inserted = duplicates = players_inserted = 0
+
+        for row in parsed['rows']:
+            fields = {key: value for key, value in row.items() if key != 'players'}
+            match_id = db.insert_match(**fields)
+            if not match_id:
+                duplicates += 1
+                continue
+
+            inserted += 1
+            for player_name, role, team_name in row['players']:
+                if db.insert_match_player(match_id=match_id, player_name=player_name,
+                                          team_name=team_name, role=role):
+                    players_inserted += 1
+
+        if ledger is not None:
+            if 'error' in parsed:
+                ledger.record(self.ledger_source, tournament['url'], 'failed',
+                              name=tournament['name'], error=parsed['error'])
+            else:
+                ledger.record(self.ledger_source, tournament['url'], 'done' if parsed['found'] else 'no_data',
+                              name=tournament['name'], rows_found=parsed['found'],
+                              rows_inserted=inserted, content_hash=parsed['hash'])
+
+        return parsed, (inserted, duplicates, players_inserted)
+
+    def _report(self, parsed: Dict, inserted: int, duplicates: int, players: int):
+        """Count and print the outcome of a written tournament"""
+        name = parsed['tournament']['name']
+
+        if 'error' in parsed:
+            self._count(tournaments_failed=1)
+            return
+
+        if parsed.get('unchanged'):
+            self._count(tournaments_unchanged=1, total_matches_found=parsed['found'])
+            return
+
+        if not parsed['found']:
+            print(f"⚠️  No matches found for {name}")
+            self._count(tournaments_no_data=1)
+            return
+
+        self._count(
+            tournaments_imported=1,
+            total_matches_found=parsed['found'],
+            matches_inserted=inserted,
+            matches_failed=duplicates,
+            matches_skipped=parsed['skipped'],
+            matches_with_estimated_dates=parsed['estimated'],
+            players_inserted=players,
+        )
+
+        line = f"✅ {name}: {inserted}/{parsed['found']} matches inserted"
+        if players:
+            line += f", {players} players"
+        if parsed['estimated']:
+            line += f", {parsed['estimated']} estimated dates"
+        print(line)
+
+
+def save_import_log(stats: Dict, elapsed: float, path):
+    """Write statistics of a run to an import log JSON file"""
+    log_data = {
+        'timestamp': datetime.now().isoformat(),
+        'duration_seconds': elapsed,
+        'statistics': stats
+    }
+    with open(Path(path), 'w', encoding='utf-8') as f:
+        json.dump(log_data, f, indent=2)
@@ -0,0 +1,582 @@
+"""
+Background Job Runner for LOL ELO System
+Runs heavy work (ELO recomputes, validation scripts, exports) outside the UI thread
+
+Jobs are rows in the jobs table of the main database, so they survive
+dashboard reruns and browser refreshes and can be enqueued from the
+dashboard or the CLI and executed by any process:
+
+    queue = JobQueue(db)
+    job_id = queue.enqueue('elo_config', {'variant': 'base', 'k_factor': 24})
+    start_workers()                  # daemon worker threads in this process
+    queue.get(job_id)['status']      # 'queued' -> 'running' -> 'done' / 'failed'
+
+Or run a standalone worker: python scripts/run_jobs.py
+
+Identical requests (same kind and dedup key, e.g. the ELO config hash) share
+one queued/running job instead of computing twice.
+"""
+
+import json
+import os
+import re
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from core.database import DatabaseManager
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Scripts the 'script' job kind may run (relative to the project root)
+ALLOWED_SCRIPTS = (
+    'scripts/generate_validation_report.py',
+    'scripts/export_elo_history.py',
+    'validation/k_fold_validation.py',
+    'validation/bootstrap_ci.py',
+)
+
+MAX_OUTPUT_CHARS = 20000       # script output kept in the job result (tail)
+STALE_AFTER_MINUTES = 15       # running jobs without heartbeat are marked failed
+POLL_INTERVAL = 1.0            # seconds between queue polls of an idle worker
+ERROR_BACKOFF = 5.0            # first wait after a worker loop error (doubles, max 60s)
+PROGRESS_INTERVAL = 1.0        # minimum seconds between progress writes
+HEARTBEAT_INTERVAL = 60.0      # seconds between heartbeats of a running job
+
+
+# ========== JOB KINDS ==========
+
+def _elo_config_key(params: Dict) -> str:
+    """Dedup key of an ELO recompute: the config hash (plus force flag)"""
+    from core.elo_calculator_service import EloCalculatorService
+
+    config_params = {k: v for k, v in params.items() if k not in ('force_recalculate', 'rating_storage')}
+    config = EloCalculatorService.build_config(**config_params)
+    force = ':force' if params.get('force_recalculate') else ''
+    return EloCalculatorService._hash_config(config) + force
+
+
+def _run_elo_config(db: DatabaseManager, params: Dict, progress: Callable) -> Dict:
+    """Calculate (or refresh) the stored ratings of one ELO config"""
+    from core.elo_calculator_service import EloCalculatorService
+
+    params = dict(params)
+    service = EloCalculatorService(db, rating_storage=params.pop('rating_storage', 'full'))
+
+    progress(0.1, f"Calculating {params.get('variant', 'tournament_context')} "
+                  f"K={params.get('k_factor', 24)}")
+    config_id, ratings = service.calculate_or_load_elos(**params)
+
+    return {'config_id': config_id, 'teams': len(ratings)}
+
+
+def _script_key(params: Dict) -> str:
+    """Dedup key of a script run: script path and arguments"""
+    return json.dumps([params['script'], params.get('args', [])])
+
+
+def _run_script(db: DatabaseManager, params: Dict, progress: Callable) -> Dict:
+    """
+    Run an allowed project script in a subprocess
+
+    Progress is parsed from "<done>/<total>" in the script's output lines.
+    A non-zero exit code fails the job (output is kept in the error). A
+    watchdog kills the script after the timeout, also while it prints nothing.
+    """
+    script = params['script']
+    if script not in ALLOWED_SCRIPTS:
+        raise ValueError(f"Script not allowed: {script}")
+
+    command = [sys.executable, script] + [str(arg) for arg in params.get('args', [])]
+    timeout = params.get('timeout', 600)
+    started = time.time()
+
+    process = subprocess.Popen(
+        command,
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors='replace',
+        env=dict(os.environ, PYTHONUNBUFFERED='1')
+    )
+
+    # Reading stdout blocks while the script is silent - kill it from a timer
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    watchdog = threading.Timer(timeout, kill)
+    watchdog.daemon = True
+    watchdog.start()
+
+    output = []
+    size = 0
+    try:
+        for line in process.stdout:
+            output.append(line)
+            size += len(line)
+            while size > MAX_OUTPUT_CHARS and len(output) > 1:
+                size -= len(output.pop(0))
+
+            counter = re.search(r'(\d+)\s*/\s*(\d+)', line)
+            if counter and 0 < int(counter.group(1)) <= int(counter.group(2)):
+                progress(int(counter.group(1)) / int(counter.group(2)), line.strip()[:200])
+            else:
+                progress(None, line.strip()[:200] or None)
+
+        returncode = process.wait(timeout=max(timeout - (time.time() - started), 0) + 5)
+    except BaseException:
+        process.kill()
+        raise
+    finally:
+        watchdog.cancel()
+        process.stdout.close()
+
+    if timed_out.is_set():
+        raise TimeoutError(f"{script} timed out after {timeout}s")
+    text = ''.join(output)
+
+    if returncode != 0:
+        raise RuntimeError(f"{script} exited with code {returncode}\n{text}")
+
+    return {'returncode': returncode, 'output': text}
+
+
+# Calculators the regional offsets views read (see EloCalculatorService.get_calculator)
+WARMUP_CALCULATORS = (
+    {'variant': 'dynamic_offset', 'k_factor': 24, 'use_scale_factors': True},
+)
+
+
+def warmup_params(variants: List[str] = None, k_factors: List[float] = None) -> List[Dict]:
+    """
+    Build the config parameters to precompute after imports
+
+    Parameters match what the rankings/predictor pages pass by default, so
+    the warmed configs are the ones visitors actually hit.
+
+    Args:
+        variants: ELO variants (default: config.WARMUP_VARIANTS)
+        k_factors: K-factors (default: config.WARMUP_K_FACTORS)
+
+    Returns:
+        List of calculate_or_load_elos parameter dicts
+    """
+    import config
+
+    return [
+        {
+            'variant': variant,
+            'k_factor': k_factor,
+            'use_scale_factors': config.USE_SCALE_FACTORS,
+            'use_regional_offsets': variant in ('dynamic_offset', 'tournament_context')
+        }
+        for variant in variants or config.WARMUP_VARIANTS
+        for k_factor in k_factors or config.WARMUP_K_FACTORS
+    ]
+
+
+def _warmup_key(params: Dict) -> str:
+    """Dedup key of a warm-up: the data version it was requested for"""
+    return f"v{params.get('data_version')}:{json.dumps([params.get('variants'), params.get('k_factors')])}"
+
+
+def _run_warmup(db: DatabaseManager, params: Dict, progress: Callable) -> Dict:
+    """Precompute popular configs and warm this process's rating cache"""
+    from core.elo_calculator_service import EloCalculatorService
+
+    service = EloCalculatorService(db)
+    configs = warmup_params(params.get('variants'), params.get('k_factors'))
+    config_ids = service.warm_up(configs, WARMUP_CALCULATORS, progress)
+
+    return {'config_ids': config_ids}
+
+
+# kind -> (run function, dedup key function)
+JOB_KINDS = {
+    'elo_config': (_run_elo_config, _elo_config_key),
+    'script': (_run_script, _script_key),
+    'warmup': (_run_warmup, _warmup_key),
+}
+
+
+def enqueue_warmup(db: DatabaseManager, variants: List[str] = None,
+                   k_factors: List[float] = None) -> int:
+    """
+    Queue the post-import warm-up of popular configs
+
+    Called at the end of imports. The dashboard's workers (or
+    scripts/run_jobs.py) pick it up, so both the rating tables and the
+    dashboard's in-process cache are warm before the first visitor.
+
+    Args:
+        db: DatabaseManager the import wrote to
+        variants: ELO variants (default: config.WARMUP_VARIANTS)
+        k_factors: K-factors (default: config.WARMUP_K_FACTORS)
+
+    Returns:
+        Job ID
+    """
+    job_id = JobQueue(db).enqueue('warmup', {
+        'data_version': db.get_data_version(),
+        'variants': variants,
+        'k_factors': k_factors
+    })
+    print(f"[OK] Warm-up job #{job_id} queued (runs in the dashboard or: python scripts/run_jobs.py --once)")
+    return job_id
+
+
+# ========== QUEUE ==========
+
+class JobQueue:
+    """
+    Enqueue, inspect and execute jobs stored in the jobs table
+
+    Usage:
+        queue = JobQueue(db)
+        job_id = queue.enqueue('script', {'script': 'validation/bootstrap_ci.py'})
+        job = queue.get(job_id)
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """
+        Initialize queue
+
+        Args:
+            db: DatabaseManager instance (must be writable)
+        """
+        self.db = db
+
+    def enqueue(self, kind: str, params: Dict = None) -> int:
+        """
+        Add a job unless an identical one is already queued or running
+
+        Args:
+            kind: Job kind (key of JOB_KINDS)
+            params: JSON-serializable job parameters
+
+        Returns:
+            ID of the new job or of the identical active job
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        params = params or {}
+        dedup_key = f"{kind}:{JOB_KINDS[kind][1](params)}"
+
+        try:
+            cursor = self.db.execute_write("""
+                INSERT INTO jobs (kind, params, dedup_key) VALUES (?, ?, ?)
+            """, (kind, json.dumps(params, sort_keys=True), dedup_key))
+            self.db.commit()
+            return cursor.lastrowid
+        except sqlite3.IntegrityError:
+            self.db.conn.rollback()
+            job = self.find_active(dedup_key)
+            if job is None:
+                # Finished between the insert and the lookup
+                return self.enqueue(kind, params)
+            return job['id']
+
+    def find_active(self, dedup_key: str) -> Optional[Dict]:
+        """Get the queued or running job with a dedup key"""
+        cursor = self.db.conn.cursor()
+        placeholders = ",".join("?" * len(ACTIVE_STATUSES))
+        cursor.execute(f"""
+            SELECT * FROM jobs WHERE dedup_key = ? AND status IN ({placeholders})
+        """, (dedup_key,) + ACTIVE_STATUSES)
+        row = cursor.fetchone()
+        return self._job_dict(row) if row else None
+
+    def find_latest(self, kind: str, params: Dict = None) -> Optional[Dict]:
+        """
+        Get the most recent job (any status) for the same request
+
+        Args:
+            kind: Job kind
+            params: Job parameters (compared via the dedup key)
+
+        Returns:
+            Job dict or None
+        """
+        dedup_key = f"{kind}:{JOB_KINDS[kind][1](params or {})}"
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM jobs WHERE dedup_key = ? ORDER BY id DESC LIMIT 1
+        """, (dedup_key,))
+        row = cursor.fetchone()
+        return self._job_dict(row) if row else None
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        """
+        Get a job by ID
+
+        Returns:
+            Dict with id, kind, params, status, progress, message, result,
+            error and timestamps (params/result decoded) or None
+        """
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        return self._job_dict(row) if row else None
+
+    def list(self, limit: int = 20, kind: str = None) -> List[Dict]:
+        """Get the most recent jobs, newest first"""
+        cursor = self.db.conn.cursor()
+        if kind:
+            cursor.execute("SELECT * FROM jobs WHERE kind = ? ORDER BY id DESC LIMIT ?", (kind, limit))
+        else:
+            cursor.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [self._job_dict(row) for row in cursor.fetchall()]
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job that has not started yet
+
+        Returns:
+            True if the job was cancelled
+        """
+        cursor = self.db.execute_write("""
+            UPDATE jobs SET status = 'cancelled', finished_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'queued'
+        """, (job_id,))
+        self.db.commit()
+        return cursor.rowcount > 0
+
+    def fail_stale(self) -> int:
+        """
+        Mark running jobs whose worker stopped sending heartbeats as failed
+
+        Returns:
+            Number of jobs marked failed
+        """
+        cursor = self.db.execute_write(f"""
+            UPDATE jobs
+            SET status = 'failed', error = 'Worker stopped responding',
+                finished_at = CURRENT_TIMESTAMP
+            WHERE status = 'running'
+              AND heartbeat_at < datetime('now', '-{STALE_AFTER_MINUTES} minutes')
+        """)
+        self.db.commit()
+        return cursor.rowcount
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Atomically take the oldest queued job (safe across threads and processes)
+
+        Args:
+            worker: Worker name stored on the job
+
+        Returns:
+            Claimed job dict or None if the queue is empty
+        """
+        cursor = self.db.execute_write("""
+            UPDATE jobs
+            SET status = 'running', worker = ?,
+                started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+            WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1)
+              AND status = 'queued'
+            RETURNING id
+        """, (worker,))
+        row = cursor.fetchone()
+        self.db.commit()
+        return self.get(row[0]) if row else None
+
+    def run(self, job: Dict):
+        """
+        Execute a claimed job and store its result or error
+
+        Args:
+            job: Job dict from claim()
+        """
+        run_fn = JOB_KINDS[job['kind']][0]
+        last_write = [0.0]
+
+        def progress(fraction: float = None, message: str = None):
+            """Store progress (throttled; also serves as heartbeat)"""
+            now = time.time()
+            if now - last_write[0] < PROGRESS_INTERVAL:
+                return
+            last_write[0] = now
+            self.db.execute_write("""
+                UPDATE jobs
+                SET progress = COALESCE(?, progress), message = COALESCE(?, message),
+                    heartbeat_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (fraction, message, job['id']))
+            self.db.commit()
+
+        # Long steps (a full recalculation) report no progress for minutes
+        heartbeat_stop = self._start_heartbeat(job['id'])
+        try:
+            result = run_fn(self.db, job['params'], progress)
+        except Exception as e:
+            self.db.conn.rollback()
+            self.db.execute_write("""
+                UPDATE jobs
+                SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (f"{e}\n\n{traceback.format_exc()}", job['id']))
+            self.db.commit()
+            print(f"[WARNING] Job {job['id']} ({job['kind']}) failed: {e}")
+            return
+        finally:
+            heartbeat_stop.set()
+
+        self.db.execute_write("""
+            UPDATE jobs
+            SET status = 'done', progress = 1, result = ?, finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (json.dumps(result), job['id']))
+        self.db.commit()
+        print(f"[OK] Job {job['id']} ({job['kind']}) done")
+
+    def _start_heartbeat(self, job_id: int) -> threading.Event:
+        """
+        Refresh a running job's heartbeat from a background thread
+
+        The thread uses its own connection (SQLite connections are per
+        thread), so fail_stale() of other workers leaves the job alone while
+        it runs. Set the returned event to stop it.
+        """
+        stop = threading.Event()
+        db_path = str(self.db.db_path)
+
+        def beat():
+            conn = sqlite3.connect(db_path, timeout=DatabaseManager.BUSY_TIMEOUT_MS / 1000)
+            try:
+                while not stop.wait(HEARTBEAT_INTERVAL):
+                    try:
+                        conn.execute("""
+                            UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP
+                            WHERE id = ? AND status = 'running'
+                        """, (job_id,))
+                        conn.commit()
+                    except sqlite3.Error as e:
+                        print(f"[WARNING] Job {job_id}: heartbeat failed: {e}")
+            finally:
+                conn.close()
+
+        threading.Thread(target=beat, name=f"job-{job_id}-heartbeat", daemon=True).start()
+        return stop
+
+    def run_pending(self, worker: str = 'cli') -> int:
+        """
+        Run queued jobs in this thread until the queue is empty
+
+        Returns:
+            Number of jobs executed
+        """
+        count = 0
+        while True:
+            job = self.claim(worker)
+            if job is None:
+                return count
+            self.run(job)
+            count += 1
+
+    @staticmethod
+    def _job_dict(row) -> Dict:
+        """Convert a jobs row to a dict with decoded params/result"""
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+
+# ========== WORKERS ==========
+
+class JobWorker(threading.Thread):
+    """
+    Daemon thread that claims and executes jobs until stopped
+
+    Each worker opens its own DatabaseManager (SQLite connections are
+    per thread).
+    """
+
+    def __init__(self, db_path: str, name: str):
+        """
+        Initialize worker
+
+        Args:
+            db_path: Database file shared with the enqueuing side
+            name: Worker name (stored on claimed jobs)
+        """
+        super().__init__(name=name, daemon=True)
+        self.db_path = db_path
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Worker loop (survives database errors, e.g. a lock held too long)"""
+        db = DatabaseManager(self.db_path)
+        queue = JobQueue(db)
+        backoff = ERROR_BACKOFF
+
+        try:
+            queue.fail_stale()
+        except Exception as e:
+            print(f"[WARNING] Worker {self.name}: could not check for stale jobs: {e}")
+
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    job = queue.claim(self.name)
+                    if job is None:
+                        self.stop_event.wait(POLL_INTERVAL)
+                        continue
+                    queue.run(job)
+                    backoff = ERROR_BACKOFF
+                except Exception as e:
+                    print(f"[WARNING] Worker {self.name}: {e} - retrying in {backoff:.0f}s")
+                    traceback.print_exc()
+                    try:
+                        db.conn.rollback()
+                    except sqlite3.Error:
+                        pass
+                    self.stop_event.wait(backoff)
+                    backoff = min(backoff * 2, 60.0)
+        finally:
+            db.close()
+
+    def stop(self):
+        """Ask the worker to exit after its current job"""
+        self.stop_event.set()
+
+
+_workers: List[JobWorker] = []
+_workers_lock = threading.Lock()
+
+
+def start_workers(db_path: str = "db/elo_system.db", count: int = 2) -> List[JobWorker]:
+    """
+    Start process-wide worker threads once (later calls are no-ops)
+
+    Safe to call on every dashboard render.
+
+    Args:
+        db_path: Database file
+        count: Number of worker threads
+
+    Returns:
+        The running workers
+    """
+    with _workers_lock:
+        _workers[:] = [w for w in _workers if w.is_alive()]
+        host = socket.gethostname()
+        while len(_workers) < count:
+            worker = JobWorker(db_path, f"{host}:{os.getpid()}:{len(_workers) + 1}")
+            worker.start()
+            _workers.append(worker)
+        return list(_workers)
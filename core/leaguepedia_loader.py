@@ -5,10 +5,17 @@ Fetches match data from Leaguepedia for Tier 1 leagues
 
 import requests
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set
 from urllib.parse import urlencode
-import time
 from core.database import DatabaseManager
+from core.cargo_cache import CargoCache
+from core.rate_limiter import AdaptiveRateLimiter, get_limiter, retry_after_seconds
+from core.rating_cache import invalidate_rating_cache
+from core.job_runner import enqueue_warmup
+
+
+class CargoQueryError(Exception):
+    """A Cargo query gave up (rate limited, API error, network) - not the same as 'no rows'"""
 
 
 class LeaguepediaLoader:
@@ -72,10 +79,12 @@ class LeaguepediaLoader:
     }
 
     API_ENDPOINT = "https://lol.fandom.com/api.php"
-    RATE_LIMIT_DELAY = 3.0  # seconds between requests (optimal with bot auth)
+    RATE_LIMIT_DELAY = 3.0  # initial seconds between requests (the limiter adapts from here)
     MAX_RETRIES = 10  # number of retries for rate-limited requests
+    CARGO_PAGE_SIZE = 500  # max rows per cargoquery request for non-admins
 
-    def __init__(self, db: DatabaseManager = None, bot_username: str = None, bot_password: str = None):
+    def __init__(self, db: DatabaseManager = None, bot_username: str = None, bot_password: str = None,
+                 cache: CargoCache = None, offline: bool = None, limiter: AdaptiveRateLimiter = None):
         """
         Initialize Leaguepedia loader
 
@@ -83,20 +92,40 @@ class LeaguepediaLoader:
             db: DatabaseManager instance (creates new if None)
             bot_username: Bot username from Special:BotPasswords (optional, for higher rate limits)
             bot_password: Bot password from Special:BotPasswords (optional)
+            cache: Cargo response cache (default: cargo_cache.db next to the database,
+                   disabled with LEAGUEPEDIA_CACHE=0)
+            offline: Replay cached responses only, no network (default: LEAGUEPEDIA_OFFLINE=1)
+            limiter: Request rate limiter (default: the process-wide limiter, whose
+                     learned rate is kept in leaguepedia_rate.json next to the database)
         """
+        import os
+
         self.db = db or DatabaseManager()
+        self.limiter = limiter or get_limiter(
+            self.db.db_path.parent / "leaguepedia_rate.json", rate=1 / self.RATE_LIMIT_DELAY
+        )
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'LOL-ELO-System/1.0 (Educational Research)'
         })
 
+        # Response cache (re-runs of historical imports make no requests)
+        if offline is None:
+            offline = os.getenv('LEAGUEPEDIA_OFFLINE') == '1'
+        if cache is None and (offline or os.getenv('LEAGUEPEDIA_CACHE') != '0'):
+            cache = CargoCache(self.db.db_path.parent / "cargo_cache.db")
+        if cache is not None and offline:
+            cache.offline = True
+        self.cache = cache
+
         # Bot authentication (optional - reduces rate limiting)
         self.authenticated = False
-        if bot_username and bot_password:
+        if self.cache is not None and self.cache.offline:
+            print("[INFO] Offline mode - replaying cached Cargo responses only")
+        elif bot_username and bot_password:
             self._login(bot_username, bot_password)
         else:
             # Try to get credentials from environment variables
-            import os
             env_username = os.getenv('LEAGUEPEDIA_BOT_USERNAME')
             env_password = os.getenv('LEAGUEPEDIA_BOT_PASSWORD')
             if env_username and env_password:
@@ -126,6 +155,7 @@ class LeaguepediaLoader:
                 'format': 'json'
             }
 
+            self.limiter.acquire()
             response = self.session.get(self.API_ENDPOINT, params=token_params, timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -145,6 +175,7 @@ class LeaguepediaLoader:
                 'format': 'json'
             }
 
+            self.limiter.acquire()
             response = self.session.post(self.API_ENDPOINT, data=login_params, timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -169,10 +200,11 @@ class LeaguepediaLoader:
             return False
 
     def _query_cargo(self, tables: str, fields: str, where: str = None,
-                     join_on: str = None, order_by: str = None,
-                     limit: int = 500, debug: bool = False) -> List[Dict]:
+                     join_on: str = None, order_by: str = None, group_by: str = None,
+                     limit: int = 500, offset: int = 0, debug: bool = False,
+                     raise_errors: bool = False, use_cache: bool = True) -> List[Dict]:
         """
-        Query Leaguepedia Cargo database
+        Query Leaguepedia Cargo database (a single page, see iter_cargo)
 
         Args:
             tables: Table name(s) to query
@@ -180,8 +212,14 @@ class LeaguepediaLoader:
             where: WHERE clause
             join_on: JOIN conditions
             order_by: ORDER BY clause
+            group_by: GROUP BY clause (for aggregate fields like COUNT(*)=Matches)
             limit: Result limit (max 500 for non-admins)
+            offset: Rows to skip
             debug: Print debug information
+            raise_errors: Raise CargoQueryError when the query gives up instead
+                          of returning [] (lets callers tell failures from empty results)
+            use_cache: Read the response cache (False for queries that must be live,
+                       the fresh result is still stored)
 
         Returns:
             List of result dictionaries
@@ -191,7 +229,7 @@ class LeaguepediaLoader:
             'format': 'json',
             'tables': tables,
             'fields': fields,
-            'limit': min(limit, 500)
+            'limit': min(limit, self.CARGO_PAGE_SIZE)
         }
 
         if where:
@@ -200,6 +238,20 @@ class LeaguepediaLoader:
             params['join_on'] = join_on
         if order_by:
             params['order_by'] = order_by
+        if group_by:
+            params['group_by'] = group_by
+        if offset:
+            params['offset'] = offset
+
+        if self.cache is not None and (use_cache or self.cache.offline):
+            cached = self.cache.get(params)
+            if cached is not None:
+                if debug:
+                    print(f"    DEBUG: Cache hit ({len(cached)} results)")
+                return cached
+            if self.cache.offline:
+                print(f"    [OFFLINE] No cached response for {tables} ({where})")
+                return self._query_failed(f"no cached response for {tables} ({where})", raise_errors)
 
         # Retry logic for rate limiting
         for attempt in range(self.MAX_RETRIES):
@@ -207,7 +259,13 @@ class LeaguepediaLoader:
                 if debug:
                     print(f"    DEBUG: Query params: {params}")
 
+                # Shared, adaptive rate limit - waits before the request
+                self.limiter.acquire()
                 response = self.session.get(self.API_ENDPOINT, params=params, timeout=30)
+                if response.status_code == 429:
+                    wait_time = self.limiter.on_rate_limited(attempt, retry_after_seconds(response))
+                    print(f" [HTTP 429, RETRY {attempt + 1}/{self.MAX_RETRIES}, waiting {int(wait_time)}s]", end="")
+                    continue
                 response.raise_for_status()
 
                 data = response.json()
@@ -225,42 +283,104 @@ class LeaguepediaLoader:
                     error_code = data['error'].get('code', '')
                     error_info = data['error'].get('info', '')
 
-                    if error_code == 'ratelimited':
+                    if error_code in ('ratelimited', 'maxlag'):
                         if attempt < self.MAX_RETRIES - 1:
-                            # Exponential backoff: wait longer on each retry
-                            wait_time = self.RATE_LIMIT_DELAY * (2 ** attempt)
+                            # Slow down all clients; the next acquire() waits out the backoff
+                            wait_time = self.limiter.on_rate_limited(attempt, retry_after_seconds(response))
                             print(f" [RETRY {attempt + 1}/{self.MAX_RETRIES}, waiting {int(wait_time)}s]", end="")
-                            time.sleep(wait_time)
                             continue  # Retry
                         else:
                             print(f" [FAILED after {self.MAX_RETRIES} retries]", end="")
-                            return []
+                            return self._query_failed(f"rate limited after {self.MAX_RETRIES} retries",
+                                                      raise_errors)
                     else:
                         print(f"    [ERROR] API Error: {error_code} - {error_info}")
-                        return []
+                        return self._query_failed(f"{error_code} - {error_info}", raise_errors)
+
+                self.limiter.on_success()
 
                 if 'cargoquery' in data:
                     results = [item['title'] for item in data['cargoquery']]
                     if not results and debug:
                         print(f"    DEBUG: Query returned 0 results (not an error, just no matching data)")
+                    if self.cache is not None:
+                        self.cache.put(params, results)
                     return results
 
                 return []
 
             except requests.exceptions.RequestException as e:
                 if attempt < self.MAX_RETRIES - 1:
-                    wait_time = self.RATE_LIMIT_DELAY * (2 ** attempt)
-                    print(f"    [WARNING] Request failed: {e} - retrying in {wait_time}s")
-                    time.sleep(wait_time)
+                    wait_time = self.limiter.on_failure(attempt, retry_after_seconds(e.response))
+                    print(f"    [WARNING] Request failed: {e} - retrying in {int(wait_time)}s")
                     continue
                 else:
                     print(f"    [ERROR] API request failed after {self.MAX_RETRIES} retries: {e}")
-                    return []
+                    return self._query_failed(str(e), raise_errors)
+
+        return self._query_failed(f"rate limited after {self.MAX_RETRIES} retries", raise_errors)
+
+    @staticmethod
+    def _query_failed(message: str, raise_errors: bool) -> List[Dict]:
+        """Result of a query that gave up: [] or CargoQueryError"""
+        if raise_errors:
+            raise CargoQueryError(message)
+        return []
+
+    def iter_cargo(self, tables: str, fields: str, where: str = None,
+                   join_on: str = None, order_by: str = None, group_by: str = None,
+                   limit: int = None, debug: bool = False, raise_errors: bool = False,
+                   use_cache: bool = True) -> Iterator[Dict]:
+        """
+        Stream all rows of a Cargo query, one API page at a time
+
+        Pages with limit/offset over a stable order (order_by plus the
+        table's _ID as tie-breaker), so rows are neither skipped nor
+        repeated at page boundaries. Rows are yielded as each page arrives;
+        whatever the caller does with them overlaps with the rate limit wait.
+
+        A page after the first that gives up always raises CargoQueryError:
+        ending the stream there would look like the end of the data and
+        callers would store a truncated result as complete.
+
+        Args:
+            tables: Table name(s) to query
+            fields: Fields to retrieve
+            where: WHERE clause
+            join_on: JOIN conditions
+            order_by: ORDER BY clause
+            group_by: GROUP BY clause (groups are ordered by it, no _ID tie-breaker)
+            limit: Stop after this many rows (default: all)
+            debug: Print debug information
+            raise_errors: Raise CargoQueryError if the first page fails as well
+                          (default: an empty stream, like _query_cargo)
+            use_cache: Read the response cache (see _query_cargo)
 
-            finally:
-                # Rate limiting - always wait between requests
-                if attempt == self.MAX_RETRIES - 1 or 'data' in locals():
-                    time.sleep(self.RATE_LIMIT_DELAY)
+        Yields:
+            Result dictionaries
+        """
+        # Unique tie-breaker: _ID of the first table (alias if given, e.g. "ScoreboardGames=SG")
+        first_table = tables.split(',')[0].strip()
+        id_field = f"{first_table.split('=')[-1].strip()}._ID" if ',' in tables else '_ID'
+        if group_by:
+            # One row per group: the grouping fields are unique already
+            order_by = order_by or group_by
+        elif not order_by:
+            order_by = id_field
+        elif '_ID' not in order_by:
+            order_by = f"{order_by}, {id_field}"
+
+        offset = 0
+        while limit is None or offset < limit:
+            page_size = self.CARGO_PAGE_SIZE if limit is None else min(self.CARGO_PAGE_SIZE, limit - offset)
+            page = self._query_cargo(tables, fields, where=where, join_on=join_on, order_by=order_by,
+                                     group_by=group_by, limit=page_size, offset=offset, debug=debug,
+                                     raise_errors=raise_errors or offset > 0, use_cache=use_cache)
+            yield from page
+
+            if len(page) < page_size:
+                return
+            offset += len(page)
 
     def _build_tournament_name(self, league: str, year: int, split: str) -> str:
         """
@@ -304,7 +424,8 @@ class LeaguepediaLoader:
     def get_tournament_matches(self, tournament_name: str,
                                include_players: bool = True,
                                stage_filter: str = None,
-                               use_roster_inference: bool = True) -> int:
+                               use_roster_inference: bool = True,
+                               raise_errors: bool = False) -> int:
         """
         Load matches from a specific tournament
 
@@ -315,6 +436,9 @@ class LeaguepediaLoader:
             use_roster_inference: Use roster data to infer players (MUCH faster!)
                                  True: ~10 queries per tournament (recommended)
                                  False: ~150 queries per tournament (old method)
+            raise_errors: Raise CargoQueryError if the match query gives up
+                          (default: treat it like a tournament without data; a
+                          later page that gives up raises either way)
 
         Returns:
             Number of matches imported
@@ -351,22 +475,22 @@ class LeaguepediaLoader:
             "Gamelength"
         ]
 
-        games = self._query_cargo(
+        games = self.iter_cargo(
             tables="ScoreboardGames",
             fields=", ".join(fields),
             where=where,
             order_by="DateTime_UTC",
-            limit=500
+            raise_errors=raise_errors
         )
 
-        print(f"  Found {len(games)} games in API")
-
         matches_by_id = {}
         imported_count = 0
         skipped_count = 0
+        game_count = 0
 
-        # Process games and aggregate to matches
+        # Process games and aggregate to matches (while further pages load)
         for game in games:
+            game_count += 1
             try:
                 # Extract game data
                 game_id = game.get('GameId')
@@ -430,6 +554,7 @@ class LeaguepediaLoader:
                 print(f"  [WARNING] Error processing game: {e}")
                 continue
 
+        print(f"  Found {game_count} games in API")
         print(f"  Aggregated into {len(matches_by_id)} matches")
 
         # Load roster data if using inference method
@@ -446,13 +571,14 @@ class LeaguepediaLoader:
             roster_mgr = RosterManager(
                 api_endpoint=self.API_ENDPOINT,
                 session=self.session,
-                rate_limit_delay=self.RATE_LIMIT_DELAY
+                cache=self.cache,
+                limiter=self.limiter
             )
             roster_mgr.load_tournament_rosters(tournament_name, all_teams)
 
             summary = roster_mgr.get_roster_summary()
             print(f"  [ROSTER] Loaded {summary['total_entries']} roster entries for {summary['teams']} teams")
-            print(f"  [EFFICIENCY] Using roster inference: ~{summary['teams']} queries instead of ~{len(games)} queries!")
+            print(f"  [EFFICIENCY] Using roster inference: ~{summary['teams']} queries instead of ~{game_count} queries!")
 
         # Insert matches into database
         for match_id, match_data in matches_by_id.items():
@@ -510,6 +636,9 @@ class LeaguepediaLoader:
         if skipped_count > 0:
             print(f"  [SKIP] Skipped (duplicates): {skipped_count} matches")
 
+        if imported_count > 0:
+            invalidate_rating_cache(self.db.db_path)
+
         return imported_count
 
     def _infer_players_from_roster(self, match_id: int, match_data: Dict,
@@ -657,7 +786,7 @@ class LeaguepediaLoader:
 
     def import_league_season(self, league: str, year: int, split: str,
                             include_playoffs: bool = True,
-                            include_players: bool = True) -> int:
+                            include_players: bool = True, raise_errors: bool = False) -> int:
         """
         Import entire league season (regular + playoffs)
 
@@ -667,6 +796,7 @@ class LeaguepediaLoader:
             split: Split (Spring, Summer)
             include_playoffs: Whether to import playoffs
             include_players: Whether to fetch player data
+            raise_errors: Raise CargoQueryError if the regular season or playoffs query gives up
 
         Returns:
             Total matches imported
@@ -678,7 +808,8 @@ class LeaguepediaLoader:
         print(f"\n[LEAGUE] Importing {league} {year} {split}")
         imported = self.get_tournament_matches(
             tournament_name=tournament_name,
-            include_players=include_players
+            include_players=include_players,
+            raise_errors=raise_errors
         )
         total_imported += imported
 
@@ -692,16 +823,15 @@ class LeaguepediaLoader:
             else:
                 playoff_tournament = f"{tournament_name} Playoffs"
 
-            try:
-                imported = self.get_tournament_matches(
-                    tournament_name=playoff_tournament,
-                    include_players=include_players
-                )
-                total_imported += imported
-            except Exception as e:
-                # Some tournaments might not have separate playoffs page
-                print(f"  [INFO] No separate playoffs found ({e})")
-                pass
+            # A query that gives up is not the same as a season without playoffs page
+            imported = self.get_tournament_matches(
+                tournament_name=playoff_tournament,
+                include_players=include_players,
+                raise_errors=raise_errors
+            )
+            if imported == 0:
+                print("  [INFO] No separate playoffs found")
+            total_imported += imported
 
         return total_imported
 
@@ -750,11 +880,16 @@ class LeaguepediaLoader:
             stats['by_league'][league] = league_total
             stats['total_matches'] += league_total
 
+        if stats['total_matches'] > 0:
+            enqueue_warmup(self.db)
+
         return stats
 
     def close(self):
-        """Close session and database"""
+        """Close session, response cache and database"""
         self.session.close()
+        if self.cache is not None:
+            self.cache.close()
         if self.db:
             self.db.close()
 
@@ -0,0 +1,288 @@
+"""
+Incremental Leaguepedia Sync for LOL ELO System
+Fetch only the matches played since the last sync
+
+A mid-season refresh with the importers re-fetches whole tournaments. The
+sync instead asks MatchSchedule for played matches with DateTime_UTC after
+a stored watermark, across all tracked leagues at once:
+
+    WHERE DateTime_UTC >= '<watermark - lookback>' AND Winner IS NOT NULL
+      AND (OverviewPage LIKE 'LCK/%' OR OverviewPage LIKE 'LEC/%' OR ...)
+
+That is a handful of paged queries instead of one per tournament. Rows are
+upserted by external ID: new matches are inserted, corrected scores, dates
+or teams are updated in place. The change-log triggers record every write,
+so the rating warm-up afterwards only recalculates from the earliest
+changed match (incremental refresh, see calculate_or_load_elos).
+
+- Tracked leagues: league prefixes of the OverviewPages in the import
+  ledger and the discovery manifests (leagues without a recent season are
+  left out), or explicit patterns
+- Watermark: latest match date seen, stored in sync_state; the first sync
+  starts from the latest Leaguepedia match in the database
+- Lookback: matches shortly before the watermark are fetched again, so late
+  result entries and corrections are picked up
+
+Usage:
+    sync = LeaguepediaSync(loader, db, team_resolver=TeamResolver())
+    stats = sync.run()
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from core.database import DatabaseManager
+from core.import_ledger import season_year
+from core.import_pipeline import MATCH_FIELDS, ImportPipeline, load_manifest, parse_schedule_date
+from core.leaguepedia_loader import CargoQueryError
+
+
+SYNC_NAME = 'leaguepedia_matchschedule'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def league_pattern(page: str) -> Optional[str]:
+    """
+    LIKE pattern matching all seasons of a tournament's league
+
+    'LCK/2024 Season/Summer Season' -> 'LCK/%'
+    '2024 Mid-Season Invitational'  -> '%Mid-Season Invitational%'
+
+    Returns:
+        Pattern, or None if the page cannot be matched safely
+    """
+    league = page.replace('_', ' ').split('/')[0].strip()
+    if not league or "'" in league:
+        return None
+
+    if re.search(r'\b20\d\d\b', league):
+        # Yearly events: the year is part of the page name
+        rest = re.sub(r'\s+', ' ', re.sub(r'\b20\d\d\b', '', league)).strip()
+        return f"%{rest}%" if rest else None
+
+    return f"{league}/%" if '/' in page else league
+
+
+def page_display_name(page: str) -> str:
+    """Tournament name in the manifest style ('LCK/2026 Season/Spring Season' -> 'LCK 2026 Spring')"""
+    return ' '.join(re.sub(r' Season$', '', part.strip()) for part in page.replace('_', ' ').split('/'))
+
+
+class LeaguepediaSync:
+    """Watermark-based incremental MatchSchedule sync"""
+
+    LOOKBACK_DAYS = 3       # re-fetch this far before the watermark (late entries, corrections)
+    INITIAL_DAYS = 30       # first sync on a database without Leaguepedia matches
+    ACTIVE_YEARS = 2        # track leagues with a season in the newest N tracked years
+    PATTERNS_PER_QUERY = 20 # LIKE clauses per query (keeps the URL short)
+
+    def __init__(self, loader, db: DatabaseManager = None, team_resolver=None,
+                 leagues: List[str] = None, manifests: Iterable = None,
+                 lookback_days: int = LOOKBACK_DAYS, sync_name: str = SYNC_NAME):
+        """
+        Initialize sync
+
+        Args:
+            loader: LeaguepediaLoader (Cargo client, rate limiter)
+            db: DatabaseManager to write (default: the loader's database)
+            team_resolver: TeamResolver for team names (default: names as returned)
+            leagues: OverviewPage LIKE patterns to sync (default: tracked leagues)
+            manifests: Discovery manifests to derive tracked leagues from
+                       (default: *_discovery_results.json in the project root)
+            lookback_days: Days before the watermark to fetch again
+            sync_name: Key of the watermark in sync_state
+        """
+        self.loader = loader
+        self.db = db or loader.db
+        self.leagues = leagues
+        self.manifests = manifests
+        self.lookback_days = lookback_days
+        self.sync_name = sync_name
+
+        # Reuse the importer's row parsing (team resolution, dates, external IDs)
+        self.parser = ImportPipeline(loader, db_path=self.db.db_path, team_resolver=team_resolver,
+                                     use_ledger=False)
+        self._names = {}
+
+    # ========== TRACKED LEAGUES ==========
+
+    def tracked_pages(self) -> Dict[str, str]:
+        """Known tournament pages (import ledger and manifests) -> display name"""
+        pages = {}
+
+        if self.manifests is None:
+            root = Path(__file__).parent.parent
+            self.manifests = sorted(root.glob('*_discovery_results.json'))
+
+        for manifest in self.manifests:
+            for tournament in load_manifest(manifest):
+                pages[tournament['url']] = tournament['name']
+
+        for key, name in self.db.conn.execute(
+            "SELECT key, name FROM import_ledger WHERE source = 'matchschedule' AND status = 'done'"
+        ):
+            pages.setdefault(key, name or key)
+
+        return pages
+
+    def tracked_leagues(self) -> List[str]:
+        """
+        LIKE patterns of the active tracked leagues
+
+        A league is active if it has a season within ACTIVE_YEARS of the
+        newest tracked season (manifests may be older than the current year).
+        """
+        if self.leagues:
+            return list(self.leagues)
+
+        years = {page: season_year(f"{name} {page}") for page, name in self.tracked_pages().items()}
+        newest = max((year for year in years.values() if year), default=datetime.now().year)
+        first_year = min(newest, datetime.now().year) - self.ACTIVE_YEARS + 1
+
+        patterns = set()
+        for page, year in years.items():
+            pattern = league_pattern(page)
+            if pattern and year is not None and year >= first_year:
+                patterns.add(pattern)
+        return sorted(patterns)
+
+    @staticmethod
+    def _where(since: str, patterns: List[str]) -> str:
+        pages = ' OR '.join(f"OverviewPage LIKE '{pattern}'" if '%' in pattern else f"OverviewPage='{pattern}'"
+                            for pattern in patterns)
+        return f"DateTime_UTC >= '{since}' AND Winner IS NOT NULL AND ({pages})"
+
+    # ========== WATERMARK ==========
+
+    def get_watermark(self) -> Optional[datetime]:
+        """
+        Date up to which matches are synced
+
+        Returns:
+            Stored watermark, else the latest Leaguepedia match in the
+            database, else None
+        """
+        stored = self.db.get_sync_watermark(self.sync_name)
+        if stored:
+            return datetime.strptime(stored, DATE_FORMAT)
+
+        latest = self.db.conn.execute(
+            "SELECT strftime('%Y-%m-%d %H:%M:%S', MAX(date_ts), 'unixepoch') FROM matches WHERE source = 'leaguepedia'"
+        ).fetchone()[0]
+        return datetime.strptime(latest, DATE_FORMAT) if latest else None
+
+    def sync_start(self, since: datetime = None) -> datetime:
+        """First match date to fetch (explicit since, else watermark minus lookback)"""
+        if since:
+            return since
+        watermark = self.get_watermark()
+        if watermark is None:
+            return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=self.INITIAL_DAYS)
+        return watermark - timedelta(days=self.lookback_days)
+
+    # ========== SYNC ==========
+
+    def fetch_since(self, start: datetime, patterns: List[str] = None) -> List[Dict]:
+        """
+        Fetch played matches since a date across all tracked leagues
+
+        Args:
+            start: First match date (UTC)
+            patterns: League patterns (default: tracked_leagues())
+
+        Returns:
+            Raw MatchSchedule rows
+
+        Raises:
+            CargoQueryError: If a query gives up
+        """
+        patterns = patterns or self.tracked_leagues()
+        since = start.strftime(DATE_FORMAT)
+
+        rows = []
+        for i in range(0, len(patterns), self.PATTERNS_PER_QUERY):
+            rows.extend(self.loader.iter_cargo(
+                tables="MatchSchedule",
+                fields=MATCH_FIELDS,
+                where=self._where(since, patterns[i:i + self.PATTERNS_PER_QUERY]),
+                order_by="DateTime_UTC ASC",
+                raise_errors=True,
+                use_cache=False
+            ))
+        return rows
+
+    def group_by_tournament(self, rows: List[Dict]) -> List[Dict]:
+        """Split fetched rows into parse_tournament() inputs (one per OverviewPage)"""
+        if not self._names:
+            self._names = {ImportPipeline._page_key(page): name for page, name in self.tracked_pages().items()}
+
+        by_page = {}
+        for row in rows:
+            page = row.get('OverviewPage', '').replace('_', ' ').strip()
+            by_page.setdefault(page, []).append(row)
+
+        return [
+            {'tournament': {'name': self._names.get(ImportPipeline._page_key(page), page_display_name(page)),
+                            'url': page},
+             'matches': matches, 'players': []}
+            for page, matches in by_page.items()
+        ]
+
+    def run(self, since: datetime = None, dry_run: bool = False) -> Dict:
+        """
+        Sync matches since the watermark (or an explicit date)
+
+        Args:
+            since: Fetch matches from this date instead of watermark - lookback
+            dry_run: Fetch and parse, but write nothing
+
+        Returns:
+            Statistics dict (fetched, inserted, updated, unchanged, skipped,
+            tournaments, requests, since, watermark, error)
+        """
+        start = self.sync_start(since)
+        patterns = self.tracked_leagues()
+        requests_before = self.loader.limiter.requests
+
+        stats = {'since': start.strftime(DATE_FORMAT), 'leagues': len(patterns),
+                 'fetched': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0,
+                 'tournaments': 0, 'requests': 0, 'watermark': None, 'error': None}
+
+        print(f"[INFO] Syncing matches since {stats['since']} UTC ({stats['leagues']} leagues)")
+
+        try:
+            rows = self.fetch_since(start, patterns)
+        except CargoQueryError as e:
+            # Nothing written, watermark unchanged - the next sync fetches the same range
+            print(f"[ERROR] Sync query failed: {e}")
+            stats['error'] = str(e)
+            stats['requests'] = self.loader.limiter.requests - requests_before
+            return stats
+
+        stats['fetched'] = len(rows)
+        stats['requests'] = self.loader.limiter.requests - requests_before
+        parsed = [self.parser.parse_tournament(fetched) for fetched in self.group_by_tournament(rows)]
+        stats['tournaments'] = len(parsed)
+
+        dates = [date for date in (parse_schedule_date(row.get('DateTime UTC', '') or row.get('DateTime_UTC', ''))
+                                   for row in rows) if date]
+        previous = self.get_watermark()
+        watermark = max(dates + ([previous] if previous else []), default=None)
+        stats['watermark'] = watermark.strftime(DATE_FORMAT) if watermark else None
+
+        stats['skipped'] = sum(tournament['skipped'] for tournament in parsed)
+        if dry_run:
+            return stats
+
+        with self.db.batch_writes():
+            for tournament in parsed:
+                for row in tournament['rows']:
+                    kwargs = {key: value for key, value in row.items() if key != 'players'}
+                    _, outcome = self.db.upsert_match(**kwargs)
+                    stats[outcome] += 1
+            if stats['watermark']:
+                self.db.set_sync_watermark(self.sync_name, stats['watermark'])
+
+        return stats
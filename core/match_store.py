@@ -0,0 +1,351 @@
+"""
+Columnar Match Store for LOL ELO System
+Memory-mapped export of the matches table for analytics and validation
+
+Each column is a typed .npy file; text columns are stored as int32 codes
+into a string dictionary (strings.json). Stores are written to versioned
+directories and opened with np.load(mmap_mode='r'), so parallel workers
+share one page-cached copy instead of each re-querying SQLite.
+
+Layout:
+    db/match_store/current.json        -> {"version": ..., "directory": ...}
+    db/match_store/<version>/<col>.npy
+    db/match_store/<version>/strings.json
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.database import DatabaseManager
+
+
+class MatchStore:
+    """
+    Read-only, memory-mapped columnar view of all matches
+
+    Rows are in chronological order (date_ts, id), matching
+    DatabaseManager.get_all_matches(). Matches without date_ts are stored
+    as MISSING_TS and come back as NaT.
+    """
+
+    DEFAULT_DIR = "db/match_store"
+
+    # date_ts of undated matches (pandas' NaT sentinel, so to_datetime yields NaT)
+    MISSING_TS = np.iinfo(np.int64).min
+
+    NUMERIC_COLUMNS = {
+        'match_id': np.int64,
+        'date_ts': np.int64,
+        'team1_score': np.int16,
+        'team2_score': np.int16
+    }
+
+    # Dictionary-encoded text columns (code -1 = missing)
+    STRING_COLUMNS = ('team1', 'team2', 'winner', 'tournament', 'stage', 'patch', 'source', 'bo_format')
+
+    def __init__(self, directory: Path, version: str):
+        """
+        Open an exported store
+
+        Args:
+            directory: Versioned store directory
+            version: Data version the store was exported from
+        """
+        self.directory = Path(directory)
+        self.version = version
+
+        self.columns = {}
+        for name in list(self.NUMERIC_COLUMNS) + list(self.STRING_COLUMNS):
+            self.columns[name] = np.load(self.directory / f"{name}.npy", mmap_mode='r')
+
+        with open(self.directory / "strings.json", 'r', encoding='utf-8') as f:
+            self.strings = {name: np.array(values, dtype=object) for name, values in json.load(f).items()}
+
+    def __len__(self) -> int:
+        return len(self.columns['match_id'])
+
+    # ========== VERSIONING ==========
+
+    @staticmethod
+    def data_version(db: DatabaseManager) -> str:
+        """
+        Cheap fingerprint of the matches table
+
+        Built from the trigger-maintained data version and stats_summary
+        row, so checking freshness never scans matches and score/date
+        corrections are picked up too.
+
+        Args:
+            db: DatabaseManager instance
+
+        Returns:
+            Short hex version string
+        """
+        cursor = db.conn.cursor()
+        cursor.execute('''
+            SELECT row_count, min_date_ts, max_date_ts, last_import_at
+            FROM stats_summary WHERE scope = 'table' AND key = 'matches'
+        ''')
+        row = cursor.fetchone()
+        cursor.execute(f'SELECT MAX(id) FROM {db.matches_table}')
+        max_id = cursor.fetchone()[0]
+
+        fingerprint = f"{db.get_data_version()}:{tuple(row) if row else None}:{max_id}"
+        return hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+
+    # ========== EXPORT / OPEN ==========
+
+    @classmethod
+    def export(cls, db: DatabaseManager, base_dir: str = DEFAULT_DIR) -> 'MatchStore':
+        """
+        Export all matches into a new versioned store and make it current
+
+        Args:
+            db: DatabaseManager instance
+            base_dir: Root directory of the store
+
+        Returns:
+            Opened MatchStore
+        """
+        base = Path(base_dir)
+        base.mkdir(parents=True, exist_ok=True)
+        version = cls.data_version(db)
+        target = base / version
+
+        matches = db.get_all_matches(limit=None)
+        undated = sum(1 for m in matches if m['date_ts'] is None)
+
+        # Write into a temp dir first so readers never see a partial store
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".export_", dir=base))
+        try:
+            for name, dtype in cls.NUMERIC_COLUMNS.items():
+                source_key = 'id' if name == 'match_id' else name
+                missing = cls.MISSING_TS if name == 'date_ts' else 0
+                values = np.fromiter(
+                    (missing if m[source_key] is None else m[source_key] for m in matches),
+                    dtype=dtype, count=len(matches)
+                )
+                np.save(tmp_dir / f"{name}.npy", values)
+
+            strings = {}
+            for name in cls.STRING_COLUMNS:
+                source_key = {'team1': 'team1_name', 'team2': 'team2_name'}.get(name, name)
+                codes, dictionary = cls._encode([m.get(source_key) for m in matches])
+                np.save(tmp_dir / f"{name}.npy", codes)
+                strings[name] = dictionary
+
+            with open(tmp_dir / "strings.json", 'w', encoding='utf-8') as f:
+                json.dump(strings, f, ensure_ascii=False)
+
+            try:
+                os.replace(tmp_dir, target)
+            except OSError:
+                if not target.exists():
+                    raise
+                # Exported concurrently by another process (same version = same data)
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        # Switch the pointer atomically, then drop superseded versions
+        fd, pointer_tmp = tempfile.mkstemp(prefix=".current_", suffix=".json", dir=base)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'directory': version, 'rows': len(matches), 'undated': undated}, f)
+        os.replace(pointer_tmp, base / "current.json")
+
+        cls._remove_stale(base)
+
+        print(f"[OK] Exported {len(matches)} matches to match store {version}"
+              + (f" ({undated} without date)" if undated else ""))
+        return cls(target, version)
+
+    @classmethod
+    def open(cls, base_dir: str = DEFAULT_DIR) -> Optional['MatchStore']:
+        """
+        Open the current store without checking freshness
+
+        Args:
+            base_dir: Root directory of the store
+
+        Returns:
+            MatchStore or None if nothing has been exported yet
+        """
+        pointer = Path(base_dir) / "current.json"
+        if not pointer.exists():
+            return None
+
+        with open(pointer, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+
+        directory = Path(base_dir) / current['directory']
+        if not directory.exists():
+            return None
+
+        return cls(directory, current['version'])
+
+    @classmethod
+    def load(cls, db: DatabaseManager, base_dir: str = DEFAULT_DIR) -> 'MatchStore':
+        """
+        Open the current store, re-exporting it if the data version changed
+
+        Args:
+            db: DatabaseManager instance
+            base_dir: Root directory of the store
+
+        Returns:
+            Up-to-date MatchStore
+        """
+        store = cls.open(base_dir)
+        if store is not None and store.version == cls.data_version(db):
+            return store
+        return cls.export(db, base_dir)
+
+    # ========== ACCESS ==========
+
+    def decode(self, name: str) -> np.ndarray:
+        """
+        Decode a dictionary-encoded column to an object array
+
+        Args:
+            name: Column name from STRING_COLUMNS
+
+        Returns:
+            Array of strings (None for missing values)
+        """
+        codes = np.asarray(self.columns[name])
+        dictionary = np.append(self.strings[name], None)
+        # Code -1 indexes the appended None entry
+        return dictionary[codes]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Build the DataFrame returned by UnifiedDataLoader.load_matches()
+
+        Returns:
+            DataFrame with one row per match
+        """
+        if len(self) == 0:
+            return pd.DataFrame()
+
+        score1 = np.asarray(self.columns['team1_score'])
+        score2 = np.asarray(self.columns['team2_score'])
+
+        return pd.DataFrame({
+            'date': self._dates(),
+            'team1': self.decode('team1'),
+            'team2': self.decode('team2'),
+            'score': pd.Series(score1).astype(str) + '-' + pd.Series(score2).astype(str),
+            'winner': self.decode('winner'),
+            'elo_team1': 1500,
+            'elo_team2': 1500,
+            'tournament': self.decode('tournament'),
+            'stage': self.decode('stage'),
+            'patch': self.decode('patch'),
+            'source': self.decode('source')
+        })
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        Build the dicts returned by UnifiedDataLoader.get_matches_as_dicts()
+
+        Returns:
+            List of match dictionaries
+        """
+        dates = self._dates()
+        score1 = np.asarray(self.columns['team1_score']).tolist()
+        score2 = np.asarray(self.columns['team2_score']).tolist()
+        team1 = self.decode('team1')
+        team2 = self.decode('team2')
+        winner = self.decode('winner')
+        tournament = self.decode('tournament')
+        stage = self.decode('stage')
+        patch = self.decode('patch')
+        bo_format = self.decode('bo_format')
+
+        result = []
+        for i in range(len(self)):
+            result.append({
+                'date': dates[i],
+                'team1': team1[i],
+                'team2': team2[i],
+                'team1_elo': 1500,
+                'team2_elo': 1500,
+                'score1': score1[i],
+                'score2': score2[i],
+                'winner': winner[i],
+                'is_bo1': bo_format[i] == 'Bo1',
+                'is_bo3': bo_format[i] == 'Bo3',
+                'is_bo5': bo_format[i] == 'Bo5',
+                'games_played': score1[i] + score2[i],
+                'tournament': tournament[i],
+                'stage': stage[i],
+                'patch': patch[i]
+            })
+        return result
+
+    # ========== HELPERS ==========
+
+    def _dates(self) -> pd.DatetimeIndex:
+        """date_ts as datetimes (MISSING_TS -> NaT)"""
+        return pd.to_datetime(np.asarray(self.columns['date_ts']), unit='s')
+
+    @staticmethod
+    def _encode(values: List[Optional[str]]):
+        """Dictionary-encode a text column into int32 codes"""
+        dictionary = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if value is None:
+                codes[i] = -1
+                continue
+            code = dictionary.get(value)
+            if code is None:
+                code = len(dictionary)
+                dictionary[value] = code
+            codes[i] = code
+        return codes, list(dictionary)
+
+    @staticmethod
+    def _remove_stale(base: Path):
+        """
+        Delete store versions older than the one current.json points to
+
+        Re-reads the pointer instead of trusting this export's version: a
+        concurrent export may have switched it to a newer store already.
+        Open memory maps keep their pages on POSIX, so readers of an
+        older version are unaffected.
+        """
+        try:
+            with open(base / "current.json", 'r', encoding='utf-8') as f:
+                current = base / json.load(f)['directory']
+            current_mtime = current.stat().st_mtime
+        except (OSError, ValueError, KeyError):
+            return
+
+        for entry in base.iterdir():
+            if not entry.is_dir() or entry.name.startswith('.') or entry == current:
+                continue
+            try:
+                if entry.stat().st_mtime < current_mtime:
+                    shutil.rmtree(entry, ignore_errors=True)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    # Export (or refresh) the store and show a summary
+    with DatabaseManager() as db:
+        store = MatchStore.load(db)
+
+    print(f"Version: {store.version}")
+    print(f"Matches: {len(store)}")
+    print(f"Teams:   {len(set(store.strings['team1']) | set(store.strings['team2']))}")
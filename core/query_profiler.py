@@ -0,0 +1,275 @@
+"""
+SQL Query Profiler for LOL ELO System
+Opt-in instrumentation of DatabaseManager connections
+
+Records per statement: call count, total/p95 latency, rows returned and,
+for SELECTs that do full table scans, the EXPLAIN QUERY PLAN output.
+
+Enable with DatabaseManager(instrument=True), PROFILER.enable() or the
+environment variable ELO_DB_PROFILE=1.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+class QueryProfiler:
+    """
+    Collects statement statistics from instrumented connections
+
+    Stats are process-wide so short-lived DatabaseManager instances
+    (e.g. one per dashboard render) accumulate into one report.
+    """
+
+    MAX_SAMPLES = 1000  # latency samples kept per statement for p95
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize profiler
+
+        Args:
+            enabled: Instrument new DatabaseManager connections by default
+        """
+        self.enabled = enabled
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """Instrument DatabaseManager connections opened from now on"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop instrumenting new connections"""
+        self.enabled = False
+
+    def reset(self):
+        """Drop all collected statistics"""
+        with self._lock:
+            self._stats = {}
+
+    @staticmethod
+    def normalize(sql: str) -> str:
+        """Collapse whitespace so identical statements share one entry"""
+        return re.sub(r'\s+', ' ', sql).strip()
+
+    def _entry(self, key: str) -> Dict:
+        """Get or create the stats entry for a normalized statement"""
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = {
+                'count': 0,
+                'total_time': 0.0,
+                'samples': [],
+                'rows': 0,
+                'plan': None,
+                'full_scan': False,
+                'explained': False
+            }
+            self._stats[key] = entry
+        return entry
+
+    def record(self, key: str, elapsed: float, rows: int = 0, executed: bool = True):
+        """
+        Record a statement execution or fetch
+
+        Args:
+            key: Normalized statement
+            elapsed: Seconds spent
+            rows: Rows returned
+            executed: True for an execute call, False for a fetch on the same statement
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if executed:
+                entry['count'] += 1
+                entry['samples'].append(elapsed)
+                if len(entry['samples']) > self.MAX_SAMPLES:
+                    entry['samples'].pop(0)
+            elif entry['samples']:
+                entry['samples'][-1] += elapsed
+            entry['total_time'] += elapsed
+            entry['rows'] += rows
+
+    def needs_plan(self, key: str) -> bool:
+        """Whether the statement still needs an EXPLAIN QUERY PLAN check"""
+        with self._lock:
+            entry = self._entry(key)
+            if entry['explained']:
+                return False
+            entry['explained'] = True
+            return True
+
+    def record_plan(self, key: str, plan: List[str]):
+        """
+        Store the query plan if it contains a full table scan
+
+        Args:
+            key: Normalized statement
+            plan: EXPLAIN QUERY PLAN detail lines
+        """
+        # "SCAN t" is a full table scan; "SCAN t USING (COVERING) INDEX" walks an index
+        full_scan = any(
+            line.startswith('SCAN ') and 'USING' not in line
+            for line in plan
+        )
+        with self._lock:
+            entry = self._entry(key)
+            entry['full_scan'] = full_scan
+            if full_scan:
+                entry['plan'] = plan
+
+    def report(self, limit: int = None) -> List[Dict]:
+        """
+        Build the statistics report, slowest total time first
+
+        Args:
+            limit: Optional number of statements to return
+
+        Returns:
+            List of per-statement dicts
+        """
+        with self._lock:
+            items = list(self._stats.items())
+
+        report = []
+        for sql, entry in items:
+            if entry['count'] == 0:
+                continue
+            samples = sorted(entry['samples'])
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+            report.append({
+                'statement': sql,
+                'count': entry['count'],
+                'total_ms': round(entry['total_time'] * 1000, 3),
+                'avg_ms': round(entry['total_time'] * 1000 / entry['count'], 3),
+                'p95_ms': round(p95 * 1000, 3),
+                'rows': entry['rows'],
+                'full_scan': entry['full_scan'],
+                'plan': entry['plan']
+            })
+
+        report.sort(key=lambda r: r['total_ms'], reverse=True)
+        return report[:limit] if limit else report
+
+    def dump_json(self, path: str = "reports/query_profile.json") -> Path:
+        """
+        Write the report as JSON
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path written
+        """
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'statements': self.report()
+            }, f, indent=2)
+        return output
+
+
+# Process-wide profiler used by DatabaseManager
+PROFILER = QueryProfiler(enabled=os.getenv('ELO_DB_PROFILE') == '1')
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that reports execute/fetch timings to PROFILER"""
+
+    _profile_key = None
+
+    def execute(self, sql, parameters=()):
+        key = QueryProfiler.normalize(sql)
+        self._profile_key = key
+
+        start = time.perf_counter()
+        result = super().execute(sql, parameters)
+        PROFILER.record(key, time.perf_counter() - start)
+
+        if key.split(' ', 1)[0].upper() in ('SELECT', 'WITH') and PROFILER.needs_plan(key):
+            self._explain(key, sql, parameters)
+
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        key = QueryProfiler.normalize(sql)
+        self._profile_key = key
+
+        start = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        PROFILER.record(key, time.perf_counter() - start)
+        return result
+
+    def _explain(self, key: str, sql: str, parameters):
+        """Capture EXPLAIN QUERY PLAN on the raw (uninstrumented) connection"""
+        try:
+            rows = sqlite3.Connection.execute(
+                self.connection, "EXPLAIN QUERY PLAN " + sql, parameters
+            ).fetchall()
+            PROFILER.record_plan(key, [row[3] for row in rows])
+        except sqlite3.Error:
+            pass
+
+    def _record_fetch(self, start: float, rows: int):
+        if self._profile_key:
+            PROFILER.record(self._profile_key, time.perf_counter() - start, rows, executed=False)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._record_fetch(start, 1 if row is not None else 0)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(size if size is not None else self.arraysize)
+        self._record_fetch(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._record_fetch(start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        row = super().__next__()
+        self._record_fetch(start, 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors report to PROFILER (pass as sqlite3.connect factory)"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+if __name__ == "__main__":
+    # Profile a few typical reads against the local database
+    from core.database import DatabaseManager
+
+    with DatabaseManager(instrument=True) as db:
+        db.get_stats()
+        db.get_all_matches(limit=100)
+
+    for entry in PROFILER.report(limit=10):
+        flag = " [FULL SCAN]" if entry['full_scan'] else ""
+        print(f"{entry['total_ms']:>10.2f} ms  x{entry['count']:<4} {entry['statement'][:80]}{flag}")
+
+    print(f"\nReport saved to: {PROFILER.dump_json()}")
@@ -0,0 +1,228 @@
+"""
+Adaptive Rate Limiter for Leaguepedia API clients
+One token bucket shared by every Cargo client in the process
+
+The request rate adapts to the API (AIMD):
+- every INCREASE_AFTER consecutive successes the rate grows by RATE_STEP
+  (up to max_rate)
+- a 'ratelimited'/'maxlag' answer or HTTP 429 halves it (down to min_rate)
+  and pauses all clients for the server's Retry-After hint or a capped,
+  jittered exponential backoff
+
+The learned rate is persisted to a small JSON file, so the next import
+starts at the pace the API tolerated last time instead of the worst case.
+
+Usage:
+    limiter = get_limiter()
+    limiter.acquire()                 # blocks until a request may be sent
+    ... send request ...
+    limiter.on_success()              # or on_rate_limited() / on_failure()
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with additive increase / multiplicative decrease
+    """
+
+    INCREASE_AFTER = 20         # consecutive successes before speeding up
+    RATE_STEP = 0.05            # requests/second added per increase
+    DECREASE_FACTOR = 0.5       # rate multiplier on a rate-limit answer
+    BACKOFF_BASE = 2.0          # seconds, first retry wait without server hint
+    MAX_BACKOFF = 120.0         # cap for backoff waits (seconds)
+    STATE_MAX_AGE = 7 * 24 * 3600   # ignore persisted rates older than this
+
+    def __init__(self, rate: float = 1 / 3.0, min_rate: float = 1 / 30.0,
+                 max_rate: float = 2.0, burst: float = 1.0, state_file=None):
+        """
+        Initialize limiter
+
+        Args:
+            rate: Initial requests per second (overridden by a recent state file)
+            min_rate: Lowest rate after repeated rate limiting
+            max_rate: Highest rate reached while responses are healthy
+            burst: Bucket capacity (requests that may be sent back to back)
+            state_file: JSON file to persist the learned rate (optional)
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.state_file = Path(state_file) if state_file else None
+
+        self.rate = min(max(rate, min_rate), max_rate)
+        self._load_state()
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.rate_limited = 0
+
+    # ========== BUCKET ==========
+
+    def _refill(self, now: float):
+        """Add tokens for the time since the last update (caller holds the lock)"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Block until the next request may be sent
+
+        Reserves a token first, so concurrent callers queue up in order.
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(self._paused_until - now, -self._tokens / self.rate if self._tokens < 0 else 0.0)
+            self.requests += 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    # ========== FEEDBACK ==========
+
+    def on_success(self):
+        """Record a healthy response (speeds up after INCREASE_AFTER in a row)"""
+        with self._lock:
+            self._successes += 1
+            if self._successes < self.INCREASE_AFTER or self.rate >= self.max_rate:
+                return
+            self._successes = 0
+            self.rate = min(self.max_rate, self.rate + self.RATE_STEP)
+
+        self.save()
+
+    def on_rate_limited(self, attempt: int = 0, retry_after: float = None) -> float:
+        """
+        Record a rate-limit answer: slow down and pause all clients
+
+        Args:
+            attempt: Retry number of the request (0 = first try)
+            retry_after: Server hint in seconds (Retry-After header), if any
+
+        Returns:
+            Seconds all clients pause before the next request
+        """
+        with self._lock:
+            self.rate_limited += 1
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+            wait = self._pause(attempt, retry_after)
+
+        self.save()
+        return wait
+
+    def on_failure(self, attempt: int = 0, retry_after: float = None) -> float:
+        """
+        Record a failed request (network error, 5xx): pause without slowing down
+
+        Args:
+            attempt: Retry number of the request (0 = first try)
+            retry_after: Server hint in seconds, if any
+
+        Returns:
+            Seconds all clients pause before the next request
+        """
+        with self._lock:
+            self._successes = 0
+            return self._pause(attempt, retry_after)
+
+    def _pause(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Pause all clients for a jittered, capped backoff (caller holds the lock)"""
+        backoff = min(self.MAX_BACKOFF, self.BACKOFF_BASE * (2 ** attempt))
+        wait = random.uniform(backoff / 2, backoff)
+        if retry_after:
+            wait = max(wait, min(float(retry_after), self.MAX_BACKOFF))
+
+        self._paused_until = max(self._paused_until, time.monotonic() + wait)
+        return wait
+
+    # ========== STATE ==========
+
+    def _load_state(self):
+        """Start from the persisted rate if it is recent"""
+        if not self.state_file or not self.state_file.exists():
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if time.time() - state.get('saved_at', 0) < self.STATE_MAX_AGE:
+                self.rate = min(max(float(state['rate']), self.min_rate), self.max_rate)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Ignoring rate limiter state {self.state_file}: {e}")
+
+    def save(self):
+        """Persist the current rate (atomic replace)"""
+        if not self.state_file:
+            return
+
+        state = {'rate': self.rate, 'saved_at': time.time()}
+        tmp = self.state_file.with_suffix('.tmp')
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            print(f"[WARNING] Could not save rate limiter state: {e}")
+
+    def stats(self) -> Dict:
+        """Get current rate and counters"""
+        return {
+            'rate': self.rate,
+            'delay': 1 / self.rate,
+            'requests': self.requests,
+            'rate_limited': self.rate_limited,
+        }
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter(state_file="db/leaguepedia_rate.json", rate: float = 1 / 3.0) -> AdaptiveRateLimiter:
+    """
+    Get the process-wide limiter shared by all Leaguepedia clients
+
+    The first call creates it; later arguments are ignored.
+
+    Args:
+        state_file: JSON file for the learned rate
+        rate: Initial requests per second without a recent state file
+
+    Returns:
+        Shared AdaptiveRateLimiter
+    """
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter(rate=rate, state_file=state_file)
+        return _limiter
+
+
+def retry_after_seconds(response) -> Optional[float]:
+    """Parse a Retry-After header (seconds) from a response, if present"""
+    value = getattr(response, 'headers', {}).get('Retry-After')
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,168 @@
+"""
+Rating Cache for LOL ELO System
+Process-wide LRU cache of computed ELO results
+
+Holds final rating tables and replayed calculators so every dashboard
+session (and any script in the same process) reuses warm results instead
+of re-running the latest-rating SQL or replaying all matches per render.
+
+Entries are keyed by (database file, kind, config hash, data version).
+Match changes bump the trigger-maintained data version, so outdated
+entries are never hit again and simply age out of the LRU. Importers call
+invalidate() for changes outside the matches table (team renames, region
+fixes) and after subprocess imports.
+
+Cached values are shared between callers - treat them as read-only.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class RatingCache:
+    """
+    Thread-safe, size-bounded LRU cache
+
+    Concurrent misses on the same key compute the value only once; the
+    other callers wait for it.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(db_path, kind: str, config_hash: str, data_version: int) -> Tuple:
+        """
+        Build a cache key
+
+        Args:
+            db_path: Database file the result was computed from
+            kind: Entry kind ('ratings', 'calculator')
+            config_hash: EloCalculatorService config hash
+            data_version: DatabaseManager.get_data_version() at compute time
+
+        Returns:
+            Hashable key tuple
+        """
+        return (str(Path(db_path).resolve()), kind, config_hash, data_version)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get an entry (marks it as recently used)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """Store an entry, evicting the least recently used ones if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get an entry, computing and storing it on a miss
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have computed it while we waited
+            with self._lock:
+                value = self._entries.get(key, missing)
+            if value is missing:
+                value = compute()
+                self.put(key, value)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        return value
+
+    def invalidate(self, db_path=None, config_hash: str = None) -> int:
+        """
+        Drop cached entries
+
+        Args:
+            db_path: Only entries of this database file (default: all)
+            config_hash: Only entries of this config (default: all)
+
+        Returns:
+            Number of entries dropped
+        """
+        db_file = str(Path(db_path).resolve()) if db_path is not None else None
+
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (db_file is None or key[0] == db_file)
+                and (config_hash is None or key[2] == config_hash)
+            ]
+            for key in keys:
+                del self._entries[key]
+
+        return len(keys)
+
+    def stats(self) -> Dict:
+        """Get entry count and hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# Process-wide cache shared by all DatabaseManager/EloCalculatorService instances
+RATING_CACHE = RatingCache(max_entries=int(os.getenv('ELO_RATING_CACHE_SIZE', '32')))
+
+
+def invalidate_rating_cache(db_path=None) -> int:
+    """
+    Importer hook: drop cached ratings/calculators after data changes
+
+    Args:
+        db_path: Database file that changed (default: all)
+
+    Returns:
+        Number of entries dropped
+    """
+    dropped = RATING_CACHE.invalidate(db_path)
+    if dropped:
+        print(f"[CACHE] Dropped {dropped} cached rating entries")
+    return dropped
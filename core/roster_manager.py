@@ -7,7 +7,8 @@ from typing import Dict, List, Optional, Set
 from datetime import datetime
 from collections import defaultdict
 import requests
-import time
+from core.cargo_cache import CargoCache
+from core.rate_limiter import AdaptiveRateLimiter, get_limiter, retry_after_seconds
 
 
 class RosterManager:
@@ -21,11 +22,25 @@ class RosterManager:
     4. Infer players for each game without additional queries
     """
 
-    def __init__(self, api_endpoint: str, session: requests.Session, rate_limit_delay: float = 5.0):
-        """Initialize roster manager"""
+    MAX_RETRIES = 3  # retries for rate-limited roster queries
+
+    def __init__(self, api_endpoint: str, session: requests.Session, rate_limit_delay: float = 5.0,
+                 cache: CargoCache = None, limiter: AdaptiveRateLimiter = None):
+        """
+        Initialize roster manager
+
+        Args:
+            api_endpoint: Leaguepedia API URL
+            session: HTTP session (shared with the loader for authentication)
+            rate_limit_delay: Initial seconds between requests if no shared limiter exists yet
+            cache: Shared Cargo response cache (optional)
+            limiter: Request rate limiter (default: the process-wide limiter)
+        """
         self.api_endpoint = api_endpoint
         self.session = session
         self.rate_limit_delay = rate_limit_delay
+        self.cache = cache
+        self.limiter = limiter or get_limiter(rate=1 / rate_limit_delay)
 
         # Mappings
         self.team_rosters = {}  # team -> [(player, role, start_date, end_date)]
@@ -45,25 +60,46 @@ class RosterManager:
         if where:
             params['where'] = where
 
-        try:
-            response = self.session.get(self.api_endpoint, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            if 'error' in data:
-                print(f"    [ERROR] Roster query error: {data['error'].get('info', '')}")
+        if self.cache is not None:
+            cached = self.cache.get(params)
+            if cached is not None:
+                return cached
+            if self.cache.offline:
                 return []
 
-            if 'cargoquery' in data:
-                return [item['title'] for item in data['cargoquery']]
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                self.limiter.acquire()
+                response = self.session.get(self.api_endpoint, params=params, timeout=30)
+                if response.status_code == 429:
+                    self.limiter.on_rate_limited(attempt, retry_after_seconds(response))
+                    continue
+                response.raise_for_status()
+                data = response.json()
+
+                if 'error' in data:
+                    if data['error'].get('code') in ('ratelimited', 'maxlag'):
+                        self.limiter.on_rate_limited(attempt, retry_after_seconds(response))
+                        continue
+                    print(f"    [ERROR] Roster query error: {data['error'].get('info', '')}")
+                    return []
+
+                self.limiter.on_success()
+
+                if 'cargoquery' in data:
+                    results = [item['title'] for item in data['cargoquery']]
+                    if self.cache is not None:
+                        self.cache.put(params, results)
+                    return results
 
-            return []
+                return []
+
+            except requests.exceptions.RequestException as e:
+                print(f"    [ERROR] Roster query failed: {e}")
+                return []
 
-        except requests.exceptions.RequestException as e:
-            print(f"    [ERROR] Roster query failed: {e}")
-            return []
-        finally:
-            time.sleep(self.rate_limit_delay)
+        print(f"    [ERROR] Roster query still rate limited after {self.MAX_RETRIES} tries")
+        return []
 
     def load_tournament_rosters(self, tournament_name: str, teams: Set[str]) -> None:
         """
@@ -201,7 +237,7 @@ if __name__ == "__main__":
     roster_mgr = RosterManager(
         api_endpoint=loader.API_ENDPOINT,
         session=loader.session,
-        rate_limit_delay=loader.RATE_LIMIT_DELAY
+        limiter=loader.limiter
     )
 
     # Test with a few LEC teams
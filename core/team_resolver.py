@@ -56,10 +56,11 @@ class TeamResolver:
         print("Loading Leaguepedia Teams data...")
 
         try:
-            teams = self.loader._query_cargo(
+            # All teams (several thousand rows), streamed page by page
+            teams = self.loader.iter_cargo(
                 tables="Teams",
                 fields="Name,OverviewPage,RenamedTo,IsDisbanded,Region",
-                limit=5000
+                raise_errors=True
             )
 
             for team in teams:
@@ -82,7 +83,8 @@ class TeamResolver:
             print(f"  Loaded {len(self.leaguepedia_teams)} teams from Leaguepedia")
 
         except Exception as e:
-            print(f"  Warning: Could not load Leaguepedia teams: {e}")
+            print(f"  Warning: Could not load Leaguepedia teams "
+                  f"(incomplete, {len(self.leaguepedia_teams)} loaded): {e}")
 
     def _load_manual_mappings(self):
         """Load manual team mappings from database"""
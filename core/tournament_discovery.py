@@ -0,0 +1,265 @@
+"""
+Tournament Discovery for LOL ELO System
+Find tournaments with match data using a few aggregate Cargo queries
+
+The discovery scripts used to probe every generated tournament page with
+its own MatchSchedule request (~340 requests, ~18 minutes). Discovery now
+asks for all pages of the tracked leagues at once, grouped by OverviewPage:
+
+    SELECT OverviewPage, COUNT(*), MIN(DateTime_UTC), MAX(DateTime_UTC)
+    FROM MatchSchedule
+    WHERE (OverviewPage LIKE 'LCK/%' OR ...) AND (DateTime_UTC in the year range OR undated)
+    GROUP BY OverviewPage
+
+League patterns are derived from the hand-written tournament lists (every
+season of a listed league is found, including pages the lists miss). Names
+come from the lists, else from the Tournaments table, else from the page.
+
+The result keeps the *_discovery_results.json format (found_tournaments /
+not_found_tournaments) and adds match_count and the date range per
+tournament, which the import pipeline uses to batch its queries.
+
+Usage:
+    discovery = TournamentDiscovery(loader)
+    results = discovery.discover(generate_all_tournaments())
+    save_results(results, "major_regions_discovery_results.json")
+"""
+
+import json
+import time
+from typing import Dict, List, Tuple
+
+from core.import_ledger import season_year
+from core.import_pipeline import ImportPipeline
+from core.leaguepedia_sync import league_pattern, page_display_name
+
+
+class TournamentDiscovery:
+    """Aggregate MatchSchedule/Tournaments queries over league patterns"""
+
+    PATTERNS_PER_QUERY = 20   # LIKE clauses per query (keeps the URL short)
+    PAGES_PER_QUERY = 25      # OverviewPage IN (...) entries for name lookups
+    SAMPLE_LIMIT = 5          # sample_matches as reported by the old per-page probe
+
+    def __init__(self, loader):
+        """
+        Initialize discovery
+
+        Args:
+            loader: LeaguepediaLoader (Cargo client, cache, rate limiter)
+        """
+        self.loader = loader
+
+    # ========== PATTERNS ==========
+
+    @staticmethod
+    def league_patterns(tournaments: List[Tuple[str, str]], extra: List[str] = None) -> List[str]:
+        """
+        OverviewPage LIKE patterns covering every league of a tournament list
+
+        Args:
+            tournaments: (name, url) tuples of the generators
+            extra: Additional patterns (leagues the lists do not know yet)
+
+        Returns:
+            Patterns, deduplicated case-insensitively (Cargo compares case-insensitively)
+        """
+        patterns = {}
+        for _, url in tournaments:
+            pattern = league_pattern(url)
+            if pattern:
+                patterns.setdefault(pattern.lower(), pattern)
+        for pattern in extra or []:
+            patterns.setdefault(pattern.lower(), pattern)
+        return sorted(patterns.values(), key=str.lower)
+
+    @staticmethod
+    def _pages_filter(patterns: List[str]) -> str:
+        return '(' + ' OR '.join(f"OverviewPage LIKE '{pattern}'" if '%' in pattern
+                                 else f"OverviewPage='{pattern}'" for pattern in patterns) + ')'
+
+    # ========== QUERIES ==========
+
+    def match_summary(self, patterns: List[str], start_year: int = None,
+                      end_year: int = None) -> Dict[str, Dict]:
+        """
+        Match count and date range of every page matching the patterns
+
+        Args:
+            patterns: OverviewPage LIKE patterns
+            start_year: First season year (default: all)
+            end_year: Last season year (default: all)
+
+        Returns:
+            Dict page key -> {'page', 'match_count', 'first_match', 'last_match'}
+
+        Raises:
+            CargoQueryError: If a query gives up
+        """
+        # Matches without a date (not scheduled yet) count too: the page's
+        # season year decides for them
+        dates = []
+        if start_year:
+            dates.append(f"DateTime_UTC >= '{start_year}-01-01 00:00:00'")
+        if end_year:
+            dates.append(f"DateTime_UTC < '{end_year + 1}-01-01 00:00:00'")
+        date_filter = f" AND (DateTime_UTC IS NULL OR ({' AND '.join(dates)}))" if dates else ''
+
+        summary = {}
+        for i in range(0, len(patterns), self.PATTERNS_PER_QUERY):
+            for row in self.loader.iter_cargo(
+                tables="MatchSchedule",
+                fields="OverviewPage,COUNT(*)=Matches,MIN(DateTime_UTC)=FirstMatch,MAX(DateTime_UTC)=LastMatch",
+                where=self._pages_filter(patterns[i:i + self.PATTERNS_PER_QUERY]) + date_filter,
+                group_by="OverviewPage",
+                raise_errors=True
+            ):
+                page = row.get('OverviewPage', '').replace('_', ' ').strip()
+                count = int(row.get('Matches', 0) or 0)
+                if not page or not count:
+                    continue
+                if dates and not self._in_years(page, row.get('FirstMatch'), start_year, end_year):
+                    continue
+                summary[ImportPipeline._page_key(page)] = {
+                    'page': page,
+                    'match_count': count,
+                    'first_match': row.get('FirstMatch') or None,
+                    'last_match': row.get('LastMatch') or None,
+                }
+        return summary
+
+    @staticmethod
+    def _in_years(page: str, first_match: str, start_year: int = None, end_year: int = None) -> bool:
+        """Whether a page of the date-filtered summary belongs to the year range"""
+        year = season_year(page)
+        if year is None:
+            # No year in the page name: only pages with dated matches in the range
+            return bool(first_match)
+        return not ((start_year and year < start_year) or (end_year and year > end_year))
+
+    def tournament_names(self, pages: List[str]) -> Dict[str, str]:
+        """
+        Tournament names of pages from the Tournaments table
+
+        Args:
+            pages: OverviewPages (with spaces)
+
+        Returns:
+            Dict page key -> name (pages without a Tournaments row are missing)
+
+        Raises:
+            CargoQueryError: If a query gives up
+        """
+        names = {}
+        for i in range(0, len(pages), self.PAGES_PER_QUERY):
+            chunk = [page for page in pages[i:i + self.PAGES_PER_QUERY] if "'" not in page]
+            if not chunk:
+                continue
+            for row in self.loader.iter_cargo(
+                tables="Tournaments",
+                fields="Name,OverviewPage",
+                where=ImportPipeline._overview_filter(chunk),
+                raise_errors=True
+            ):
+                if row.get('Name'):
+                    names.setdefault(ImportPipeline._page_key(row.get('OverviewPage', '')), row['Name'])
+        return names
+
+    # ========== DISCOVERY ==========
+
+    def discover(self, tournaments: List[Tuple[str, str]], extra_patterns: List[str] = None,
+                 start_year: int = None, end_year: int = None) -> Dict:
+        """
+        Discover all tournaments with match data of the listed leagues
+
+        Args:
+            tournaments: (name, url) tuples of the generators (names and
+                         expected pages; underscores are converted to spaces)
+            extra_patterns: Additional OverviewPage LIKE patterns
+            start_year: First season year (default: all)
+            end_year: Last season year (default: all)
+
+        Returns:
+            Results in the *_discovery_results.json format
+        """
+        start_time = time.time()
+        requests_before = self.loader.limiter.requests
+
+        expected = []
+        for name, url in tournaments:
+            year = season_year(f"{name} {url}")
+            if year and ((start_year and year < start_year) or (end_year and year > end_year)):
+                continue
+            expected.append((name, url.replace('_', ' ')))
+
+        patterns = self.league_patterns(tournaments, extra_patterns)
+        print(f"[INFO] Querying {len(patterns)} league patterns "
+              f"({(len(patterns) - 1) // self.PATTERNS_PER_QUERY + 1} aggregate queries)")
+        summary = self.match_summary(patterns, start_year, end_year)
+
+        expected_keys = {ImportPipeline._page_key(url): (name, url) for name, url in expected}
+        new_pages = [entry['page'] for key, entry in summary.items() if key not in expected_keys]
+        names = self.tournament_names(new_pages) if new_pages else {}
+
+        found_tournaments = []
+        not_found_tournaments = []
+
+        for name, url in expected:
+            entry = summary.get(ImportPipeline._page_key(url))
+            if entry:
+                found_tournaments.append(self._found(name, url, entry))
+                print(f"✅ {name:70} {entry['match_count']} matches")
+            else:
+                not_found_tournaments.append({'name': name, 'url': url, 'found': False})
+                print(f"❌ {name:70} NOT FOUND")
+
+        for key, entry in sorted(summary.items(), key=lambda item: (item[1]['first_match'] or '', item[0])):
+            if key in expected_keys:
+                continue
+            name = names.get(key) or page_display_name(entry['page'])
+            found_tournaments.append(self._found(name, entry['page'], entry))
+            print(f"🆕 {name:70} {entry['match_count']} matches (not in tournament list)")
+
+        total = len(found_tournaments) + len(not_found_tournaments)
+        return {
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_seconds': time.time() - start_time,
+            'total_tested': total,
+            'total_found': len(found_tournaments),
+            'total_not_found': len(not_found_tournaments),
+            'success_rate': len(found_tournaments) / total * 100 if total else 0.0,
+            'api_requests': self.loader.limiter.requests - requests_before,
+            'found_tournaments': found_tournaments,
+            'not_found_tournaments': not_found_tournaments
+        }
+
+    def _found(self, name: str, url: str, entry: Dict) -> Dict:
+        return {
+            'name': name,
+            'url': url,  # Save with SPACES
+            'found': True,
+            'sample_matches': min(entry['match_count'], self.SAMPLE_LIMIT),
+            'match_count': entry['match_count'],
+            'first_match': entry['first_match'],
+            'last_match': entry['last_match'],
+        }
+
+
+def save_results(results: Dict, path):
+    """Write discovery results (UTF-8 JSON, same format as before)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def print_results(results: Dict, output_file=None):
+    """Print the discovery summary"""
+    print("\n" + "=" * 80)
+    print("DISCOVERY COMPLETE")
+    print("=" * 80)
+    print(f"Time elapsed: {results['duration_seconds']:.1f}s ({results['api_requests']} API requests)")
+    print(f"\nTotal tested:   {results['total_tested']}")
+    print(f"Found:          {results['total_found']}")
+    print(f"Not Found:      {results['total_not_found']}")
+    print(f"Success rate:   {results['success_rate']:.1f}%")
+    if output_file:
+        print(f"\n📄 Results saved to: {output_file}")
@@ -10,6 +10,7 @@ import pandas as pd
 
 from core.data_loader import MatchDataLoader as GoogleSheetsLoader
 from core.database import DatabaseManager
+from core.match_store import MatchStore
 
 
 class UnifiedDataLoader:
@@ -18,20 +19,26 @@ class UnifiedDataLoader:
     Prioritizes database, falls back to Google Sheets
     """
 
-    def __init__(self, prefer_database: bool = True):
+    def __init__(self, prefer_database: bool = True, replica: str = None,
+                 use_store: bool = False):
         """
         Initialize unified loader
 
         Args:
             prefer_database: If True, use database when available
+            replica: DatabaseManager replica mode ('memory', 'readonly') for
+                     read-heavy jobs; None reads the file directly
+            use_store: Read matches from the memory-mapped columnar
+                       MatchStore (re-exported when the data changes)
         """
         self.prefer_database = prefer_database
+        self.use_store = use_store
         self.google_sheets_loader = GoogleSheetsLoader()
         self.db = None
 
         # Try to connect to database
         try:
-            self.db = DatabaseManager()
+            self.db = DatabaseManager(replica=replica)
             db_stats = self.db.get_stats()
             self.has_database = db_stats['total_matches'] > 0
         except Exception as e:
@@ -60,13 +67,18 @@ class UnifiedDataLoader:
 
     def _load_from_database(self) -> pd.DataFrame:
         """Load matches from database"""
+        if self.use_store:
+            df = MatchStore.load(self.db).to_dataframe()
+            print(f"  [OK] Loaded {len(df)} matches from match store")
+            return df
+
         matches = self.db.get_all_matches(limit=None)
 
         # Convert to DataFrame format compatible with existing scripts
         df_data = []
         for m in matches:
             df_data.append({
-                'date': pd.Timestamp(m['date']),
+                'date': m['date_ts'],
                 'team1': m['team1_name'],
                 'team2': m['team2_name'],
                 'score': f"{m['team1_score']}-{m['team2_score']}",
@@ -81,8 +93,15 @@ class UnifiedDataLoader:
 
         df = pd.DataFrame(df_data)
 
-        # Sort chronologically
-        df = df.sort_values('date').reset_index(drop=True)
+        if df.empty:
+            print("  [OK] Loaded 0 matches from database")
+            return df
+
+        # Integer epoch -> Timestamp in one vectorized pass (no string parsing)
+        df['date'] = pd.to_datetime(df['date'], unit='s')
+
+        # Already in chronological order from the date_ts index
+        df = df.reset_index(drop=True)
 
         print(f"  [OK] Loaded {len(df)} matches from database")
         return df
@@ -143,13 +162,16 @@ class UnifiedDataLoader:
             source = 'database' if (self.has_database and self.prefer_database) else 'google_sheets'
 
         if source == 'database' and self.has_database:
+            if self.use_store:
+                return MatchStore.load(self.db).to_dicts()
+
             matches = self.db.get_all_matches(limit=None)
 
             # Convert to expected format
             result = []
             for m in matches:
                 result.append({
-                    'date': pd.Timestamp(m['date']),
+                    'date': pd.Timestamp(m['date_ts'], unit='s'),
                     'team1': m['team1_name'],
                     'team2': m['team2_name'],
                     'team1_elo': 1500,  # Will be calculated
@@ -86,6 +86,10 @@ page = st.sidebar.radio(
 
 st.sidebar.markdown("---")
 
+# Background workers (ELO recomputes, validations, post-import warm-ups)
+from core.job_runner import start_workers
+start_workers()
+
 # Quick stats in sidebar
 from core.database import DatabaseManager
 
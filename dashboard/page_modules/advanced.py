@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.database import DatabaseManager
+from core.query_profiler import PROFILER
 from core.team_name_resolver import TeamNameResolver
 
 
@@ -22,11 +23,12 @@ def show():
     st.markdown("Power user features and utilities")
 
     # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "🏷️ Team Name Mapping",
         "🗄️ SQL Console",
         "🔧 ELO Variants",
-        "🛠️ System Configuration"
+        "🛠️ System Configuration",
+        "⏱️ Query Profiler"
     ])
 
     # === TAB 1: TEAM NAME MAPPING ===
@@ -283,12 +285,15 @@ def show():
             help="Only SELECT queries are recommended"
         )
 
-        col1, col2 = st.columns([1, 4])
+        col1, col2, col3 = st.columns([1, 1, 3])
 
         with col1:
             execute_button = st.button("▶️ Execute", type="primary")
 
         with col2:
+            max_rows = st.number_input("Max rows", min_value=10, max_value=100000, value=1000, step=100)
+
+        with col3:
             if sql_query and not sql_query.strip().upper().startswith('SELECT'):
                 st.warning("⚠️ Non-SELECT query detected. Use caution!")
 
@@ -296,13 +301,22 @@ def show():
             try:
                 db = DatabaseManager()
 
-                # Execute query
-                df_result = pd.read_sql_query(sql_query, db.conn)
+                # Execute query, fetching at most max_rows (+1 to detect truncation)
+                cursor = db.conn.cursor()
+                cursor.execute(sql_query)
+                columns = [col[0] for col in cursor.description] if cursor.description else []
+                rows = cursor.fetchmany(int(max_rows) + 1) if columns else []
+                db.conn.commit()
 
                 db.close()
 
+                truncated = len(rows) > max_rows
+                df_result = pd.DataFrame([tuple(row) for row in rows[:int(max_rows)]], columns=columns)
+
                 # Display results
                 st.success(f"✓ Query executed successfully! ({len(df_result)} rows)")
+                if truncated:
+                    st.info(f"Showing the first {int(max_rows)} rows. Add a LIMIT or raise Max rows to see more.")
 
                 st.dataframe(df_result, use_container_width=True)
 
@@ -577,6 +591,72 @@ def show():
         - Logs: Check terminal output
         """)
 
+    # === TAB 5: QUERY PROFILER ===
+    with tab5:
+        st.subheader("⏱️ Query Profiler")
+        st.markdown("Per-statement latency, row counts and full-scan query plans")
+
+        st.info("""
+        **How it works:**
+
+        While enabled, every new database connection records each SQL statement's
+        call count, total and p95 latency and rows returned. SELECTs that do a full
+        table scan are flagged with their `EXPLAIN QUERY PLAN`.
+
+        Enable permanently with `ELO_DB_PROFILE=1`, or dump a report from the CLI:
+        `python -m core.query_profiler`
+        """)
+
+        col1, col2 = st.columns([1, 1])
+
+        with col1:
+            enabled = st.checkbox("Enable profiling", value=PROFILER.enabled, key="profiler_enabled")
+            if enabled:
+                PROFILER.enable()
+            else:
+                PROFILER.disable()
+
+        with col2:
+            if st.button("🧹 Reset Statistics", key="profiler_reset"):
+                PROFILER.reset()
+                st.success("✓ Profiler statistics cleared")
+
+        report = PROFILER.report()
+
+        if report:
+            full_scans = [entry for entry in report if entry['full_scan']]
+
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Statements", len(report))
+            with col2:
+                st.metric("Total Time", f"{sum(entry['total_ms'] for entry in report):,.1f} ms")
+            with col3:
+                st.metric("Full Table Scans", len(full_scans))
+
+            df_report = pd.DataFrame(report)[
+                ['statement', 'count', 'total_ms', 'avg_ms', 'p95_ms', 'rows', 'full_scan']
+            ]
+            df_report.columns = ['Statement', 'Calls', 'Total (ms)', 'Avg (ms)', 'p95 (ms)', 'Rows', 'Full Scan']
+            st.dataframe(df_report, use_container_width=True, hide_index=True)
+
+            if full_scans:
+                st.markdown("---")
+                st.markdown("### 🔍 Full Table Scans")
+                for entry in full_scans:
+                    with st.expander(f"{entry['total_ms']:.1f} ms · {entry['statement'][:100]}"):
+                        st.code(entry['statement'], language="sql")
+                        st.code("\n".join(entry['plan']), language="text")
+
+            st.download_button(
+                "📥 Download Report (JSON)",
+                data=json.dumps({'statements': report}, indent=2),
+                file_name="query_profile.json",
+                mime="application/json"
+            )
+        else:
+            st.info("No statements recorded yet. Enable profiling and browse other pages.")
+
 
 if __name__ == "__main__":
     show()
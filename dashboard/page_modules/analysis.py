@@ -162,6 +162,9 @@ def show():
         - Match closeness (3-0 vs 3-2)
         """)
 
+        # Live breakdown from the stored prediction log (no replay)
+        show_prediction_log()
+
         # Check for results
         error_path = Path("analysis/error_patterns.json")
 
@@ -362,28 +365,14 @@ def show():
             db = DatabaseManager()
             service = EloCalculatorService(db)
 
-            # Calculate DynamicOffsetElo
+            # Warm calculator shared by all sessions (replayed once per data version)
             with st.spinner('Calculating regional offsets...'):
-                config_id, ratings = service.calculate_or_load_elos(
+                elo = service.get_calculator(
                     variant='dynamic_offset',
                     k_factor=24,
                     use_scale_factors=True
                 )
-
-            # Load the actual calculator to get offsets
-            from variants.with_dynamic_offsets import DynamicOffsetElo
-
-            elo = DynamicOffsetElo(k_factor=24, use_scale_factors=True)
-
-            # Reload all matches to populate offsets
-            matches = db.get_all_matches(limit=None)
-            for match in matches:
-                elo.update_ratings(
-                    match['team1_name'],
-                    match['team2_name'],
-                    match['team1_score'],
-                    match['team2_score']
-                )
+            db.close()
 
             # Get offsets
             offsets = elo.calculator.offsets
@@ -664,5 +653,75 @@ def show():
                 st.info("No analysis files found. Run validation to generate analyses.")
 
 
+def show_prediction_log():
+    """Accuracy breakdowns and calibration from the stored prediction log of a config"""
+    from core.database import DatabaseManager
+    from core.elo_calculator_service import EloCalculatorService
+
+    st.markdown("---")
+    st.subheader("🗂️ Stored Predictions (all matches)")
+
+    with DatabaseManager() as db:
+        service = EloCalculatorService(db)
+        configs = service.get_available_configs()
+
+        if not configs:
+            st.info("No ELO configurations calculated yet - open the Rankings page first.")
+            return
+
+        config = st.selectbox(
+            "Configuration",
+            configs,
+            format_func=lambda c: c['name'],
+            key="prediction_log_config"
+        )
+
+        by_diff = service.get_prediction_accuracy(config['id'], by='elo_diff')
+        if not by_diff:
+            st.info("No stored predictions for this configuration - recalculate it to fill the log.")
+            return
+
+        total = sum(r['total'] for r in by_diff)
+        correct = sum(r['correct'] for r in by_diff)
+        brier = sum(r['brier'] * r['total'] for r in by_diff) / total
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Predictions", f"{total:,}")
+        col2.metric("Accuracy", f"{correct / total:.2%}")
+        col3.metric("Brier Score", f"{brier:.4f}")
+
+        def breakdown(rows, label):
+            df = pd.DataFrame([
+                {
+                    label: r['key'],
+                    'Accuracy': r['accuracy'],
+                    'Avg Confidence': r['avg_confidence'],
+                    'Sample Size': r['total']
+                }
+                for r in rows
+            ])
+            st.bar_chart(df.set_index(label)['Accuracy'], use_container_width=True)
+            for column in ('Accuracy', 'Avg Confidence'):
+                df[column] = df[column].apply(lambda x: f"{x:.1%}")
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+        sub1, sub2, sub3, sub4 = st.tabs(["ELO Difference", "Tournament", "Closeness", "Calibration"])
+
+        with sub1:
+            breakdown(by_diff, 'Matchup')
+        with sub2:
+            breakdown(service.get_prediction_accuracy(config['id'], by='tournament')[:25], 'Tournament')
+        with sub3:
+            breakdown(service.get_prediction_accuracy(config['id'], by='closeness'), 'Closeness')
+        with sub4:
+            calibration = service.get_calibration(config['id'], n_bins=10)
+            df_cal = pd.DataFrame({
+                'Predicted': calibration['predicted'],
+                'Actual': calibration['actual']
+            }, index=calibration['bins'])
+            st.line_chart(df_cal, use_container_width=True)
+            st.caption("Team 1 win probability per equal-size bin vs. observed win rate")
+
+
 if __name__ == "__main__":
     show()
@@ -4,14 +4,23 @@ Data Management Page - Import and manage data
 
 import streamlit as st
 import pandas as pd
+import io
 import sys
 from pathlib import Path
 import subprocess
+from datetime import datetime
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.database import DatabaseManager
+from core.elo_calculator_service import EloCalculatorService
+from dashboard.page_modules.match_browser import show_match_browser
+from dashboard.page_modules.jobs import (
+    enqueue_job, read_output_file, show_job_status, show_jobs_panel
+)
+from core.job_runner import JobQueue
+from core.rating_cache import RATING_CACHE, invalidate_rating_cache
 
 
 def show():
@@ -71,55 +80,44 @@ def show():
             st.markdown("---")
             st.subheader("📋 Table Statistics")
 
-            cursor = db.conn.cursor()
-
-            # Get row counts for all tables
+            # Row counts from the materialized stats_summary table
             tables = ['teams', 'matches', 'players', 'match_players', 'tournaments']
-            table_stats = []
-
-            for table in tables:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    table_stats.append({'Table': table.title(), 'Rows': count})
-                except:
-                    table_stats.append({'Table': table.title(), 'Rows': 0})
+            table_counts = {entry['key']: entry['count'] for entry in db.get_summary('table')}
+            table_stats = [
+                {'Table': table.title(), 'Rows': table_counts.get(table, 0)}
+                for table in tables
+            ]
 
             df_tables = pd.DataFrame(table_stats)
             st.dataframe(df_tables, use_container_width=True, hide_index=True)
 
-            # Recent activity
+            # Per-source and per-region summaries
+            col1, col2 = st.columns(2)
+
+            for col, scope, label in [(col1, 'source', 'Source'), (col2, 'region', 'Region')]:
+                with col:
+                    summary = [entry for entry in db.get_summary(scope) if entry['count']]
+                    if summary:
+                        df_summary = pd.DataFrame([
+                            {
+                                label: entry['key'],
+                                'Matches': entry['count'],
+                                'First': (entry['first_date'] or '')[:10],
+                                'Last': (entry['last_date'] or '')[:10],
+                                'Last Import': entry['last_import_at']
+                            }
+                            for entry in summary
+                        ])
+                        st.dataframe(df_summary, use_container_width=True, hide_index=True)
+
+            # Match browser (one page at a time)
             st.markdown("---")
-            st.subheader("🕒 Recent Activity")
+            st.subheader("🕒 Match Browser")
 
             try:
-                query = """
-                    SELECT
-                        m.date,
-                        t1.name as team1,
-                        t2.name as team2,
-                        m.team1_score || '-' || m.team2_score as score,
-                        tw.name as winner
-                    FROM matches m
-                    JOIN teams t1 ON m.team1_id = t1.id
-                    JOIN teams t2 ON m.team2_id = t2.id
-                    JOIN teams tw ON m.winner_id = tw.id
-                    ORDER BY m.date DESC
-                    LIMIT 5
-                """
-
-                df_recent = pd.read_sql_query(query, db.conn)
-
-                if not df_recent.empty:
-                    df_recent['date'] = pd.to_datetime(df_recent['date']).dt.strftime('%Y-%m-%d')
-                    df_recent.columns = ['Date', 'Team 1', 'Team 2', 'Score', 'Winner']
-
-                    st.dataframe(df_recent, use_container_width=True, hide_index=True)
-                else:
-                    st.info("No recent matches found")
-
+                show_match_browser(db, key="dm_matches", page_size=20)
             except Exception as e:
-                st.warning(f"Could not load recent activity: {str(e)}")
+                st.warning(f"Could not load matches: {str(e)}")
 
             db.close()
 
@@ -154,6 +152,8 @@ def show():
                     )
 
                     if result.returncode == 0:
+                        # The import ran in another process; drop this process's warm ratings
+                        invalidate_rating_cache()
                         st.success("✓ Google Sheets import completed!")
                         with st.expander("View Import Log"):
                             st.code(result.stdout)
@@ -241,6 +241,8 @@ def show():
                     )
 
                     if result.returncode == 0:
+                        # The import ran in another process; drop this process's warm ratings
+                        invalidate_rating_cache()
                         st.success("✓ Leaguepedia import completed!")
                         with st.expander("View Import Log"):
                             st.code(result.stdout)
@@ -317,20 +319,16 @@ def show():
 
                 issues = []
 
-                # Check for missing data
-                cursor.execute("SELECT COUNT(*) FROM matches WHERE team1_id IS NULL OR team2_id IS NULL")
-                missing_teams = cursor.fetchone()[0]
-                if missing_teams > 0:
-                    issues.append(f"⚠️ {missing_teams} matches with missing team IDs")
+                # Team IDs are NOT NULL in the schema, so no missing-team scan is needed
 
-                # Check for invalid scores
-                cursor.execute("SELECT COUNT(*) FROM matches WHERE team1_score < 0 OR team2_score < 0")
-                invalid_scores = cursor.fetchone()[0]
+                # Check for invalid scores (trigger-maintained counter)
+                integrity = {entry['key']: entry['count'] for entry in db.get_summary('integrity')}
+                invalid_scores = integrity.get('invalid_scores', 0)
                 if invalid_scores > 0:
                     issues.append(f"⚠️ {invalid_scores} matches with invalid scores")
 
-                # Check for future dates
-                cursor.execute("SELECT COUNT(*) FROM matches WHERE match_date > datetime('now')")
+                # Check for future dates (range scan on the date_ts index)
+                cursor.execute("SELECT COUNT(*) FROM matches WHERE date_ts > CAST(strftime('%s', 'now') AS INTEGER)")
                 future_dates = cursor.fetchone()[0]
                 if future_dates > 0:
                     issues.append(f"⚠️ {future_dates} matches with future dates")
@@ -467,91 +465,41 @@ def show():
         with col3:
             elo_scale = st.checkbox("Use Scale Factors", value=True, key="export_scale")
 
-        if st.button("📥 Export ELO History", key="export_elo_history"):
-            try:
-                with st.spinner("Calculating ELO history... This may take a moment..."):
-                    # Use the export script logic
-                    from variants.with_dynamic_offsets import DynamicOffsetElo
-
-                    db = DatabaseManager()
-                    matches = db.get_all_matches(limit=None)
-
-                    # Initialize ELO calculator
-                    elo = DynamicOffsetElo(
-                        k_factor=elo_k_factor,
-                        initial_elo=1500,
-                        use_scale_factors=elo_scale
-                    )
-
-                    # Build match history with ELO values
-                    history_data = []
-
-                    for i, match in enumerate(matches, 1):
-                        team1 = match['team1_name']
-                        team2 = match['team2_name']
-                        score1 = match['team1_score']
-                        score2 = match['team2_score']
-
-                        # Get ELO BEFORE match
-                        team1_elo_before = elo.get_rating(team1)
-                        team2_elo_before = elo.get_rating(team2)
-
-                        # Calculate expected win probability
-                        prob_team1_wins = elo.expected_score(team1_elo_before, team2_elo_before)
-                        prob_team2_wins = 1 - prob_team1_wins
-
-                        # Update ratings
-                        delta1, delta2 = elo.update_ratings(team1, team2, score1, score2)
-
-                        # Get ELO AFTER match
-                        team1_elo_after = elo.get_rating(team1)
-                        team2_elo_after = elo.get_rating(team2)
-
-                        # Determine winner
-                        winner = team1 if score1 > score2 else team2
-
-                        # Build row
-                        row = {
-                            'Match': i,
-                            'Date': match['date'],
-                            'Team 1': team1,
-                            'Team 2': team2,
-                            'Score': f"{score1}-{score2}",
-                            'Winner': winner,
-                            'Tournament': match.get('tournament', match.get('stage', 'Unknown')),
-                            'Team 1 ELO Before': round(team1_elo_before, 1),
-                            'Team 2 ELO Before': round(team2_elo_before, 1),
-                            'Team 1 Win Prob': f"{prob_team1_wins*100:.1f}%",
-                            'Team 2 Win Prob': f"{prob_team2_wins*100:.1f}%",
-                            'Team 1 ELO Change': f"{delta1:+.1f}" if delta1 else "0.0",
-                            'Team 2 ELO Change': f"{delta2:+.1f}" if delta2 else "0.0",
-                            'Team 1 ELO After': round(team1_elo_after, 1),
-                            'Team 2 ELO After': round(team2_elo_after, 1)
-                        }
-
-                        history_data.append(row)
-
-                    df_history = pd.DataFrame(history_data)
-
-                    # Offer download
-                    csv = df_history.to_csv(index=False)
-                    st.download_button(
-                        "📥 Download ELO Match History CSV",
-                        data=csv,
-                        file_name=f"elo_match_history_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
+        # Runs scripts/export_elo_history.py as a background job
+        export_file = f"exports/elo_match_history_{elo_variant}_k{elo_k_factor}{'' if elo_scale else '_noscale'}.csv"
+        export_args = ['--variant', elo_variant, '--k-factor', elo_k_factor, '--output', export_file]
+        if not elo_scale:
+            export_args.append('--no-scale')
+        export_params = {'script': 'scripts/export_elo_history.py', 'args': export_args}
+
+        with DatabaseManager() as jobs_db:
+            if st.button("📥 Export ELO History", key="export_elo_history"):
+                enqueue_job(jobs_db, 'script', export_params)
+                st.info("ELO history export queued...")
+
+            job = show_job_status(JobQueue(jobs_db).find_latest('script', export_params), "export_job")
+
+        # Only a finished run's file - an older CSV may exist while a new export runs
+        csv = read_output_file(export_file) if job and job['status'] == 'done' else None
+        if csv:
+            # Offer download
+            st.download_button(
+                "📥 Download ELO Match History CSV",
+                data=csv,
+                file_name=f"elo_match_history_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
 
-                    st.success(f"✓ Generated history for {len(df_history)} matches!")
+            # Show preview
+            with st.expander("📋 Preview (first 10 matches)", expanded=False):
+                st.dataframe(pd.read_csv(io.BytesIO(csv), nrows=10), use_container_width=True)
 
-                    # Show preview
-                    with st.expander("📋 Preview (first 10 matches)", expanded=False):
-                        st.dataframe(df_history.head(10), use_container_width=True)
+        # Background jobs
+        st.markdown("---")
+        st.markdown("### ⏳ Background Jobs")
 
-            except Exception as e:
-                st.error(f"Error generating ELO history: {str(e)}")
-                import traceback
-                st.code(traceback.format_exc())
+        with DatabaseManager() as jobs_db:
+            show_jobs_panel(jobs_db)
 
         # Backup database
         st.markdown("---")
@@ -576,9 +524,9 @@ def show():
         if st.button("🚀 Vacuum Database", key="vacuum_db"):
             try:
                 db = DatabaseManager()
-                cursor = db.conn.cursor()
-                cursor.execute("VACUUM")
-                db.conn.commit()
+                # Also switches older databases to incremental auto-vacuum
+                db.enable_incremental_vacuum()
+                db.rebuild_stats()
                 db.close()
 
                 st.success("✓ Database optimized!")
@@ -587,12 +535,123 @@ def show():
             except Exception as e:
                 st.error(f"Error optimizing database: {str(e)}")
 
+        # Stored ELO configs (retention)
+        st.markdown("---")
+        st.markdown("### 📦 Stored ELO Configs")
+
+        st.info(f"""
+        Every calculated parameter combination keeps its full rating history.
+        When more than {EloCalculatorService.RETENTION_MAX_CONFIGS} configs or
+        ~{EloCalculatorService.RETENTION_MAX_BYTES // 1024 // 1024} MB are stored, the least
+        recently used ones are removed automatically. Pinned configs are always kept.
+        """)
+
+        try:
+            with EloCalculatorService() as config_service:
+                usage = config_service.get_storage_usage()
+
+                if usage:
+                    st.dataframe(pd.DataFrame([
+                        {
+                            'ID': config['id'],
+                            'Config': config['name'],
+                            'Pinned': '📌' if config['pinned'] else '',
+                            'Last Used': config['last_accessed_at'],
+                            'Rows': config['rows'],
+                            'Size (MB)': round(config['bytes'] / 1024 / 1024, 1)
+                        }
+                        for config in reversed(usage)
+                    ]), use_container_width=True, hide_index=True)
+
+                    col1, col2, col3 = st.columns([2, 1, 1])
+                    with col1:
+                        config_id = st.selectbox(
+                            "Config",
+                            [config['id'] for config in reversed(usage)],
+                            format_func=lambda i: next(f"#{c['id']} {c['name']}" for c in usage if c['id'] == i),
+                            key="retention_config"
+                        )
+                    pinned = next(c['pinned'] for c in usage if c['id'] == config_id)
+                    with col2:
+                        if st.button("📌 Unpin" if pinned else "📌 Pin", key="retention_pin"):
+                            config_service.pin_config(config_id, not pinned)
+                            st.rerun()
+                    with col3:
+                        if st.button("🧹 Apply Retention", key="retention_apply"):
+                            evicted = config_service.enforce_retention()
+                            st.success(f"✓ Removed {len(evicted)} configs")
+                else:
+                    st.caption("No calculated configs yet.")
+
+        except Exception as e:
+            st.error(f"Error loading stored configs: {str(e)}")
+
+        # Season archives
+        st.markdown("---")
+        st.markdown("### 🗄️ Season Archives")
+
+        st.info("""
+        Closed seasons can be sealed into read-only archive files (db/archive/).
+        They stay visible to all readers, while imports, integrity checks and
+        VACUUM only touch the active database.
+        """)
+
+        try:
+            db = DatabaseManager()
+            partitions = db.get_partitions()
+            archived = {p['season'] for p in partitions}
+            closed_seasons = sorted(
+                (int(entry['key']) for entry in db.get_summary('year')
+                 if entry['key'].isdigit() and entry['count'] > 0),
+                reverse=True
+            )
+            closed_seasons = [
+                season for season in closed_seasons
+                if season < datetime.now().year and season not in archived
+            ]
+            db.close()
+
+            if partitions:
+                df_partitions = pd.DataFrame([
+                    {
+                        'Season': p['season'],
+                        'Matches': p['match_count'],
+                        'First': p['first_date'],
+                        'Last': p['last_date'],
+                        'Sealed': p['sealed_at'],
+                        'Attached': '✓' if p['attached'] else '✗ missing'
+                    }
+                    for p in partitions
+                ])
+                st.dataframe(df_partitions, use_container_width=True, hide_index=True)
+
+            if closed_seasons:
+                season = st.selectbox("Closed season", closed_seasons, key="archive_season")
+
+                if st.button("🗄️ Archive Season", key="archive_season_btn"):
+                    db = DatabaseManager()
+                    archived_count = db.archive_season(season)
+                    db.close()
+                    st.cache_data.clear()
+                    invalidate_rating_cache()
+                    st.success(f"✓ Archived {archived_count} matches of season {season}")
+            else:
+                st.caption("No closed seasons left to archive.")
+
+        except Exception as e:
+            st.error(f"Error loading season archives: {str(e)}")
+
         # Clear cache
         st.markdown("---")
         st.markdown("### 🗑️ Clear Cache")
 
+        cache_stats = RATING_CACHE.stats()
+        st.caption(f"Rating cache: {cache_stats['entries']}/{cache_stats['max_entries']} entries, "
+                   f"{cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
         if st.button("🧹 Clear Streamlit Cache", key="clear_cache"):
             st.cache_data.clear()
+            invalidate_rating_cache()
             st.success("✓ Cache cleared! Reload page to see changes.")
 
 
@@ -3,7 +3,6 @@ Home Page - System Overview & Quick Stats
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -11,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.database import DatabaseManager
+from dashboard.page_modules.match_browser import matches_to_dataframe
 
 
 def show():
@@ -117,56 +117,13 @@ def show():
         st.subheader("🏆 Recent Matches")
 
         try:
-            # Get recent matches
-            query = """
-                SELECT
-                    m.date,
-                    t1.name as team1,
-                    t2.name as team2,
-                    m.team1_score,
-                    m.team2_score,
-                    tw.name as winner,
-                    COALESCE(
-                        tourn.name,
-                        CASE
-                            WHEN m.stage IS NOT NULL AND m.stage != ''
-                            THEN m.stage
-                            ELSE 'Regular Season'
-                        END
-                    ) as tournament
-                FROM matches m
-                JOIN teams t1 ON m.team1_id = t1.id
-                JOIN teams t2 ON m.team2_id = t2.id
-                JOIN teams tw ON m.winner_id = tw.id
-                LEFT JOIN tournaments tourn ON m.tournament_id = tourn.id
-                ORDER BY m.date DESC
-                LIMIT 10
-            """
-
-            cursor = db.conn.cursor()
-            cursor.execute(query)
-            matches = cursor.fetchall()
+            # Get recent matches (first page of the keyset-paginated reader)
+            matches = db.get_matches_page(limit=10)['matches']
 
             if matches:
-                # Create DataFrame
-                df_matches = pd.DataFrame(matches, columns=[
-                    'Date', 'Team 1', 'Team 2', 'Score 1', 'Score 2', 'Winner', 'Tournament'
-                ])
-
-                # Format date
-                df_matches['Date'] = pd.to_datetime(df_matches['Date']).dt.strftime('%Y-%m-%d')
-
-                # Format score
-                df_matches['Score'] = df_matches.apply(
-                    lambda row: f"{row['Score 1']}-{row['Score 2']}", axis=1
-                )
-
-                # Select columns for display
-                display_df = df_matches[['Date', 'Team 1', 'Team 2', 'Score', 'Winner', 'Tournament']]
-
                 # Display as table
                 st.dataframe(
-                    display_df,
+                    matches_to_dataframe(matches),
                     use_container_width=True,
                     hide_index=True
                 )
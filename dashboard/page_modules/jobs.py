@@ -0,0 +1,171 @@
+"""
+Background Jobs - Dashboard helpers around core.job_runner
+Heavy work runs in worker threads; pages only enqueue, poll and pick up results
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+import pandas as pd
+
+from core.database import DatabaseManager
+from core.elo_calculator_service import EloCalculatorService
+from core.job_runner import ACTIVE_STATUSES, PROJECT_ROOT, JobQueue, start_workers
+
+
+POLL_SECONDS = 1.5
+
+
+def enqueue_job(db: DatabaseManager, kind: str, params: Dict) -> int:
+    """Enqueue a (deduplicated) job and make sure this process has workers"""
+    start_workers(str(db.db_path))
+    return JobQueue(db).enqueue(kind, params)
+
+
+def wait_for_job(db: DatabaseManager, job_id: int, label: str) -> Dict:
+    """
+    Show progress of a job and rerun the page until it has finished
+
+    The job keeps running if the user leaves the page or refreshes.
+
+    Returns:
+        The finished job (only returns once it is no longer active)
+    """
+    start_workers(str(db.db_path))
+    job = JobQueue(db).get(job_id)
+
+    if job['status'] in ACTIVE_STATUSES:
+        status = "waiting for a worker" if job['status'] == 'queued' else job['message'] or "running"
+        st.progress(min(max(job['progress'], 0.0), 1.0), text=f"{label} (job #{job_id}): {status}")
+        st.caption("Runs in the background - leaving or refreshing this page does not cancel it.")
+        time.sleep(POLL_SECONDS)
+        st.rerun()
+
+    return job
+
+
+def load_ratings(db: DatabaseManager, service: EloCalculatorService, key: str,
+                 force: bool = False, **params) -> Tuple[int, Dict]:
+    """
+    Load a config's ratings, calculating them in a background job if needed
+
+    Up-to-date configs load directly. Otherwise (or when forced) an
+    'elo_config' job is enqueued - identical requests from other sessions
+    share it - and the page shows its progress until the ratings are stored.
+
+    Args:
+        db: Open DatabaseManager
+        service: EloCalculatorService on db
+        key: Session key for the pending job of this page
+        force: Recalculate even if the stored ratings are current
+        **params: calculate_or_load_elos parameters
+
+    Returns:
+        Tuple of (config_id, ratings_dict)
+    """
+    pending = st.session_state.get(key)
+    if pending and pending['params'] != params:
+        # Settings changed; the old job finishes on its own
+        pending = None
+
+    if force or (not pending and not service.get_current_config_id(**params)):
+        job_id = enqueue_job(db, 'elo_config', dict(params, force_recalculate=force))
+        pending = {'job_id': job_id, 'params': params}
+
+    if pending:
+        st.session_state[key] = pending
+        job = wait_for_job(db, pending['job_id'], "Calculating ELO ratings")
+        del st.session_state[key]
+
+        if job['status'] != 'done':
+            show_job_error(job)
+            st.stop()
+
+    return service.calculate_or_load_elos(**params)
+
+
+def show_job_error(job: Dict):
+    """Render the error of a failed/cancelled job"""
+    error = job['error'] or job['status']
+    st.error(f"Job #{job['id']} {job['status']}: {error.splitlines()[0]}")
+    with st.expander("Details"):
+        st.code(error)
+
+
+def show_job_status(job: Optional[Dict], key: str) -> Optional[Dict]:
+    """
+    Render status/progress of a job that the user may check later
+
+    Args:
+        job: Job dict (or None if never run)
+        key: Widget key prefix
+
+    Returns:
+        The job if it finished successfully, else None
+    """
+    if job is None:
+        return None
+
+    if job['status'] in ACTIVE_STATUSES:
+        status = "waiting for a worker" if job['status'] == 'queued' else job['message'] or "running"
+        st.progress(min(max(job['progress'], 0.0), 1.0), text=f"Job #{job['id']}: {status}")
+        st.button("🔄 Refresh status", key=f"{key}_refresh")
+        return None
+
+    if job['status'] != 'done':
+        show_job_error(job)
+        return None
+
+    st.success(f"✓ Job #{job['id']} finished at {job['finished_at']}")
+    return job
+
+
+def _job_target(job: Dict) -> str:
+    """Short description of what a job works on"""
+    params = job['params']
+    if job['kind'] == 'script':
+        return params['script']
+    if job['kind'] == 'warmup':
+        return f"popular configs (data version {params.get('data_version')})"
+    return f"{params.get('variant', '')} K={params.get('k_factor', '')}"
+
+
+def show_jobs_panel(db: DatabaseManager, limit: int = 20):
+    """Table of recent jobs with a cancel action for queued ones"""
+    queue = JobQueue(db)
+    jobs = queue.list(limit=limit)
+
+    if not jobs:
+        st.info("No background jobs yet")
+        return
+
+    st.dataframe(pd.DataFrame([
+        {
+            'Job': job['id'],
+            'Kind': job['kind'],
+            'Target': _job_target(job),
+            'Status': job['status'],
+            'Progress': f"{job['progress']:.0%}",
+            'Created': job['created_at'],
+            'Finished': job['finished_at'] or ''
+        }
+        for job in jobs
+    ]), use_container_width=True, hide_index=True)
+
+    queued = [job['id'] for job in jobs if job['status'] == 'queued']
+    if queued:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            job_id = st.selectbox("Queued job", queued, key="jobs_cancel_id")
+        with col2:
+            if st.button("Cancel job", key="jobs_cancel"):
+                queue.cancel(job_id)
+                st.rerun()
+
+
+def read_output_file(path: str) -> Optional[bytes]:
+    """Read a job's output file (relative to the project root) if it exists"""
+    # Scripts run with the project root as cwd, the dashboard may not
+    file = PROJECT_ROOT / path
+    return file.read_bytes() if file.exists() else None
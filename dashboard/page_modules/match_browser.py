@@ -0,0 +1,102 @@
+"""
+Match Browser - Paginated match table shared by dashboard pages
+Loads one page at a time through DatabaseManager.get_matches_page (keyset pagination)
+"""
+
+import streamlit as st
+import pandas as pd
+
+from core.database import DatabaseManager
+
+
+def matches_to_dataframe(matches) -> pd.DataFrame:
+    """Format get_matches_page() rows for st.dataframe"""
+    return pd.DataFrame([
+        {
+            'Date': (m['date'] or '')[:10],
+            'Team 1': m['team1_name'],
+            'Team 2': m['team2_name'],
+            'Score': f"{m['team1_score']}-{m['team2_score']}",
+            'Winner': m['winner'],
+            'Tournament': m['tournament'] or m['stage'] or 'Unknown'
+        }
+        for m in matches
+    ])
+
+
+def show_match_browser(db: DatabaseManager, key: str = "match_browser", page_size: int = 20):
+    """
+    Render a filterable, paginated match table
+
+    Page cursors are kept in st.session_state, so "Older"/"Newer" only
+    ever load one page.
+
+    Args:
+        db: Open DatabaseManager
+        key: Unique widget/session key prefix
+        page_size: Matches per page
+    """
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        team_query = st.text_input("Team", placeholder="Name or alias", key=f"{key}_team")
+    with col2:
+        tournament_query = st.text_input("Tournament", placeholder="e.g. Worlds 2024", key=f"{key}_tournament")
+    with col3:
+        sources = ["All Sources"] + sorted(db.get_stats()['by_source'])
+        source = st.selectbox("Source", sources, key=f"{key}_source")
+
+    filters = {}
+
+    # Resolve free text (incl. aliases) to stored names via the search index
+    if team_query:
+        hits = db.search(team_query, kinds=['team'], limit=1)
+        if not hits:
+            st.info(f"No team matches '{team_query}'")
+            return
+        filters['team'] = hits[0]['name']
+    if tournament_query:
+        hits = db.search(tournament_query, kinds=['tournament'], limit=1)
+        if not hits:
+            st.info(f"No tournament matches '{tournament_query}'")
+            return
+        filters['tournament'] = hits[0]['name']
+    if source != "All Sources":
+        if 'team' in filters:
+            st.caption("Source filter is ignored when filtering by team")
+        else:
+            filters['source'] = source
+
+    # Start over when the filters change
+    cursors_key = f"{key}_cursors"
+    filters_key = f"{key}_filters"
+    if st.session_state.get(filters_key) != filters:
+        st.session_state[filters_key] = filters
+        st.session_state[cursors_key] = [None]
+
+    cursors = st.session_state[cursors_key]
+    page = db.get_matches_page(filters=filters, after=cursors[-1], limit=page_size)
+
+    if filters:
+        st.caption("Filters: " + ", ".join(f"{k} = {v}" for k, v in filters.items()))
+
+    if not page['matches']:
+        st.info("No matches found")
+        return
+
+    st.dataframe(matches_to_dataframe(page['matches']), use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col1:
+        if st.button("◀ Newer", key=f"{key}_newer", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+
+    with col2:
+        st.caption(f"Page {len(cursors)} · {page_size} matches per page")
+
+    with col3:
+        if st.button("Older ▶", key=f"{key}_older", disabled=page['next_cursor'] is None):
+            cursors.append(page['next_cursor'])
+            st.rerun()
@@ -3,7 +3,6 @@ Match Predictor Page - Predict match outcomes
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -12,6 +11,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.database import DatabaseManager
 from core.elo_calculator_service import EloCalculatorService
+from dashboard.page_modules.jobs import load_ratings
+
+
+def _select_team(key: str, team: str):
+    """Preselect a team in one of the prediction selectboxes"""
+    st.session_state[key] = team
 
 
 def show():
@@ -76,7 +81,9 @@ def show():
             db = DatabaseManager()
             service = EloCalculatorService(db)
 
-            config_id, team_ratings = service.calculate_or_load_elos(
+            # Missing/outdated ratings are calculated by a background job
+            config_id, team_ratings = load_ratings(
+                db, service, 'predictor_job',
                 variant=variant,
                 k_factor=k_factor,
                 use_scale_factors=use_scale_factors,
@@ -102,19 +109,35 @@ def show():
     # Sort teams by ELO
     sorted_teams = sorted(team_elos.items(), key=lambda x: x[1], reverse=True)
     team_names = [team for team, _ in sorted_teams]
+    team_positions = {team: i for i, team in enumerate(team_names)}
 
     st.markdown("---")
 
     # === MATCH PREDICTION ===
     st.subheader("⚔️ Match Prediction")
 
+    # Quick find by name or alias (e.g. "TL", "SKT") via the search index
+    lookup = st.text_input("🔎 Find team", placeholder="Name or alias, e.g. TL, SKT", key="predictor_lookup")
+    if lookup:
+        hits = [r['name'] for r in db.search(lookup, kinds=['team'], limit=5) if r['name'] in team_positions]
+        if hits:
+            for hit in hits:
+                hit_col1, hit_col2, hit_col3 = st.columns([2, 1, 1])
+                hit_col1.markdown(f"**{hit}** ({int(team_elos[hit])})")
+                hit_col2.button("Team 1", key=f"lookup_t1_{hit}",
+                                on_click=_select_team, args=("team1_select", hit))
+                hit_col3.button("Team 2", key=f"lookup_t2_{hit}",
+                                on_click=_select_team, args=("team2_select", hit))
+        else:
+            st.caption("No rated team matches that name")
+
     col1, col2, col3 = st.columns([2, 1, 2])
 
     with col1:
         # Find index of previously selected team, or default to 0
         default_team1_idx = 0
-        if 'team1_select' in st.session_state and st.session_state.team1_select in team_names:
-            default_team1_idx = team_names.index(st.session_state.team1_select)
+        if st.session_state.get('team1_select') in team_positions:
+            default_team1_idx = team_positions[st.session_state.team1_select]
 
         team1 = st.selectbox(
             "Team 1",
@@ -131,8 +154,8 @@ def show():
     with col3:
         # Find index of previously selected team, or default to 1
         default_team2_idx = min(1, len(team_names) - 1)
-        if 'team2_select' in st.session_state and st.session_state.team2_select in team_names:
-            default_team2_idx = team_names.index(st.session_state.team2_select)
+        if st.session_state.get('team2_select') in team_positions:
+            default_team2_idx = team_positions[st.session_state.team2_select]
 
         team2 = st.selectbox(
             "Team 2",
@@ -244,42 +267,34 @@ def show():
     st.subheader("📜 Head-to-Head History")
 
     try:
-        loader = UnifiedDataLoader()
-        matches_df = loader.load_matches(source='auto')
-
-        h2h = matches_df[
-            ((matches_df['team1'] == team1) & (matches_df['team2'] == team2)) |
-            ((matches_df['team1'] == team2) & (matches_df['team2'] == team1))
-        ]
-
-        if not h2h.empty:
-            # Count wins
-            team1_wins = len(h2h[h2h['winner'] == team1])
-            team2_wins = len(h2h[h2h['winner'] == team2])
-            total_matches = len(h2h)
+        h2h = db.get_head_to_head(team1, team2, limit=5)
 
+        if h2h['total'] > 0:
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                st.metric(f"{team1} Wins", team1_wins)
+                st.metric(f"{team1} Wins", h2h['team1_wins'])
 
             with col2:
-                st.metric("Total Matches", total_matches)
+                st.metric("Total Matches", h2h['total'])
 
             with col3:
-                st.metric(f"{team2} Wins", team2_wins)
+                st.metric(f"{team2} Wins", h2h['team2_wins'])
 
             # Show recent matches
             st.markdown("**Recent Matches:**")
-            recent_h2h = h2h.sort_values('date', ascending=False).head(5)
 
-            for _, match in recent_h2h.iterrows():
-                date = pd.to_datetime(match['date']).strftime('%Y-%m-%d')
-                score = f"{match['team1_score']}-{match['team2_score']}"
-                winner = match['winner']
-                tournament = match.get('tournament', 'Unknown')
+            for match in h2h['matches']:
+                date = match['date'][:10]
+                winner = team1 if match['result'] == 'W' else team2
+                tournament = match['tournament'] or 'Unknown'
+
+                st.caption(f"**{date}** | {team1} vs {team2} | {match['score']} | Winner: **{winner}** | {tournament}")
 
-                st.caption(f"**{date}** | {match['team1']} vs {match['team2']} | {score} | Winner: **{winner}** | {tournament}")
+            # Recent form of both teams
+            form1 = db.get_team_form(team1)
+            form2 = db.get_team_form(team2)
+            st.caption(f"Recent form: {team1} **{form1['form']}** | {team2} **{form2['form']}**")
 
         else:
             st.info(f"No previous matches found between {team1} and {team2}")
@@ -14,6 +14,7 @@ from core.database import DatabaseManager
 from core.elo_calculator_service import EloCalculatorService
 from core.unified_data_loader import UnifiedDataLoader
 from variants.with_tournament_context import TournamentContextElo
+from dashboard.page_modules.jobs import load_ratings
 
 
 def show():
@@ -66,7 +67,8 @@ def show():
                 )
 
             with col5:
-                if st.button("Recalculate", type="primary"):
+                if st.button("Recalculate", type="primary",
+                             help="Ratings refresh automatically after imports; this forces a full replay"):
                     st.session_state['force_recalc'] = True
 
             # ELO Variant Descriptions
@@ -124,14 +126,15 @@ def show():
             if force_recalc:
                 st.session_state['force_recalc'] = False
 
-            with st.spinner('Loading ELO ratings...'):
-                config_id, team_elos = service.calculate_or_load_elos(
-                    variant=variant,
-                    k_factor=k_factor,
-                    use_scale_factors=use_scale_factors,
-                    use_regional_offsets=use_regional_offsets,
-                    force_recalculate=force_recalc
-                )
+            # Missing/outdated ratings are calculated by a background job
+            config_id, team_elos = load_ratings(
+                db, service, 'rankings_job',
+                force=force_recalc,
+                variant=variant,
+                k_factor=k_factor,
+                use_scale_factors=use_scale_factors,
+                use_regional_offsets=use_regional_offsets
+            )
 
             if not team_elos:
                 st.warning("No ELO data available. Import matches first!")
@@ -233,6 +236,10 @@ def show():
             # Limit results
             rankings_df = rankings_df.head(limit)
 
+            # Last five results of all listed teams (one query over team_matches)
+            forms = db.get_team_forms(rankings_df['Team'].tolist())
+            rankings_df['Form'] = [forms[team]['form'] for team in rankings_df['Team']]
+
             # Add rank column
             rankings_df.insert(0, 'Rank', range(1, len(rankings_df) + 1))
 
@@ -388,7 +395,7 @@ def show():
             for _, match in matches_df.iterrows():
                 team1 = match['team1']
                 team2 = match['team2']
-                match_date = pd.to_datetime(match['date'])
+                match_date = match['date']
 
                 # Initialize teams if not seen before
                 if team1 not in team_elos:
@@ -42,28 +42,14 @@ def show():
         db = DatabaseManager()
         service = EloCalculatorService(db)
 
-        # Calculate DynamicOffsetElo
+        # Warm calculator shared by all sessions (replayed once per data version)
         with st.spinner('Calculating regional offsets...'):
-            config_id, ratings = service.calculate_or_load_elos(
+            elo = service.get_calculator(
                 variant='dynamic_offset',
                 k_factor=24,
                 use_scale_factors=True
             )
-
-        # Load the actual calculator to get offsets
-        from variants.with_dynamic_offsets import DynamicOffsetElo
-
-        elo = DynamicOffsetElo(k_factor=24, use_scale_factors=True)
-
-        # Reload all matches to populate offsets
-        matches = db.get_all_matches(limit=None)
-        for match in matches:
-            elo.update_ratings(
-                match['team1_name'],
-                match['team2_name'],
-                match['team1_score'],
-                match['team2_score']
-            )
+        db.close()
 
         # Get offsets
         offsets = elo.calculator.offsets
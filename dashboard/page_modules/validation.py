@@ -11,6 +11,10 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from core.database import DatabaseManager
+from core.job_runner import JobQueue
+from dashboard.page_modules.jobs import enqueue_job, show_job_status
+
 
 def show():
     """Display validation suite page"""
@@ -330,35 +334,23 @@ def show():
         st.subheader("📊 Master Validation Report")
         st.markdown("Comprehensive report including all validation tests")
 
-        if st.button("🚀 Generate Master Validation Report", type="primary"):
-            st.info("Generating master validation report... This may take 2-5 minutes.")
-
-            with st.spinner("Running all validation tests..."):
-                import subprocess
+        # Scripts run as background jobs: results survive reruns and page switches
+        db = DatabaseManager()
+        queue = JobQueue(db)
 
-                try:
-                    result = subprocess.run(
-                        ["python", "scripts/generate_validation_report.py"],
-                        capture_output=True,
-                        text=True,
-                        timeout=600  # 10 minute timeout
-                    )
+        report_params = {'script': 'scripts/generate_validation_report.py', 'timeout': 600}
 
-                    if result.returncode == 0:
-                        st.success("✓ Validation report generated successfully!")
-                        st.markdown("Navigate to **📊 Validation Dashboard** tab to view results.")
+        if st.button("🚀 Generate Master Validation Report", type="primary"):
+            enqueue_job(db, 'script', report_params)
+            st.info("Master validation report queued... This may take 2-5 minutes.")
 
-                        # Show output
-                        with st.expander("View Script Output"):
-                            st.code(result.stdout)
-                    else:
-                        st.error("❌ Validation failed!")
-                        st.code(result.stderr)
+        job = show_job_status(queue.find_latest('script', report_params), "report_job")
+        if job:
+            st.markdown("Navigate to **📊 Validation Dashboard** tab to view results.")
 
-                except subprocess.TimeoutExpired:
-                    st.error("❌ Validation timed out (>10 minutes). Check your dataset size.")
-                except Exception as e:
-                    st.error(f"❌ Error running validation: {str(e)}")
+            # Show output
+            with st.expander("View Script Output"):
+                st.code(job['result']['output'])
 
         # Individual tests
         st.markdown("---")
@@ -370,61 +362,34 @@ def show():
             st.markdown("**K-Fold Cross-Validation**")
 
             k_value = st.selectbox("K Value", [5, 10], index=0, key="kfold_k")
+            kfold_params = {'script': 'validation/k_fold_validation.py', 'args': ['--k', k_value], 'timeout': 300}
 
             if st.button("Run K-Fold Validation"):
-                st.info(f"Running K-Fold validation with K={k_value}...")
-
-                with st.spinner("Running..."):
-                    import subprocess
-
-                    try:
-                        result = subprocess.run(
-                            ["python", "validation/k_fold_validation.py", "--k", str(k_value)],
-                            capture_output=True,
-                            text=True,
-                            timeout=300
-                        )
+                enqueue_job(db, 'script', kfold_params)
+                st.info(f"K-Fold validation with K={k_value} queued...")
 
-                        if result.returncode == 0:
-                            st.success(f"✓ K-Fold (K={k_value}) completed!")
-                            with st.expander("View Output"):
-                                st.code(result.stdout)
-                        else:
-                            st.error("❌ K-Fold validation failed!")
-                            st.code(result.stderr)
-
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
+            job = show_job_status(queue.find_latest('script', kfold_params), "kfold_job")
+            if job:
+                with st.expander("View Output"):
+                    st.code(job['result']['output'])
 
         with col2:
             st.markdown("**Bootstrap Confidence Intervals**")
 
             iterations = st.selectbox("Iterations", [100, 1000, 10000], index=1, key="bootstrap_iter")
+            bootstrap_params = {'script': 'validation/bootstrap_ci.py', 'args': ['--iterations', iterations],
+                                'timeout': 300}
 
             if st.button("Run Bootstrap"):
-                st.info(f"Running bootstrap with {iterations} iterations...")
-
-                with st.spinner("Running..."):
-                    import subprocess
-
-                    try:
-                        result = subprocess.run(
-                            ["python", "validation/bootstrap_ci.py", "--iterations", str(iterations)],
-                            capture_output=True,
-                            text=True,
-                            timeout=300
-                        )
+                enqueue_job(db, 'script', bootstrap_params)
+                st.info(f"Bootstrap with {iterations} iterations queued...")
 
-                        if result.returncode == 0:
-                            st.success(f"✓ Bootstrap ({iterations} iterations) completed!")
-                            with st.expander("View Output"):
-                                st.code(result.stdout)
-                        else:
-                            st.error("❌ Bootstrap validation failed!")
-                            st.code(result.stderr)
+            job = show_job_status(queue.find_latest('script', bootstrap_params), "bootstrap_job")
+            if job:
+                with st.expander("View Output"):
+                    st.code(job['result']['output'])
 
-                    except Exception as e:
-                        st.error(f"❌ Error: {str(e)}")
+        db.close()
 
         # Command line reference
         st.markdown("---")
@@ -16,7 +16,7 @@ from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.leaguepedia_loader import LeaguepediaLoader
+from core.leaguepedia_loader import CargoQueryError, LeaguepediaLoader
 from core.database import DatabaseManager
 from core.team_resolver import TeamResolver
 
@@ -79,6 +79,9 @@ def import_players_for_tournament(tournament_name: str, db: DatabaseManager, loa
 
     Returns:
         Number of players imported
+
+    Raises:
+        CargoQueryError: If a query gives up (players of earlier batches stay inserted)
     """
     print(f"\n{'='*80}")
     print(f"Importing player data for: {tournament_name}")
@@ -99,34 +102,15 @@ def import_players_for_tournament(tournament_name: str, db: DatabaseManager, loa
     # ScoreboardGames uses UNDERSCORES in OverviewPage (like ScoreboardPlayers)
     tournament_name_underscores = tournament_url.replace(' ', '_')
 
-    # Query with pagination support for large tournaments
-    all_games = []
-    offset = 0
-    batch_size = 500
-
-    while True:
-        # Note: Some fields like DateTime_UTC and UniqueGame cause internal API errors!
-        # Use MatchId instead of UniqueGame - works without errors
-        games_batch = loader._query_cargo(
-            tables='ScoreboardGames',
-            fields='GameId, MatchId, Team1, Team2',
-            where=f'OverviewPage="{tournament_name_underscores}"',
-            limit=batch_size
-        )
-
-        if not games_batch:
-            break
-
-        all_games.extend(games_batch)
-
-        print(f"  Fetched {len(games_batch)} games (total: {len(all_games)})")
-
-        if len(games_batch) < batch_size:
-            break  # Last page
-
-        # For pagination, would need to add offset support to _query_cargo
-        # For now, assuming <500 games per tournament (which is typical)
-        break
+    # Note: Some fields like DateTime_UTC and UniqueGame cause internal API errors!
+    # Use MatchId instead of UniqueGame - works without errors
+    # iter_cargo pages through large tournaments (500 rows per request)
+    all_games = list(loader.iter_cargo(
+        tables='ScoreboardGames',
+        fields='GameId, MatchId, Team1, Team2',
+        where=f'OverviewPage="{tournament_name_underscores}"',
+        raise_errors=True
+    ))
 
     if not all_games:
         print(f"⚠️  No games found for {tournament_name}")
@@ -140,7 +124,7 @@ def import_players_for_tournament(tournament_name: str, db: DatabaseManager, loa
 
     if not matches:
         print(f"⚠️  No matches found in database for {tournament_name}")
-        print(f"💡 Run the match import first: python major_regions_tournament_import_matchschedule.py")
+        print("💡 Run the match import first: python major_regions_tournament_import_matchschedule.py")
         return 0
 
     print(f"✓ Found {len(matches)} matches in database")
@@ -154,7 +138,7 @@ def import_players_for_tournament(tournament_name: str, db: DatabaseManager, loa
     print(f"✓ Created mapping for {len(external_id_to_match)} matches with external_id")
 
     # Step 3: Fetch player data in batches of 50 games (= 500 players max)
-    print(f"\n[3/4] Fetching player data in batches...")
+    print("\n[3/4] Fetching player data in batches...")
 
     total_players_inserted = 0
     total_players_skipped = 0
@@ -170,12 +154,12 @@ def import_players_for_tournament(tournament_name: str, db: DatabaseManager, loa
         where_clause = f'GameId IN ("{game_ids_quoted}")'
 
         # Query player data - only the fields we need
-        players = loader._query_cargo(
+        players = list(loader.iter_cargo(
             tables='ScoreboardPlayers',
             fields='Link, Role, Team, PlayerWin, GameId',
-            where=where_clause,
-            limit=500  # 50 games × 10 players = 500
-        )
+            where=where_clause,  # 50 games × 10 players = 500, more pages if needed
+            raise_errors=True
+        ))
 
         print(f"  Batch {batch_count}: {len(players)} players from {len(game_batch)} games")
 
@@ -296,17 +280,31 @@ def main():
 
             print(f"Found {len(tournaments)} tournaments")
 
+            failed = []
             for i, tournament_name in enumerate(tournaments, 1):
                 print(f"\n[{i}/{len(tournaments)}] Processing: {tournament_name}")
-                imported = import_players_for_tournament(tournament_name, db, loader, name_to_url_mapping)
+                try:
+                    imported = import_players_for_tournament(tournament_name, db, loader, name_to_url_mapping)
+                except CargoQueryError as e:
+                    print(f"❌ Query failed for {tournament_name}: {e}")
+                    failed.append(tournament_name)
+                    continue
                 total_imported += imported
 
             print(f"\n{'='*80}")
             print(f"TOTAL PLAYERS IMPORTED: {total_imported}")
+            if failed:
+                print(f"FAILED TOURNAMENTS ({len(failed)}, re-run to retry):")
+                for tournament_name in failed:
+                    print(f"  - {tournament_name}")
             print(f"{'='*80}")
         else:
             # Import single tournament
-            total_imported = import_players_for_tournament(args.tournament, db, loader, name_to_url_mapping)
+            try:
+                total_imported = import_players_for_tournament(args.tournament, db, loader, name_to_url_mapping)
+            except CargoQueryError as e:
+                print(f"❌ Query failed for {args.tournament}: {e}")
+                return 1
 
         return 0
 
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """
 MAJOR REGIONS TOURNAMENT DISCOVERY - MatchSchedule Edition
-Testet Major Region Turniere (LPL, LCK, LEC, LCS) + Internationale Turniere
+Findet Major Region Turniere (LPL, LCK, LEC, LCS) + Internationale Turniere
+
+Statt jede generierte Turnier-URL einzeln abzufragen, werden alle Seiten der
+Ligen mit wenigen aggregierten MatchSchedule-Abfragen (GROUP BY OverviewPage)
+gefunden - inklusive Turniere, die in der Liste fehlen
+(core/tournament_discovery.py). Die Liste liefert Namen und erwartete Seiten.
 
 WICHTIG: Verwendet SPACES in URLs (nicht Underscores)!
 Beispiel: "LEC/2024 Season/Spring Season" (nicht "LEC/2024_Season/Spring_Season")
@@ -9,61 +14,20 @@ Beispiel: "LEC/2024 Season/Spring Season" (nicht "LEC/2024_Season/Spring_Season"
 
 import os
 import sys
-import json
-import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.leaguepedia_loader import LeaguepediaLoader
-
-def test_tournament(loader, name, url_with_underscores):
-    """
-    Test if tournament exists in MatchSchedule table
-
-    Args:
-        loader: LeaguepediaLoader instance
-        name: Tournament display name
-        url_with_underscores: URL with underscores (will be converted to spaces)
-
-    Returns:
-        dict: Result with name, url, found status, match count
-    """
-    # Convert underscores to spaces for MatchSchedule
-    url = url_with_underscores.replace('_', ' ')
-
-    try:
-        matches = loader._query_cargo(
-            tables="MatchSchedule",
-            fields="Team1,Team2",
-            where=f"OverviewPage='{url}'",
-            limit=5
-        )
+from core.leaguepedia_loader import CargoQueryError, LeaguepediaLoader
+from core.tournament_discovery import TournamentDiscovery, print_results, save_results
 
-        if matches and len(matches) > 0:
-            print(f"✅ {name:70} {len(matches)} matches (sample)")
-            return {
-                'name': name,
-                'url': url,  # Save with SPACES
-                'found': True,
-                'sample_matches': len(matches)
-            }
-        else:
-            print(f"❌ {name:70} NOT FOUND")
-            return {
-                'name': name,
-                'url': url,
-                'found': False
-            }
-
-    except Exception as e:
-        print(f"❌ {name:70} ERROR: {e}")
-        return {
-            'name': name,
-            'url': url,
-            'found': False,
-            'error': str(e)
-        }
+# Leagues the tournament list does not cover yet (matched as OverviewPage LIKE patterns)
+EXTRA_PATTERNS = [
+    "LTA/%",
+    "LTA North/%",
+    "LTA South/%",
+    "%First Stand%",
+]
 
 def generate_all_tournaments():
     """
@@ -333,7 +297,7 @@ def generate_all_tournaments():
 
     return tournaments
 
-def main():
+def main(start_year: int = None, end_year: int = None):
     """Main discovery function"""
 
     bot_username = os.getenv("LEAGUEPEDIA_BOT_USERNAME", "Ekwo98@Elo")
@@ -351,57 +315,33 @@ def main():
     print("Generating major region tournament list...")
 
     all_tournaments = generate_all_tournaments()
-    print(f"📋 Testing {len(all_tournaments)} major region tournaments\n")
-
-    found_tournaments = []
-    not_found_tournaments = []
-
-    start_time = time.time()
-
-    for i, (name, url) in enumerate(all_tournaments, 1):
-        result = test_tournament(loader, name, url)
-
-        if result['found']:
-            found_tournaments.append(result)
-        else:
-            not_found_tournaments.append(result)
-
-        # Progress update every 50 tournaments
-        if i % 50 == 0:
-            elapsed = time.time() - start_time
-            avg_time = elapsed / i
-            remaining = (len(all_tournaments) - i) * avg_time
-            print(f"\n⏱️  Progress: {i}/{len(all_tournaments)} | Found: {len(found_tournaments)} | Remaining: {remaining/60:.1f}m\n")
-
-    elapsed_total = time.time() - start_time
-
-    # Save results
-    results = {
-        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
-        'duration_seconds': elapsed_total,
-        'total_tested': len(all_tournaments),
-        'total_found': len(found_tournaments),
-        'total_not_found': len(not_found_tournaments),
-        'success_rate': len(found_tournaments) / len(all_tournaments) * 100,
-        'found_tournaments': found_tournaments,
-        'not_found_tournaments': not_found_tournaments
-    }
+    print(f"📋 Discovering tournaments of {len(all_tournaments)} listed major region tournaments' leagues\n")
 
-    output_file = Path(__file__).parent / "major_regions_discovery_results.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    try:
+        results = TournamentDiscovery(loader).discover(
+            all_tournaments,
+            extra_patterns=EXTRA_PATTERNS,
+            start_year=start_year,
+            end_year=end_year
+        )
+    except CargoQueryError as e:
+        print(f"❌ Discovery query failed: {e}")
+        return 1
+    finally:
+        loader.close()
 
-    print("\n" + "=" * 80)
-    print("DISCOVERY COMPLETE")
-    print("=" * 80)
-    print(f"Time elapsed: {elapsed_total/60:.1f} minutes")
-    print(f"\nTotal tested:   {len(all_tournaments)}")
-    print(f"Found:          {len(found_tournaments)}")
-    print(f"Not Found:      {len(not_found_tournaments)}")
-    print(f"Success rate:   {len(found_tournaments)/len(all_tournaments)*100:.1f}%")
-    print(f"\n📄 Results saved to: {output_file}")
+    output_file = Path(__file__).parent / "major_regions_discovery_results.json"
+    save_results(results, output_file)
+    print_results(results, output_file)
 
     return 0
 
 if __name__ == "__main__":
-    exit(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Discover major region tournaments with match data')
+    parser.add_argument('--start-year', type=int, help='First season year')
+    parser.add_argument('--end-year', type=int, help='Last season year')
+    args = parser.parse_args()
+
+    exit(main(start_year=args.start_year, end_year=args.end_year))
@@ -3,41 +3,25 @@
 MINOR REGIONS TOURNAMENT DISCOVERY - MatchSchedule Edition
 Basierend auf Leaguepedia Turnierdaten
 
+Alle Seiten der Ligen werden mit wenigen aggregierten MatchSchedule-Abfragen
+(GROUP BY OverviewPage) gefunden, statt jede URL einzeln zu testen
+(core/tournament_discovery.py). Ergebnis im selben Format wie die Major-Discovery.
+
 WICHTIG: Verwendet SPACES in URLs (nicht Underscores)!
 """
 
-import os
 import sys
-import json
-import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.leaguepedia_loader import LeaguepediaLoader
-
-def test_tournament(loader, name, url_with_underscores):
-    """Test if tournament exists in MatchSchedule table"""
-    url = url_with_underscores.replace('_', ' ')
-
-    try:
-        matches = loader._query_cargo(
-            tables="MatchSchedule",
-            fields="Team1,Team2",
-            where=f"OverviewPage='{url}'",
-            limit=5
-        )
+from core.leaguepedia_loader import CargoQueryError, LeaguepediaLoader
+from core.tournament_discovery import TournamentDiscovery, print_results, save_results
 
-        if matches and len(matches) > 0:
-            print(f"✅ {name:70} {len(matches)} matches")
-            return {'name': name, 'url': url, 'found': True, 'sample_matches': len(matches)}
-        else:
-            print(f"❌ {name:70} NOT FOUND")
-            return {'name': name, 'url': url, 'found': False}
-
-    except Exception as e:
-        print(f"❌ {name:70} ERROR: {e}")
-        return {'name': name, 'url': url, 'found': False, 'error': str(e)}
+# Leagues the tournament list does not cover yet (matched as OverviewPage LIKE patterns)
+EXTRA_PATTERNS = [
+    "LCP/%",
+]
 
 def generate_all_tournaments():
     """
@@ -333,57 +317,44 @@ def generate_all_tournaments():
 
     return tournaments
 
-def main():
-    """Main function to test all tournaments"""
+def main(start_year: int = None, end_year: int = None):
+    """Main function to discover all tournaments"""
     print("=" * 80)
-    print("MINOR REGIONS TOURNAMENT DISCOVERY TEST")
+    print("MINOR REGIONS TOURNAMENT DISCOVERY")
     print("=" * 80)
     print()
 
     loader = LeaguepediaLoader()
     tournaments = generate_all_tournaments()
 
-    print(f"Testing {len(tournaments)} tournaments...")
+    print(f"Discovering tournaments of {len(tournaments)} listed tournaments' leagues...")
     print()
 
-    found_tournaments = []
-    not_found_tournaments = []
-
-    for i, (name, url) in enumerate(tournaments, 1):
-        print(f"[{i}/{len(tournaments)}] ", end="")
-        result = test_tournament(loader, name, url)
-
-        if result['found']:
-            found_tournaments.append(result)
-        else:
-            not_found_tournaments.append(result)
-
-        time.sleep(0.1)
-
-    results = {
-        'found': found_tournaments,
-        'not_found': not_found_tournaments,
-        'summary': {
-            'total': len(tournaments),
-            'found': len(found_tournaments),
-            'not_found': len(not_found_tournaments),
-            'success_rate': (len(found_tournaments) / len(tournaments)) * 100
-        }
-    }
+    try:
+        results = TournamentDiscovery(loader).discover(
+            tournaments,
+            extra_patterns=EXTRA_PATTERNS,
+            start_year=start_year,
+            end_year=end_year
+        )
+    except CargoQueryError as e:
+        print(f"❌ Discovery query failed: {e}")
+        return 1
+    finally:
+        loader.close()
 
     output_file = Path(__file__).parent / 'minor_regions_discovery_results.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    save_results(results, output_file)
+    print_results(results, output_file)
 
-    print()
-    print("=" * 80)
-    print("SUMMARY")
-    print("=" * 80)
-    print(f"Total: {len(tournaments)}")
-    print(f"✅ Found: {len(found_tournaments)} ({(len(found_tournaments)/len(tournaments)*100):.1f}%)")
-    print(f"❌ Not found: {len(not_found_tournaments)} ({(len(not_found_tournaments)/len(tournaments)*100):.1f}%)")
-    print()
-    print(f"Results saved to: {output_file}")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Discover minor region tournaments with match data')
+    parser.add_argument('--start-year', type=int, help='First season year')
+    parser.add_argument('--end-year', type=int, help='Last season year')
+    args = parser.parse_args()
+
+    exit(main(start_year=args.start_year, end_year=args.end_year))
@@ -0,0 +1,66 @@
+"""
+Archive Seasons - Seal closed seasons into read-only archive databases
+
+Usage:
+    python scripts/archive_seasons.py --list
+    python scripts/archive_seasons.py --season 2019
+    python scripts/archive_seasons.py --until 2022
+"""
+
+import sys
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import DatabaseManager
+
+
+def list_partitions(db: DatabaseManager):
+    """Print sealed archives"""
+    partitions = db.get_partitions()
+
+    print('=' * 70)
+    print('SEASON ARCHIVES')
+    print('=' * 70)
+
+    if not partitions:
+        print('  No archived seasons')
+        return
+
+    for p in partitions:
+        status = '' if p['attached'] else '  [MISSING]'
+        print(f"  {p['season']}: {p['match_count']:5d} matches  sealed {p['sealed_at']}  {p['file']}{status}")
+
+
+def archive_until(db: DatabaseManager, last_season: int):
+    """Archive every closed season up to and including last_season"""
+    archived = {p['season'] for p in db.get_partitions()}
+    seasons = sorted(
+        int(entry['key']) for entry in db.get_summary('year')
+        if entry['key'].isdigit() and entry['count'] > 0
+    )
+
+    for season in seasons:
+        if season > last_season or season >= datetime.now().year or season in archived:
+            continue
+        db.archive_season(season)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Seal closed seasons into archive databases')
+    parser.add_argument('--season', type=int, help='Archive a single season')
+    parser.add_argument('--until', type=int, help='Archive all closed seasons up to this year')
+    parser.add_argument('--list', action='store_true', help='List archived seasons')
+
+    args = parser.parse_args()
+
+    with DatabaseManager() as db:
+        if args.season:
+            db.archive_season(args.season)
+        elif args.until:
+            archive_until(db, args.until)
+
+        list_partitions(db)
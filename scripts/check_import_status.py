@@ -19,52 +19,38 @@ def check_status():
     print('LEAGUEPEDIA DATA IMPORT STATUS')
     print('=' * 70)
 
+    # Aggregates come from the materialized stats_summary table
+    stats = db.get_stats()
+
     # Total matches
-    cursor.execute('SELECT COUNT(*) FROM matches')
-    total = cursor.fetchone()[0]
+    total = stats['total_matches']
     print(f'\n📊 Total Matches: {total}')
 
     # Matches by year
     print('\n' + '=' * 70)
     print('Matches by Year:')
     print('=' * 70)
-    cursor.execute('''
-        SELECT strftime('%Y', date) as year, COUNT(*) as count
-        FROM matches
-        GROUP BY year
-        ORDER BY year DESC
-    ''')
-
-    for row in cursor.fetchall():
-        year = row[0] if row[0] else 'Unknown'
-        count = row[1]
+    years = sorted(db.get_summary('year'), key=lambda entry: entry['key'], reverse=True)
+
+    for entry in years:
+        if entry['count'] == 0:
+            continue
+        count = entry['count']
         bar = '█' * (count // 50)  # Simple bar chart
-        print(f'  {year}: {count:4d} matches {bar}')
+        print(f"  {entry['key']}: {count:4d} matches {bar}")
 
     # Matches by tournament
     print('\n' + '=' * 70)
     print('Matches by Tournament:')
     print('=' * 70)
-    cursor.execute('''
-        SELECT t.name, COUNT(m.id) as count
-        FROM matches m
-        LEFT JOIN tournaments t ON m.tournament_id = t.id
-        GROUP BY t.name
-        ORDER BY count DESC
-        LIMIT 20
-    ''')
-
-    for row in cursor.fetchall():
-        tournament = row[0] if row[0] else 'Unknown'
-        count = row[1]
-        print(f'  {tournament:40s}: {count:4d} matches')
+    for entry in db.get_summary('tournament')[:20]:
+        print(f"  {entry['key']:40s}: {entry['count']:4d} matches ({entry['team_count']} teams)")
 
     # Teams in database
     print('\n' + '=' * 70)
     print('Unique Teams:')
     print('=' * 70)
-    cursor.execute('SELECT COUNT(*) FROM teams')
-    team_count = cursor.fetchone()[0]
+    team_count = stats['total_teams']
     print(f'  Total unique teams: {team_count}')
 
     # Sample teams
@@ -80,10 +66,10 @@ def check_status():
     print('\n' + '=' * 70)
     print('Date Range:')
     print('=' * 70)
-    cursor.execute('SELECT MIN(date), MAX(date) FROM matches')
-    min_date, max_date = cursor.fetchone()
+    min_date, max_date = stats['date_range']
     print(f'  Earliest match: {min_date}')
     print(f'  Latest match: {max_date}')
+    print(f"  Last import: {stats['last_import_at']}")
 
     print('\n' + '=' * 70)
 
@@ -7,7 +7,7 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.database import DatabaseManager
+from core.database import DatabaseManager, date_to_epoch, SECONDS_PER_DAY
 from core.data_loader import MatchDataLoader
 from datetime import datetime
 
@@ -90,6 +90,8 @@ def analyze_duplicates():
             print(f"     Score: {dup['score']}")
 
             # Check what's in database
+            date_ts = date_to_epoch(dup['date'])
+            day_start = date_ts - date_ts % SECONDS_PER_DAY if date_ts is not None else 0
             cursor = db.conn.cursor()
             cursor.execute("""
                 SELECT m.id, m.date, m.team1_score, m.team2_score, m.source,
@@ -98,8 +100,8 @@ def analyze_duplicates():
                 JOIN teams t1 ON m.team1_id = t1.id
                 JOIN teams t2 ON m.team2_id = t2.id
                 WHERE (t1.name = ? AND t2.name = ? OR t1.name = ? AND t2.name = ?)
-                  AND DATE(m.date) = DATE(?)
-            """, (dup['team1'], dup['team2'], dup['team2'], dup['team1'], dup['date']))
+                  AND m.date_ts >= ? AND m.date_ts < ?
+            """, (dup['team1'], dup['team2'], dup['team2'], dup['team1'], day_start, day_start + SECONDS_PER_DAY))
 
             existing = cursor.fetchall()
             if existing:
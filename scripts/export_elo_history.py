@@ -14,7 +14,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.database import DatabaseManager
 from core.elo_calculator_service import EloCalculatorService
-from variants.with_dynamic_offsets import DynamicOffsetElo
 
 
 def export_elo_history(variant='dynamic_offset', k_factor=24, use_scale_factors=True,
@@ -33,96 +32,91 @@ def export_elo_history(variant='dynamic_offset', k_factor=24, use_scale_factors=
     print("ELO MATCH HISTORY EXPORT")
     print("="*70)
 
-    # Initialize
-    db = DatabaseManager()
+    # Initialize (reads from an in-memory copy, writes still go to the file)
+    db = DatabaseManager(replica='memory')
 
     # Get all matches
     print(f"\n[LOADING] Loading matches...")
     matches = db.get_all_matches(limit=None)
     print(f"[OK] Loaded {len(matches)} matches")
 
-    # Initialize ELO calculator
+    # Initialize ELO calculator (same variant classes as the rating service)
     print(f"\n[CALCULATING] Calculating ELO ratings ({variant})...")
 
-    if variant == 'dynamic_offset':
-        elo = DynamicOffsetElo(
-            k_factor=k_factor,
-            initial_elo=1500,
-            use_scale_factors=use_scale_factors
-        )
-    else:
-        # Use service for other variants
-        service = EloCalculatorService(db)
-        config_id, team_ratings = service.calculate_or_load_elos(
-            variant=variant,
-            k_factor=k_factor,
-            use_scale_factors=use_scale_factors
-        )
+    config = EloCalculatorService.build_config(
+        variant=variant,
+        k_factor=k_factor,
+        use_scale_factors=use_scale_factors
+    )
+    elo = EloCalculatorService.create_calculator(config)
 
     # Build match history with ELO values
     history_data = []
 
-    # Track ELO for manual calculation if using DynamicOffsetElo
-    if variant == 'dynamic_offset':
-        for i, match in enumerate(matches, 1):
-            team1 = match['team1_name']
-            team2 = match['team2_name']
-            score1 = match['team1_score']
-            score2 = match['team2_score']
-
-            # Get ELO BEFORE match
-            team1_elo_before = elo.get_rating(team1)
-            team2_elo_before = elo.get_rating(team2)
-
-            # Calculate expected win probability
-            prob_team1_wins = 1 / (1 + 10 ** ((team2_elo_before - team1_elo_before) / 400))
-            prob_team2_wins = 1 - prob_team1_wins
-
-            # Update ratings
+    for i, match in enumerate(matches, 1):
+        team1 = match['team1_name']
+        team2 = match['team2_name']
+        score1 = match['team1_score']
+        score2 = match['team2_score']
+
+        # Get ELO BEFORE match
+        team1_elo_before = elo.get_rating(team1)
+        team2_elo_before = elo.get_rating(team2)
+
+        # Calculate expected win probability
+        prob_team1_wins = 1 / (1 + 10 ** ((team2_elo_before - team1_elo_before) / 400))
+        prob_team2_wins = 1 - prob_team1_wins
+
+        # Update ratings
+        if variant == 'tournament_context':
+            elo.update_ratings(team1, team2, score1, score2,
+                               tournament=match.get('tournament'),
+                               stage=match.get('stage'))
+        else:
             elo.update_ratings(team1, team2, score1, score2)
 
-            # Get ELO AFTER match
-            team1_elo_after = elo.get_rating(team1)
-            team2_elo_after = elo.get_rating(team2)
-
-            # Calculate deltas
-            delta1 = team1_elo_after - team1_elo_before
-            delta2 = team2_elo_after - team2_elo_before
-
-            # Determine winner
-            if score1 > score2:
-                winner = team1
-                loser = team2
-            else:
-                winner = team2
-                loser = team1
-
-            # Build row
-            row = {
-                'Match #': i,
-                'Date': match['date'],
-                'Team 1': team1,
-                'Team 2': team2,
-                'Score': f"{score1}-{score2}",
-                'Winner': winner,
-                'Tournament': match.get('tournament', match.get('stage', 'Unknown')),
-                'Stage': match.get('stage', ''),
-                'Team 1 ELO Before': round(team1_elo_before, 1),
-                'Team 2 ELO Before': round(team2_elo_before, 1),
-                'Team 1 Win Probability': f"{prob_team1_wins*100:.1f}%",
-                'Team 2 Win Probability': f"{prob_team2_wins*100:.1f}%",
-                'Team 1 ELO Change': f"{delta1:+.1f}" if delta1 else "0.0",
-                'Team 2 ELO Change': f"{delta2:+.1f}" if delta2 else "0.0",
-                'Team 1 ELO After': round(team1_elo_after, 1),
-                'Team 2 ELO After': round(team2_elo_after, 1),
-                'Patch': match.get('patch', ''),
-                'Source': match.get('source', '')
-            }
-
-            history_data.append(row)
-
-            if i % 100 == 0:
-                print(f"  Processed {i}/{len(matches)} matches...")
+        # Get ELO AFTER match
+        team1_elo_after = elo.get_rating(team1)
+        team2_elo_after = elo.get_rating(team2)
+
+        # Calculate deltas
+        delta1 = team1_elo_after - team1_elo_before
+        delta2 = team2_elo_after - team2_elo_before
+
+        # Determine winner
+        if score1 > score2:
+            winner = team1
+            loser = team2
+        else:
+            winner = team2
+            loser = team1
+
+        # Build row
+        row = {
+            'Match #': i,
+            'Date': match['date'],
+            'Team 1': team1,
+            'Team 2': team2,
+            'Score': f"{score1}-{score2}",
+            'Winner': winner,
+            'Tournament': match.get('tournament', match.get('stage', 'Unknown')),
+            'Stage': match.get('stage', ''),
+            'Team 1 ELO Before': round(team1_elo_before, 1),
+            'Team 2 ELO Before': round(team2_elo_before, 1),
+            'Team 1 Win Probability': f"{prob_team1_wins*100:.1f}%",
+            'Team 2 Win Probability': f"{prob_team2_wins*100:.1f}%",
+            'Team 1 ELO Change': f"{delta1:+.1f}" if delta1 else "0.0",
+            'Team 2 ELO Change': f"{delta2:+.1f}" if delta2 else "0.0",
+            'Team 1 ELO After': round(team1_elo_after, 1),
+            'Team 2 ELO After': round(team2_elo_after, 1),
+            'Patch': match.get('patch', ''),
+            'Source': match.get('source', '')
+        }
+
+        history_data.append(row)
+
+        if i % 100 == 0:
+            print(f"  Processed {i}/{len(matches)} matches...")
 
     print(f"\n[OK] Calculated ELO for {len(history_data)} matches")
 
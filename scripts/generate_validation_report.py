@@ -43,7 +43,7 @@ def generate_comprehensive_report(output_file: str = "reports/validation_report.
     print("LOADING DATA")
     print("="*70)
 
-    with UnifiedDataLoader() as loader:
+    with UnifiedDataLoader(use_store=True) as loader:
         df = loader.load_matches(source='auto')
         source_info = loader.get_source_info()
 
@@ -12,36 +12,70 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.leaguepedia_loader import LeaguepediaLoader
 from core.database import DatabaseManager
+from core.import_ledger import ImportLedger
+from core.job_runner import enqueue_warmup
+
+
+LEDGER_SOURCE = 'league_season'
 
 
 def print_status():
     """Print current database status"""
     db = DatabaseManager()
-    cursor = db.conn.cursor()
 
-    cursor.execute('SELECT COUNT(*) FROM matches')
-    total = cursor.fetchone()[0]
-
-    cursor.execute('''
-        SELECT strftime('%Y', date) as year, COUNT(*) as count
-        FROM matches
-        GROUP BY year
-        ORDER BY year DESC
-    ''')
+    total = db.get_stats()['total_matches']
+    years = sorted(db.get_summary('year'), key=lambda entry: entry['key'], reverse=True)
 
     print('\n' + '=' * 70)
     print(f'DATABASE STATUS: {total} total matches')
     print('=' * 70)
     print('\nMatches per year:')
-    for row in cursor.fetchall():
-        year = row[0] if row[0] else 'Unknown'
-        count = row[1]
-        print(f'  {year}: {count:4d} matches')
+    for entry in years:
+        if entry['count'] > 0:
+            print(f"  {entry['key']}: {entry['count']:4d} matches")
     print('=' * 70)
 
 
-def import_all_data():
-    """Import all historical data from 2013-2025"""
+def import_season(loader, ledger: ImportLedger, league: str, year: int, split: str,
+                  include_playoffs: bool, recheck: bool = False) -> int:
+    """
+    Import one league season with an import ledger checkpoint
+
+    Seasons completed after they ended are skipped; a query that gives up
+    (rate limit, API error) is recorded as failed and retried next run.
+
+    Returns:
+        Number of matches imported
+    """
+    key = f"{league}/{year}/{split}"
+    if not ledger.should_import(LEDGER_SOURCE, key, recheck=recheck):
+        print(f'  ⏭ Already imported (import ledger)')
+        return 0
+
+    try:
+        imported = loader.import_league_season(
+            league=league,
+            year=year,
+            split=split,
+            include_playoffs=include_playoffs,
+            include_players=False,  # Skip players for speed
+            raise_errors=True
+        )
+    except Exception as e:
+        ledger.record(LEDGER_SOURCE, key, 'failed', name=key, error=str(e))
+        raise
+
+    ledger.record(LEDGER_SOURCE, key, 'done', name=key, rows_inserted=imported)
+    return imported
+
+
+def import_all_data(recheck: bool = False):
+    """
+    Import all historical data from 2013-2025
+
+    Args:
+        recheck: Re-import seasons the import ledger marks as complete
+    """
 
     print('=' * 70)
     print('COMPLETE HISTORICAL DATA IMPORT: 2013-2025')
@@ -63,6 +97,7 @@ def import_all_data():
 
     # Initialize loader
     loader = LeaguepediaLoader()
+    ledger = ImportLedger(loader.db)
     print()
 
     if not loader.authenticated:
@@ -104,13 +139,8 @@ def import_all_data():
                 try:
                     print(f'\n  {league} {year} {split}')
 
-                    imported = loader.import_league_season(
-                        league=league,
-                        year=year,
-                        split=split,
-                        include_playoffs=True,
-                        include_players=False  # Skip players for speed
-                    )
+                    imported = import_season(loader, ledger, league, year, split,
+                                             include_playoffs=True, recheck=recheck)
 
                     total_imported += imported
 
@@ -138,13 +168,9 @@ def import_all_data():
                 try:
                     print(f'\n  {tournament} {year}')
 
-                    imported = loader.import_league_season(
-                        league=tournament,
-                        year=year,
-                        split=split,
-                        include_playoffs=False,  # International tournaments don't have separate playoffs
-                        include_players=False
-                    )
+                    # International tournaments don't have separate playoffs
+                    imported = import_season(loader, ledger, tournament, year, split,
+                                             include_playoffs=False, recheck=recheck)
 
                     total_imported += imported
 
@@ -164,12 +190,24 @@ def import_all_data():
     print('IMPORT COMPLETE!')
     print('=' * 70)
     print(f'Total imported: {total_imported} matches')
+    print(f'Import ledger: {ledger.summary(LEDGER_SOURCE)}')
     print(f'Time elapsed: {elapsed}')
     print('=' * 70)
 
     # Print final status
     print_status()
 
+    # Precompute the popular ELO configs for the dashboard
+    if total_imported > 0:
+        enqueue_warmup(loader.db)
+
 
 if __name__ == "__main__":
-    import_all_data()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Import all historical Tier 1 data (resumable)')
+    parser.add_argument('--recheck', action='store_true',
+                        help='Re-import seasons already complete in the import ledger')
+
+    args = parser.parse_args()
+    import_all_data(recheck=args.recheck)
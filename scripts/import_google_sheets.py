@@ -11,6 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.database import DatabaseManager
 from core.data_loader import MatchDataLoader
+from core.rating_cache import invalidate_rating_cache
+from core.job_runner import enqueue_warmup
 from datetime import datetime
 
 
@@ -87,6 +89,10 @@ def import_google_sheets_to_db():
         if error_count > 0:
             print(f"[ERROR] Errors: {error_count} matches")
 
+        if imported_count > 0:
+            invalidate_rating_cache(db.db_path)
+            enqueue_warmup(db)
+
         # Database stats
         stats = db.get_stats()
         print(f"\nDatabase Stats:")
@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.database import DatabaseManager
 from core.leaguepedia_loader import LeaguepediaLoader
+from core.job_runner import enqueue_warmup
 
 
 def import_tier1_historical_data(start_year: int = 2013,
@@ -137,6 +138,10 @@ def import_tier1_historical_data(start_year: int = 2013,
         for source, count in db_stats['by_source'].items():
             print(f"    {source:15s}: {count:5d} matches")
 
+    # Precompute the popular ELO configs for the dashboard
+    if total_stats['total_matches'] > 0:
+        enqueue_warmup(db)
+
     loader.close()
 
     return total_stats
@@ -0,0 +1,148 @@
+"""
+Import Tournaments - Pipelined MatchSchedule import from discovery manifests
+
+Fetching, parsing and writing run in parallel stages (core/import_pipeline.py),
+so the importer is bound by the API rate limit only. Progress is checkpointed
+per tournament in the import ledger - re-running continues after a crash and
+retries failed tournaments only.
+
+Usage:
+    python scripts/import_tournaments.py major_regions_discovery_results.json
+    python scripts/import_tournaments.py major_regions_discovery_results.json minor_regions_discovery_results.json
+    python scripts/import_tournaments.py minor_regions_discovery_results.json --players --skip-year 2025
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import DatabaseManager
+from core.import_pipeline import ImportPipeline, load_manifest, save_import_log
+from core.job_runner import enqueue_warmup
+from core.leaguepedia_loader import LeaguepediaLoader
+from core.rating_cache import invalidate_rating_cache
+from core.team_resolver import TeamResolver
+
+
+def print_summary(stats: dict, elapsed: float):
+    """Print final statistics"""
+    print(f"\n{'='*70}")
+    print("IMPORT COMPLETE")
+    print(f"{'='*70}")
+    print(f"Time elapsed: {elapsed/60:.1f} minutes")
+    print("\nTournaments:")
+    print(f"  Total:       {stats['tournaments_total']}")
+    print(f"  Imported:    {stats['tournaments_imported']}")
+    print(f"  Failed:      {stats['tournaments_failed']}")
+    print(f"  No data:     {stats['tournaments_no_data']}")
+    print(f"  Unchanged:   {stats['tournaments_unchanged']}")
+    print(f"  Skipped:     {stats['tournaments_skipped']} (already complete in import ledger)")
+    print("\nMatches:")
+    print(f"  Found:       {stats['total_matches_found']}")
+    print(f"  Inserted:    {stats['matches_inserted']}")
+    print(f"  Duplicates:  {stats['matches_failed']}")
+    print(f"  Skipped:     {stats['matches_skipped']}")
+    print(f"  Estimated dates: {stats['matches_with_estimated_dates']}")
+    print("\nPlayers:")
+    print(f"  Inserted:    {stats['players_inserted']}")
+
+
+def import_manifests(manifests: list, db_path: str = "db/elo_system.db", include_players: bool = False,
+                     skip_years: list = None, parse_workers: int = 2, log_file: str = None,
+                     group_queries: bool = True, recheck: bool = False,
+                     bot_username: str = None, bot_password: str = None) -> dict:
+    """
+    Import all tournaments of one or more discovery manifests
+
+    Args:
+        manifests: Paths of *_discovery_results.json files
+        db_path: Database file
+        include_players: Also import ScoreboardPlayers
+        skip_years: Skip tournaments whose name contains one of these years
+        parse_workers: Parse/resolve threads
+        log_file: Write an import log JSON here (optional)
+        group_queries: Fetch small tournaments together (OverviewPage IN (...))
+        recheck: Re-fetch tournaments the import ledger marks as complete
+        bot_username: Leaguepedia bot username (default: LEAGUEPEDIA_BOT_USERNAME)
+        bot_password: Leaguepedia bot password (default: LEAGUEPEDIA_BOT_PASSWORD)
+
+    Returns:
+        Statistics dict
+    """
+    tournaments = []
+    seen = set()
+    for manifest in manifests:
+        for tournament in load_manifest(manifest):
+            if tournament['url'] in seen:
+                continue
+            if skip_years and any(str(year) in tournament['name'] for year in skip_years):
+                continue
+            seen.add(tournament['url'])
+            tournaments.append(tournament)
+
+    print(f"[INFO] {len(tournaments)} tournaments from {len(manifests)} manifest(s)")
+
+    db = DatabaseManager(db_path)
+    loader = LeaguepediaLoader(db=db, bot_username=bot_username, bot_password=bot_password)
+
+    try:
+        pipeline = ImportPipeline(
+            loader,
+            team_resolver=TeamResolver(),
+            parse_workers=parse_workers,
+            include_players=include_players,
+            group_queries=group_queries,
+            recheck=recheck
+        )
+
+        start = time.time()
+        stats = pipeline.run(tournaments)
+        elapsed = time.time() - start
+
+        print_summary(stats, elapsed)
+        pipeline.print_metrics()
+
+        if log_file:
+            save_import_log(stats, elapsed, log_file)
+            print(f"\n[OK] Import log saved to: {log_file}")
+
+        # The writer used its own connection - drop results computed before the import
+        if stats['matches_inserted'] > 0:
+            invalidate_rating_cache(db.db_path)
+            enqueue_warmup(db)
+
+        return stats
+
+    finally:
+        loader.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pipelined tournament import from discovery manifests')
+    parser.add_argument('manifests', nargs='+', help='*_discovery_results.json files')
+    parser.add_argument('--players', action='store_true', help='Also import player data (ScoreboardPlayers)')
+    parser.add_argument('--skip-year', type=int, action='append', default=[],
+                        help='Skip tournaments of this year (repeatable)')
+    parser.add_argument('--workers', type=int, default=2, help='Parse/resolve threads')
+    parser.add_argument('--no-grouping', action='store_true', help='One query per tournament')
+    parser.add_argument('--recheck', action='store_true',
+                        help='Re-fetch tournaments already complete in the import ledger')
+    parser.add_argument('--log', type=str, help='Write an import log JSON file')
+    parser.add_argument('--db', type=str, default='db/elo_system.db', help='Database file')
+
+    args = parser.parse_args()
+
+    import_manifests(
+        args.manifests,
+        db_path=args.db,
+        include_players=args.players,
+        skip_years=args.skip_year,
+        parse_workers=args.workers,
+        log_file=args.log,
+        group_queries=not args.no_grouping,
+        recheck=args.recheck
+    )
@@ -0,0 +1,82 @@
+"""
+Run Jobs - Standalone worker for the background job queue (core/job_runner.py)
+
+Usage:
+    python scripts/run_jobs.py                 # work the queue until Ctrl+C
+    python scripts/run_jobs.py --once          # run queued jobs, then exit
+    python scripts/run_jobs.py --list          # show recent jobs
+    python scripts/run_jobs.py --elo tournament_context 24   # enqueue a recompute
+    python scripts/run_jobs.py --warmup --once # precompute popular configs now
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import DatabaseManager
+from core.job_runner import JobQueue, enqueue_warmup, start_workers
+
+
+def list_jobs(queue: JobQueue, limit: int = 20):
+    """Print recent jobs"""
+    jobs = queue.list(limit=limit)
+
+    print('=' * 70)
+    print('JOBS')
+    print('=' * 70)
+
+    if not jobs:
+        print('  No jobs')
+        return
+
+    for job in jobs:
+        label = job['params'].get('script') or job['params'].get('variant') or job['kind']
+        print(f"  #{job['id']:<5d} {job['kind']:12s} {job['status']:10s} "
+              f"{job['progress']:4.0%}  {label}  ({job['created_at']})")
+        if job['status'] == 'failed' and job['error']:
+            print(f"         {job['error'].splitlines()[0]}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run background jobs')
+    parser.add_argument('--once', action='store_true', help='Run queued jobs and exit')
+    parser.add_argument('--list', action='store_true', help='List recent jobs')
+    parser.add_argument('--workers', type=int, default=2, help='Worker threads')
+    parser.add_argument('--elo', nargs=2, metavar=('VARIANT', 'K'), help='Enqueue an ELO recompute')
+    parser.add_argument('--warmup', action='store_true', help='Enqueue the post-import warm-up')
+    parser.add_argument('--db', type=str, default='db/elo_system.db', help='Database file')
+
+    args = parser.parse_args()
+
+    with DatabaseManager(args.db) as db:
+        queue = JobQueue(db)
+
+        if args.elo:
+            # Same params as the dashboard, so identical requests share one job
+            k_factor = float(args.elo[1])
+            if k_factor.is_integer():
+                k_factor = int(k_factor)
+            job_id = queue.enqueue('elo_config', {'variant': args.elo[0], 'k_factor': k_factor})
+            print(f"[OK] Enqueued job #{job_id}")
+
+        if args.warmup:
+            enqueue_warmup(db)
+
+        if args.list:
+            list_jobs(queue)
+        elif args.once:
+            queue.fail_stale()
+            count = queue.run_pending()
+            print(f"[OK] Ran {count} jobs")
+        else:
+            workers = start_workers(args.db, args.workers)
+            print(f"[OK] {len(workers)} workers running (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                print("\n[OK] Stopping")
@@ -0,0 +1,98 @@
+"""
+Sync Leaguepedia - Incremental "since last sync" match update
+
+Fetches only matches played since the last sync across all tracked leagues
+(a few paged queries), upserts new matches and corrected results, and
+queues the rating warm-up, which recalculates incrementally from the
+earliest changed match (core/leaguepedia_sync.py).
+
+Usage:
+    python scripts/sync_leaguepedia.py
+    python scripts/sync_leaguepedia.py --since 2026-01-10
+    python scripts/sync_leaguepedia.py --league "LCK/%" --league "%Mid-Season Invitational%"
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import DatabaseManager
+from core.job_runner import enqueue_warmup
+from core.leaguepedia_loader import LeaguepediaLoader
+from core.leaguepedia_sync import LeaguepediaSync
+from core.rating_cache import invalidate_rating_cache
+from core.team_resolver import TeamResolver
+
+
+def sync(db_path: str = "db/elo_system.db", since: datetime = None, leagues: list = None,
+         lookback_days: int = LeaguepediaSync.LOOKBACK_DAYS, dry_run: bool = False) -> dict:
+    """
+    Run one incremental sync
+
+    Args:
+        db_path: Database file
+        since: Fetch matches from this date (default: watermark - lookback)
+        leagues: OverviewPage LIKE patterns (default: tracked leagues)
+        lookback_days: Days before the watermark to fetch again
+        dry_run: Fetch and parse only
+
+    Returns:
+        Statistics dict
+    """
+    db = DatabaseManager(db_path)
+    loader = LeaguepediaLoader(db=db)
+
+    try:
+        start = time.time()
+        stats = LeaguepediaSync(loader, db, team_resolver=TeamResolver(), leagues=leagues,
+                                lookback_days=lookback_days).run(since=since, dry_run=dry_run)
+        elapsed = time.time() - start
+
+        print(f"\n{'='*70}")
+        print("SYNC COMPLETE" if not stats['error'] else "SYNC FAILED")
+        print(f"{'='*70}")
+        print(f"Time elapsed:  {elapsed:.1f}s ({stats['requests']} API requests)")
+        print(f"Since:         {stats['since']} UTC")
+        print(f"Fetched:       {stats['fetched']} matches in {stats['tournaments']} tournaments")
+        print(f"Inserted:      {stats['inserted']}")
+        print(f"Updated:       {stats['updated']}")
+        print(f"Unchanged:     {stats['unchanged']}")
+        print(f"Skipped:       {stats['skipped']}")
+        print(f"Watermark:     {stats['watermark']}")
+
+        # Ratings refresh incrementally from the earliest changed match
+        if stats['inserted'] or stats['updated']:
+            invalidate_rating_cache(db.db_path)
+            enqueue_warmup(db)
+
+        return stats
+
+    finally:
+        loader.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Incremental Leaguepedia match sync')
+    parser.add_argument('--since', type=str, help='Fetch matches from this date (YYYY-MM-DD)')
+    parser.add_argument('--league', action='append', default=[],
+                        help='OverviewPage LIKE pattern to sync, e.g. "LCK/%%" (repeatable)')
+    parser.add_argument('--lookback-days', type=int, default=LeaguepediaSync.LOOKBACK_DAYS,
+                        help='Days before the last sync to fetch again (late results, corrections)')
+    parser.add_argument('--dry-run', action='store_true', help='Fetch and parse, write nothing')
+    parser.add_argument('--db', type=str, default='db/elo_system.db', help='Database file')
+
+    args = parser.parse_args()
+
+    stats = sync(
+        db_path=args.db,
+        since=datetime.strptime(args.since, '%Y-%m-%d') if args.since else None,
+        leagues=args.league or None,
+        lookback_days=args.lookback_days,
+        dry_run=args.dry_run
+    )
+    sys.exit(1 if stats['error'] else 0)
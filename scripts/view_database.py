@@ -36,7 +36,7 @@ def print_stats(db):
 
 def print_recent_matches(db, limit=10):
     """Print recent matches"""
-    matches = db.get_all_matches(limit=limit)
+    matches = db.get_matches_page(limit=limit)['matches']
 
     print(f"\n" + "="*70)
     print(f"RECENT {limit} MATCHES")
@@ -121,14 +121,17 @@ def search_team(db, team_name):
     """Search for a team and show details"""
     cursor = db.conn.cursor()
 
-    # Find team
-    cursor.execute("""
-        SELECT id, name, region, current_elo
-        FROM teams
-        WHERE name LIKE ?
-    """, (f"%{team_name}%",))
+    # Find team (ranked search over names and aliases)
+    team_ids = [r['id'] for r in db.search(team_name, kinds=['team'], limit=10) if r['id']]
 
-    teams = cursor.fetchall()
+    teams = []
+    for team_id in team_ids:
+        cursor.execute("""
+            SELECT id, name, region, current_elo
+            FROM teams
+            WHERE id = ?
+        """, (team_id,))
+        teams.append(cursor.fetchone())
 
     if not teams:
         print(f"\n❌ No teams found matching '{team_name}'")
@@ -145,59 +148,39 @@ def search_team(db, team_name):
         print(f"   Region: {region or 'N/A'}")
         print(f"   Current ELO: {elo:.0f}")
 
-        # Recent matches
-        cursor.execute("""
-            SELECT m.date, m.team1_score, m.team2_score,
-                   t1.name as team1, t2.name as team2, tw.name as winner,
-                   tour.name as tournament, m.stage
-            FROM matches m
-            JOIN teams t1 ON m.team1_id = t1.id
-            JOIN teams t2 ON m.team2_id = t2.id
-            JOIN teams tw ON m.winner_id = tw.id
-            LEFT JOIN tournaments tour ON m.tournament_id = tour.id
-            WHERE t1.id = ? OR t2.id = ?
-            ORDER BY m.date DESC
-            LIMIT 10
-        """, (team_id, team_id))
-
-        matches = cursor.fetchall()
+        # Recent matches (team_matches schedule index)
+        matches = db.get_team_schedule(name, limit=10)
 
         if matches:
             print(f"\n   Recent 10 Matches:")
             for match in matches:
-                date, score1, score2, t1, t2, winner, tournament, stage = match
-                is_team1 = t1 == name
-                opp = t2 if is_team1 else t1
-                result = "W" if winner == name else "L"
-                score = f"{score1}-{score2}" if is_team1 else f"{score2}-{score1}"
-
-                print(f"   {date[:10]} {result} vs {opp:30s} ({score}) - {tournament or 'Unknown'}")
+                print(f"   {match['date'][:10]} {match['result']} vs {match['opponent']:30s} "
+                      f"({match['score']}) - {match['tournament'] or 'Unknown'}")
 
         # Match stats
-        cursor.execute("""
-            SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN winner_id = ? THEN 1 ELSE 0 END) as wins
-            FROM matches
-            WHERE team1_id = ? OR team2_id = ?
-        """, (team_id, team_id, team_id))
-
-        total, wins = cursor.fetchone()
+        record = db.get_record_vs_regions(name)
+        wins = sum(r['wins'] for r in record)
+        total = sum(r['matches'] for r in record)
         win_rate = (wins / total * 100) if total > 0 else 0
 
         print(f"\n   Overall Record: {wins}-{total - wins} ({win_rate:.1f}% win rate)")
+        for r in record:
+            print(f"     vs {r['region']:10s} {r['wins']}-{r['losses']}")
 
 def search_player(db, player_name):
     """Search for a player and show details"""
     cursor = db.conn.cursor()
 
-    cursor.execute("""
-        SELECT id, name, role, current_elo
-        FROM players
-        WHERE name LIKE ?
-    """, (f"%{player_name}%",))
+    player_ids = [r['id'] for r in db.search(player_name, kinds=['player'], limit=10)]
 
-    players = cursor.fetchall()
+    players = []
+    for player_id in player_ids:
+        cursor.execute("""
+            SELECT id, name, role, current_elo
+            FROM players
+            WHERE id = ?
+        """, (player_id,))
+        players.append(cursor.fetchone())
 
     if not players:
         print(f"\n❌ No players found matching '{player_name}'")
@@ -0,0 +1,119 @@
+"""
+Shared fixtures - temporary databases with synthetic matches
+"""
+
+import fnmatch
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.database import DatabaseManager
+from core.rating_cache import RATING_CACHE
+
+
+TEAMS = [f"Team {i}" for i in range(8)]
+
+
+def add_matches(db: DatabaseManager, count: int, start: datetime = datetime(2024, 1, 1),
+                prefix: str = 'm', tournament: str = 'LEC 2024 Spring', seed: int = 1):
+    """Insert count synthetic Bo3 matches, one per day"""
+    rng = random.Random(seed)
+    for i in range(count):
+        team1, team2 = rng.sample(TEAMS, 2)
+        score1, score2 = rng.choice([(2, 0), (2, 1), (1, 2), (0, 2)])
+        db.insert_match(team1, team2, score1, score2, start + timedelta(days=i),
+                        tournament_name=tournament, external_id=f"{prefix}{i}", region='EU')
+
+
+def schedule_rows(page: str, count: int, start: datetime = datetime(2024, 1, 1), prefix: str = None):
+    """MatchSchedule rows of one tournament page, one match per day"""
+    rows = []
+    for i in range(count):
+        rows.append({
+            'OverviewPage': page, 'Team1': TEAMS[i % 4], 'Team2': TEAMS[4 + i % 4],
+            'Team1Score': '2', 'Team2Score': '1', 'Winner': '1',
+            'DateTime UTC': (start + timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S'),
+            'Tab': 'Week 1', 'UniqueMatch': f"{prefix or page}_{i}",
+        })
+    return rows
+
+
+class FakeCargo:
+    """
+    In-memory stand-in for LeaguepediaLoader's Cargo client
+
+    Serves MatchSchedule rows and understands the WHERE clauses the
+    importers build (OverviewPage = / IN / LIKE, DateTime_UTC >=).
+    """
+
+    def __init__(self, rows=None):
+        self.rows = list(rows or [])
+        self.queries = []
+        self.failing = set()          # pages whose queries raise
+        self.db = None
+        self.limiter = None
+
+    def iter_cargo(self, tables, fields, where=None, order_by=None, raise_errors=False, **kwargs):
+        self.queries.append(where)
+        if tables != 'MatchSchedule':
+            return []
+
+        likes = re.findall(r"OverviewPage LIKE '([^']*)'", where or '')
+        pages = {page.lower() for page in re.findall(r"'([^']*)'", re.sub(r"(LIKE|>=) '[^']*'", '', where or ''))}
+        if pages & {page.lower() for page in self.failing}:
+            raise RuntimeError(f"query gave up: {where}")
+
+        since = re.search(r"DateTime_UTC >= '([^']*)'", where or '')
+        return [
+            row for row in sorted(self.rows, key=lambda row: (row['OverviewPage'], row['DateTime UTC']))
+            if (row['OverviewPage'].lower() in pages
+                or any(fnmatch.fnmatchcase(row['OverviewPage'].lower(), like.lower().replace('%', '*'))
+                       for like in likes))
+            and (since is None or row['DateTime UTC'] >= since.group(1))
+        ]
+
+
+def manifest(pages):
+    """Discovery manifest entries of tournament pages"""
+    return [{'name': page.replace('/', ' '), 'url': page, 'sample_matches': 5} for page in pages]
+
+
+def run_pipeline(pipeline, tournaments, timeout=30):
+    """Run an ImportPipeline in a thread so a hang fails the test instead of blocking it"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['stats'] = pipeline.run(tournaments)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline did not finish"
+    return outcome
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Empty database in a temporary directory"""
+    RATING_CACHE.invalidate()
+    database = DatabaseManager(str(tmp_path / 'test.db'))
+    yield database
+    database.close()
+    RATING_CACHE.invalidate()
+
+
+@pytest.fixture
+def match_db(db):
+    """Database with 120 matches"""
+    add_matches(db, 120)
+    return db
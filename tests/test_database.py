@@ -0,0 +1,196 @@
+"""
+Database Manager Tests - stats triggers, archives, upserts, sync state, team form, replicas
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from core.database import DatabaseManager, date_to_epoch
+from core.elo_calculator_service import EloCalculatorService
+
+from tests.conftest import add_matches
+
+
+def _stats(db):
+    """stats_summary rows that rebuild_stats() would produce (no empty buckets)"""
+    return sorted(tuple(row) for row in db.conn.execute("""
+        SELECT scope, key, row_count, team_count, min_date_ts, max_date_ts
+        FROM stats_summary WHERE row_count > 0
+    """))
+
+
+def test_date_to_epoch_missing_values():
+    for value in (None, '', float('nan'), pd.NaT, pd.Timestamp('NaT'), 'Jan 5 2024'):
+        assert date_to_epoch(value) is None
+    assert date_to_epoch(pd.Timestamp('2024-01-01')) == date_to_epoch('2024-01-01 00:00:00') == 1704067200
+
+
+def test_match_updates_keep_stats_exact(db):
+    add_matches(db, 40, start=datetime(2023, 12, 10))
+    add_matches(db, 10, prefix='x', tournament='LCK 2024 Spring', seed=2)
+    lck = db.get_or_create_tournament('LCK 2024 Spring', region='KR')
+
+    with db.batch_writes():
+        # Across a year boundary, the earliest and the latest match
+        db.execute_write("UPDATE matches SET date = '2025-03-01 12:00:00' WHERE external_id = 'm0'")
+        db.execute_write("UPDATE matches SET date_ts = date_ts - 86400 * 400 WHERE external_id = 'm39'")
+        # Into another tournament/region, another source, invalid scores
+        db.execute_write("UPDATE matches SET tournament_id = ? WHERE external_id IN ('m5', 'm6')", (lck,))
+        db.execute_write("UPDATE matches SET source = 'google_sheets' WHERE external_id = 'm7'")
+        db.execute_write("UPDATE matches SET team1_score = -1 WHERE external_id = 'm8'")
+        # Teams replaced: tournament team counts shrink and grow
+        db.execute_write("""
+            UPDATE matches SET team1_id = ?, team2_id = ? WHERE external_id LIKE 'x%'
+        """, (db.get_or_create_team('Newcomer A'), db.get_or_create_team('Newcomer B')))
+    db.upsert_match('Team 1', 'Team 2', 0, 2, datetime(2024, 6, 1), tournament_name='LEC 2024 Spring',
+                    external_id='m10')
+
+    incremental = _stats(db)
+    db.rebuild_stats()
+    assert incremental == _stats(db)
+
+
+
+def test_archive_season_keeps_foreign_keys_enforced(db):
+    add_matches(db, 60, start=datetime(2023, 12, 1))
+
+    assert db.archive_season(2023) == 31
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute_write("""
+            INSERT INTO matches (date, team1_id, team2_id, team1_score, team2_score, winner_id)
+            VALUES ('2024-06-01 00:00:00', 999, 998, 1, 0, 999)
+        """)
+    db.conn.rollback()
+
+    # Full rating snapshots of archived matches are still written
+    service = EloCalculatorService(db, rating_storage='full')
+    config_id, ratings = service.calculate_or_load_elos(variant='base', k_factor=24)
+    stored = db.conn.execute("SELECT COUNT(DISTINCT match_id) FROM elo_ratings WHERE config_id = ?",
+                             (config_id,)).fetchone()[0]
+    assert stored == 60
+    assert db.conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_upsert_match_inserts_updates_and_skips_unchanged(db):
+    date = datetime(2024, 3, 1, 12)
+    match_id, outcome = db.upsert_match('Team 1', 'Team 2', 2, 1, date, tournament_name='LEC 2024 Spring',
+                                        external_id='x1')
+    assert outcome == 'inserted'
+
+    version = db.get_data_version()
+    assert db.upsert_match('Team 1', 'Team 2', 2, 1, date, tournament_name='LEC 2024 Spring',
+                           external_id='x1') == (match_id, 'unchanged')
+    assert db.get_data_version() == version
+
+    # Corrected result: updated in place, winner flipped, change logged
+    assert db.upsert_match('Team 1', 'Team 2', 1, 2, date, tournament_name='LEC 2024 Spring',
+                           external_id='x1') == (match_id, 'updated')
+    row = db.conn.execute("""
+        SELECT t.name, m.team1_score, m.team2_score FROM matches m JOIN teams t ON t.id = m.winner_id
+        WHERE m.id = ?
+    """, (match_id,)).fetchone()
+    assert tuple(row) == ('Team 2', 1, 2)
+    assert db.get_data_version() > version
+    assert db.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 1
+
+
+def test_sync_watermark_roundtrip(db):
+    assert db.get_sync_watermark('leaguepedia_matchschedule') is None
+
+    db.set_sync_watermark('leaguepedia_matchschedule', '2026-03-01 10:00:00')
+    db.set_sync_watermark('leaguepedia_matchschedule', '2026-03-08 18:00:00')
+    db.set_sync_watermark('other', '2025-01-01 00:00:00')
+
+    assert db.get_sync_watermark('leaguepedia_matchschedule') == '2026-03-08 18:00:00'
+    assert db.get_sync_watermark('other') == '2025-01-01 00:00:00'
+
+
+def test_team_forms_match_single_team_form(match_db):
+    teams = [row[0] for row in match_db.conn.execute("SELECT name FROM teams")] + ['Unknown Team']
+    forms = match_db.get_team_forms(teams)
+
+    assert forms['Unknown Team'] == {'form': '', 'wins': 0, 'losses': 0}
+    for team in teams[:-1]:
+        assert forms[team] == match_db.get_team_form(team)
+        assert len(forms[team]['form']) == 5
+
+
+def test_team_matches_skip_unparseable_dates(db):
+    add_matches(db, 3)
+    match_id = db.insert_match('A', 'B', 2, 1, 'Jan 5 2024', external_id='q1')
+    assert match_id is not None
+    assert db.conn.execute("SELECT COUNT(*) FROM team_matches WHERE match_id = ?", (match_id,)).fetchone()[0] == 0
+
+    # Dated later: adjacency rows appear, undated again: they are removed
+    db.execute_write("UPDATE matches SET date = '2024-01-05 00:00:00' WHERE id = ?", (match_id,))
+    assert db.conn.execute("SELECT COUNT(*) FROM team_matches WHERE match_id = ?", (match_id,)).fetchone()[0] == 2
+    db.execute_write("UPDATE matches SET date = 'Jan 5 2024', date_ts = NULL WHERE id = ?", (match_id,))
+    assert db.conn.execute("SELECT COUNT(*) FROM team_matches WHERE match_id = ?", (match_id,)).fetchone()[0] == 0
+    assert db.conn.execute("SELECT COUNT(*) FROM team_matches").fetchone()[0] == 6
+
+
+@pytest.mark.parametrize('newest_first', [True, False])
+def test_matches_page_skips_undated_rows(db, newest_first):
+    add_matches(db, 5)
+    db.insert_match('Team 1', 'Team 2', 2, 1, 'Jan 5 2024', external_id='undated')
+    dated = {row[0] for row in db.conn.execute("SELECT external_id FROM matches WHERE date_ts IS NOT NULL")}
+
+    # Page size 1: the undated row would sit on a page boundary in either direction
+    seen, cursor = [], None
+    for _ in range(10):
+        page = db.get_matches_page(after=cursor, limit=1, newest_first=newest_first)
+        seen.extend(match['external_id'] for match in page['matches'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+        assert cursor[0] is not None
+    assert sorted(seen) == sorted(dated)
+
+
+def test_memory_replica_rejects_direct_writes(db):
+    add_matches(db, 10)
+    replica = DatabaseManager(db.db_path, replica='memory')
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            replica.conn.execute("DELETE FROM matches")
+
+        replica.execute_write("UPDATE teams SET region = 'KR' WHERE name = 'Team 1'")
+        replica.commit()
+        assert replica.conn.execute("SELECT region FROM teams WHERE name = 'Team 1'").fetchone()[0] == 'KR'
+        assert db.conn.execute("SELECT region FROM teams WHERE name = 'Team 1'").fetchone()[0] == 'KR'
+        assert replica.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 10
+
+        # Full rating calculation writes through the replica's file connection
+        config_id, ratings = EloCalculatorService(replica).calculate_or_load_elos(variant='base', k_factor=24)
+        assert db.conn.execute("SELECT COUNT(*) FROM predictions WHERE config_id = ?",
+                               (config_id,)).fetchone()[0] == 10
+    finally:
+        replica.close()
+
+
+def test_memory_replica_follows_the_file_on_failed_writes(db):
+    db.get_or_create_team('Lonely')
+    replica = DatabaseManager(db.db_path, replica='memory')
+    try:
+        # Written by another process after the replica was copied
+        db.execute_write("INSERT INTO teams (name) VALUES ('Ghost')")
+        db.execute_write("DELETE FROM teams WHERE name = 'Lonely'")
+        db.commit()
+
+        # Fails on the file: the replica must not keep the row
+        with pytest.raises(sqlite3.IntegrityError):
+            replica.executemany_write("INSERT INTO teams (name) VALUES (?)", [('Ghost',)])
+        replica.write_conn.rollback()
+        assert replica.conn.execute("SELECT COUNT(*) FROM teams WHERE name = 'Ghost'").fetchone()[0] == 0
+
+        # Fails only on the replica: it is re-copied from the file on commit
+        replica.executemany_write("INSERT INTO teams (name) VALUES (?)", [('Lonely',)])
+        replica.commit()
+        for conn in (replica.conn, db.conn):
+            assert sorted(row[0] for row in conn.execute("SELECT name FROM teams")) == ['Ghost', 'Lonely']
+    finally:
+        replica.close()
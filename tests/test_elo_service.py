@@ -0,0 +1,140 @@
+"""
+ELO Calculator Service Tests - stored configs, retention, incremental refresh
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from core.elo_calculator_service import EloCalculatorService
+from core.rating_cache import RATING_CACHE
+
+from tests.conftest import add_matches
+
+
+def _history_rows(db, config_id):
+    return {
+        table: db.conn.execute(f"SELECT COUNT(*) FROM {table} WHERE config_id = ?", (config_id,)).fetchone()[0]
+        for table in EloCalculatorService.CONFIG_TABLES
+    }
+
+
+def test_delete_config_keeps_other_configs(match_db):
+    service = EloCalculatorService(match_db)
+
+    configs = {}
+    for storage in ('full', 'compact'):
+        service.rating_storage = storage
+        for k_factor in (20, 24):
+            config_id, ratings = service.calculate_or_load_elos(variant='base', k_factor=k_factor)
+            configs[config_id] = (storage, k_factor, ratings)
+
+    deleted = [config_id for config_id, (_, k_factor, _) in configs.items() if k_factor == 20]
+    kept = [config_id for config_id in configs if config_id not in deleted]
+    before = {config_id: _history_rows(match_db, config_id) for config_id in kept}
+
+    for config_id in deleted:
+        service.delete_config(config_id, batch_size=7)
+
+    for config_id in deleted:
+        assert sum(_history_rows(match_db, config_id).values()) == 0
+
+    RATING_CACHE.invalidate()
+    for config_id in kept:
+        storage, k_factor, ratings = configs[config_id]
+        assert _history_rows(match_db, config_id) == before[config_id]
+        assert before[config_id]['predictions'] == 120
+
+        service.rating_storage = storage
+        loaded_id, loaded = service.calculate_or_load_elos(variant='base', k_factor=k_factor)
+        assert loaded_id == config_id
+        assert len(loaded) == len(ratings) > 0
+        assert {team: round(data['elo'], 6) for team, data in loaded.items()} == \
+               {team: round(data['elo'], 6) for team, data in ratings.items()}
+
+
+def test_retention_evicts_only_least_recently_used(match_db):
+    service = EloCalculatorService(match_db)
+    first, _ = service.calculate_or_load_elos(variant='base', k_factor=20)
+    second, _ = service.calculate_or_load_elos(variant='base', k_factor=24)
+
+    evicted = service.enforce_retention(max_configs=1, keep=(second,))
+
+    assert evicted == [first]
+    assert _history_rows(match_db, second)['predictions'] == 120
+
+
+HISTORY_QUERIES = {
+    'full': """
+        SELECT team_id, match_id, ROUND(elo_value, 9), matches_played, wins, losses, date_ts
+        FROM elo_ratings WHERE config_id = ? ORDER BY team_id, matches_played
+    """,
+    'compact': """
+        SELECT team_id, matches_played, match_id, ROUND(elo_value, 9), wins
+        FROM elo_ratings_compact WHERE config_id = ? ORDER BY team_id, matches_played
+    """,
+}
+
+
+def _stored(db, storage, config_id):
+    history = db.conn.execute(HISTORY_QUERIES[storage], (config_id,)).fetchall()
+    predictions = db.conn.execute("""
+        SELECT match_id, team1_id, team2_id, ROUND(team1_elo, 9), ROUND(team2_elo, 9),
+               ROUND(p_team1, 9), predicted_winner_id, correct
+        FROM predictions WHERE config_id = ? ORDER BY match_id
+    """, (config_id,)).fetchall()
+    return [tuple(row) for row in history], [tuple(row) for row in predictions]
+
+
+@pytest.mark.parametrize('storage', ['full', 'compact'])
+def test_incremental_refresh_matches_forced_recalculation(match_db, storage, capsys):
+    service = EloCalculatorService(match_db, rating_storage=storage)
+    service.calculate_or_load_elos(variant='base', k_factor=24)
+
+    # A corrected result in the middle of the history and new matches at the end
+    match = match_db.conn.execute("SELECT * FROM matches WHERE external_id = 'm60'").fetchone()
+    team1, team2 = (match_db.conn.execute("SELECT name FROM teams WHERE id = ?", (team_id,)).fetchone()[0]
+                    for team_id in (match['team1_id'], match['team2_id']))
+    assert match_db.upsert_match(team1, team2, match['team2_score'], match['team1_score'],
+                                 datetime.fromtimestamp(match['date_ts'], timezone.utc).replace(tzinfo=None),
+                                 tournament_name='LEC 2024 Spring', external_id='m60')[1] == 'updated'
+    add_matches(match_db, 15, start=datetime(2024, 6, 1), prefix='n', seed=3)
+
+    RATING_CACHE.invalidate()
+    capsys.readouterr()
+    config_id, refreshed = service.calculate_or_load_elos(variant='base', k_factor=24)
+    assert '[REFRESH]' in capsys.readouterr().out
+    refreshed_rows = _stored(match_db, storage, config_id)
+
+    RATING_CACHE.invalidate()
+    forced_id, forced = service.calculate_or_load_elos(variant='base', k_factor=24, force_recalculate=True)
+
+    assert forced_id == config_id
+    assert {team: round(data['elo'], 9) for team, data in refreshed.items()} == \
+           {team: round(data['elo'], 9) for team, data in forced.items()}
+    assert refreshed_rows == _stored(match_db, storage, config_id)
+    assert len(refreshed_rows[1]) == 135
+
+
+@pytest.mark.parametrize('storage', ['full', 'compact'])
+def test_refresh_with_undated_matches_loads_latest_ratings(match_db, storage):
+    teams = [row[0] for row in match_db.conn.execute("SELECT name FROM teams ORDER BY id LIMIT 2")]
+    match_db.insert_match(teams[0], teams[1], 2, 0, 'Jan 5 2024', tournament_name='LEC 2024 Spring',
+                          external_id='undated')
+    service = EloCalculatorService(match_db, rating_storage=storage)
+    service.calculate_or_load_elos(variant='base', k_factor=24)
+
+    # Refresh after a new match of two other teams: the undated snapshots are rewritten,
+    # the later snapshots of the undated match's teams are not
+    others = [row[0] for row in match_db.conn.execute("SELECT name FROM teams ORDER BY id LIMIT 2 OFFSET 2")]
+    match_db.insert_match(others[0], others[1], 2, 1, datetime(2024, 6, 1), tournament_name='LEC 2024 Spring',
+                          external_id='n0')
+    RATING_CACHE.invalidate()
+    config_id, _ = service.calculate_or_load_elos(variant='base', k_factor=24)
+    RATING_CACHE.invalidate()
+    loaded = service._load_ratings_from_db(config_id)
+
+    forced_id, forced = service.calculate_or_load_elos(variant='base', k_factor=24, force_recalculate=True)
+    assert forced_id == config_id
+    assert {team: (round(data['elo'], 9), data['matches']) for team, data in loaded.items()} == \
+           {team: (round(data['elo'], 9), data['matches']) for team, data in forced.items()}
@@ -0,0 +1,83 @@
+"""
+Import Ledger Tests - skipping completed tournaments, retrying failures
+"""
+
+from datetime import datetime
+
+import pytest
+
+from core.import_ledger import ImportLedger
+from core.import_pipeline import ImportPipeline
+
+from tests.conftest import FakeCargo, manifest, run_pipeline, schedule_rows
+
+
+def test_completed_past_season_is_final_failed_is_retried(db):
+    ledger = ImportLedger(db)
+    current = datetime.now().year
+
+    ledger.record('matchschedule', 'LCK/2023 Season/Spring Season', 'done', rows_found=90)
+    ledger.record('matchschedule', f'LCK/{current} Season/Spring Season', 'done', rows_found=90)
+    ledger.record('matchschedule', 'LCK/2023 Season/Summer Season', 'failed', error='ratelimited')
+
+    assert not ledger.should_import('matchschedule', 'LCK/2023 Season/Spring Season')
+    assert ledger.should_import('matchschedule', 'LCK/2023 Season/Spring Season', recheck=True)
+    # The running season can still change
+    assert ledger.should_import('matchschedule', f'LCK/{current} Season/Spring Season')
+    assert ledger.should_import('matchschedule', 'LCK/2023 Season/Summer Season')
+    assert ledger.should_import('matchschedule', 'LCK/2022 Season/Spring Season')
+
+
+def test_pipeline_skips_completed_and_retries_failed(db):
+    pages = ['LCO/2024 Season/Split 1', 'LJL/2024 Season/Spring Season']
+    cargo = FakeCargo([row for page in pages for row in schedule_rows(page, 5)])
+    cargo.failing = {pages[1]}
+
+    first = run_pipeline(ImportPipeline(cargo, db_path=db.db_path, progress_every=0, group_queries=False),
+                         manifest(pages))['stats']
+    assert first['tournaments_imported'] == 1
+    assert first['tournaments_failed'] == 1
+
+    ledger = ImportLedger(db)
+    assert ledger.get('matchschedule', pages[0])['status'] == 'done'
+    assert ledger.get('matchschedule', pages[1])['status'] == 'failed'
+
+    cargo.failing = set()
+    cargo.queries.clear()
+    second = run_pipeline(ImportPipeline(cargo, db_path=db.db_path, progress_every=0, group_queries=False),
+                          manifest(pages))['stats']
+
+    # Only the failed tournament is fetched again
+    assert len(cargo.queries) == 1 and pages[1] in cargo.queries[0]
+    assert second['tournaments_skipped'] == 1
+    assert second['tournaments_imported'] == 1
+    assert second['matches_inserted'] == 5
+    assert ledger.get('matchschedule', pages[1])['status'] == 'done'
+    assert ledger.get('matchschedule', pages[1])['attempts'] == 2
+
+
+def test_import_season_records_failed_playoffs_query(db, monkeypatch):
+    pytest.importorskip('requests')
+    from core.leaguepedia_loader import CargoQueryError, LeaguepediaLoader
+    from scripts.import_all_historical_data import LEDGER_SOURCE, import_season
+
+    loader = LeaguepediaLoader.__new__(LeaguepediaLoader)
+    loader.db = db
+
+    def get_tournament_matches(tournament_name, include_players=True, raise_errors=False, **kwargs):
+        if 'Playoffs' in tournament_name:
+            if raise_errors:
+                raise CargoQueryError("ratelimited")
+            return 0
+        return 12
+
+    monkeypatch.setattr(loader, 'get_tournament_matches', get_tournament_matches, raising=False)
+    ledger = ImportLedger(db)
+
+    with pytest.raises(CargoQueryError):
+        import_season(loader, ledger, 'LEC', 2023, 'Spring', include_playoffs=True)
+
+    entry = ledger.get(LEDGER_SOURCE, 'LEC/2023/Spring')
+    assert entry['status'] == 'failed'
+    assert 'ratelimited' in entry['error']
+    assert ledger.should_import(LEDGER_SOURCE, 'LEC/2023/Spring')
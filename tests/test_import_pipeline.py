@@ -0,0 +1,85 @@
+"""
+Import Pipeline Tests - grouped fetching, demultiplexing, error propagation
+"""
+
+import pytest
+
+from core.import_pipeline import ImportPipeline
+
+from tests.conftest import FakeCargo, manifest, run_pipeline, schedule_rows
+
+
+def test_grouped_fetch_splits_rows_by_tournament(db):
+    sizes = {'LCO/2024 Season/Split 1': 12, 'LCO/2024 Season/Split 2': 7, 'LCO/2024 Season/Split 3': 0,
+             'LJL/2024 Season/Spring Season': 20}
+    rows = [row for page, count in sizes.items() for row in schedule_rows(page, count)]
+    cargo = FakeCargo(rows)
+
+    pipeline = ImportPipeline(cargo, db_path=db.db_path, progress_every=0)
+    stats = run_pipeline(pipeline, manifest(sizes))['stats']
+
+    assert len(cargo.queries) == 1
+    assert stats['tournaments_imported'] == 3
+    assert stats['tournaments_no_data'] == 1
+    assert stats['matches_inserted'] == 39
+
+    per_tournament = dict(db.conn.execute("""
+        SELECT t.name, COUNT(*) FROM matches m JOIN tournaments t ON t.id = m.tournament_id GROUP BY t.name
+    """).fetchall())
+    assert per_tournament == {page.replace('/', ' '): count for page, count in sizes.items() if count}
+
+
+def test_ungrouped_fetch_imports_the_same_rows(db):
+    pages = ['LCO/2024 Season/Split 1', 'LCO/2024 Season/Split 2']
+    cargo = FakeCargo([row for page in pages for row in schedule_rows(page, 5)])
+
+    stats = run_pipeline(ImportPipeline(cargo, db_path=db.db_path, progress_every=0, group_queries=False),
+                         manifest(pages))['stats']
+
+    assert len(cargo.queries) == 2
+    assert stats['matches_inserted'] == 10
+
+
+def test_fetch_error_marks_only_its_group_failed(db):
+    pages = ['LCO/2024 Season/Split 1', 'LJL/2024 Season/Spring Season']
+    cargo = FakeCargo([row for page in pages for row in schedule_rows(page, 5)])
+    cargo.failing = {pages[1]}
+
+    pipeline = ImportPipeline(cargo, db_path=db.db_path, progress_every=0, group_queries=False)
+    stats = run_pipeline(pipeline, manifest(pages))['stats']
+
+    assert stats['tournaments_imported'] == 1
+    assert stats['tournaments_failed'] == 1
+    assert stats['matches_inserted'] == 5
+
+
+def test_writer_error_stops_pipeline_and_is_raised(db, monkeypatch):
+    pages = [f"LCO/20{10 + i} Season/Split 1" for i in range(30)]
+    cargo = FakeCargo([row for page in pages for row in schedule_rows(page, 3)])
+
+    def broken_write(self, db, batch):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(ImportPipeline, '_write_batch', broken_write)
+    pipeline = ImportPipeline(cargo, db_path=db.db_path, progress_every=0, group_queries=False,
+                              queue_size=2, batch_size=1)
+    outcome = run_pipeline(pipeline, manifest(pages))
+
+    assert isinstance(outcome.get('error'), RuntimeError)
+    assert 'database is locked' in str(outcome['error'])
+    assert pipeline.stats['tournaments_failed'] > 0
+    # The fetcher stopped early instead of fetching everything into a dead writer
+    assert len(cargo.queries) < len(pages)
+
+
+def test_expected_matches_prefers_discovered_match_count():
+    assert ImportPipeline.expected_matches({'name': 'LCK 2024 Spring', 'match_count': 17}) == 17
+    assert ImportPipeline.expected_matches({'name': 'LCK 2024 Spring', 'sample_matches': 3}) == 3
+
+
+@pytest.mark.parametrize('page,expected', [
+    ('LCK/2024_Season/Spring_Season', 'lck/2024 season/spring season'),
+    (' LEC/2024 Season/Summer Season ', 'lec/2024 season/summer season'),
+])
+def test_page_key_normalizes_overview_pages(page, expected):
+    assert ImportPipeline._page_key(page) == expected
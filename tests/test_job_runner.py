@@ -0,0 +1,71 @@
+"""
+Job Runner Tests - script timeouts, worker resilience
+"""
+
+import time
+
+import pytest
+
+import core.job_runner as job_runner
+from core.job_runner import JobQueue, JobWorker
+
+
+def test_silent_script_is_killed_after_timeout(tmp_path, monkeypatch):
+    (tmp_path / 'silent.py').write_text("import time\ntime.sleep(60)\n")
+    monkeypatch.setattr(job_runner, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.setattr(job_runner, 'ALLOWED_SCRIPTS', ('silent.py',))
+
+    started = time.time()
+    with pytest.raises(TimeoutError):
+        job_runner._run_script(None, {'script': 'silent.py', 'timeout': 1}, lambda *args: None)
+    assert time.time() - started < 10
+
+
+def test_worker_survives_queue_errors(db, monkeypatch):
+    calls = []
+    claim = JobQueue.claim
+
+    def flaky_claim(self, worker):
+        calls.append(worker)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return claim(self, worker)
+
+    monkeypatch.setattr(JobQueue, 'claim', flaky_claim)
+    monkeypatch.setattr(job_runner, 'ERROR_BACKOFF', 0.05)
+    monkeypatch.setattr(job_runner, 'POLL_INTERVAL', 0.05)
+
+    worker = JobWorker(str(db.db_path), 'test-worker')
+    worker.start()
+    try:
+        deadline = time.time() + 10
+        while len(calls) < 3 and time.time() < deadline:
+            time.sleep(0.05)
+        assert worker.is_alive()
+        assert len(calls) >= 3
+    finally:
+        worker.stop()
+        worker.join(5)
+    assert not worker.is_alive()
+
+
+def test_running_job_keeps_its_heartbeat(db, monkeypatch):
+    def slow_job(job_db, params, progress):
+        time.sleep(0.5)
+        return job_db.conn.execute("SELECT heartbeat_at FROM jobs WHERE status = 'running'").fetchone()[0]
+
+    monkeypatch.setitem(job_runner.JOB_KINDS, 'slow', (slow_job, lambda params: 'slow'))
+    monkeypatch.setattr(job_runner, 'HEARTBEAT_INTERVAL', 0.05)
+
+    queue = JobQueue(db)
+    job_id = queue.enqueue('slow')
+    assert queue.find_active('slow:slow')['id'] == job_id
+    job = queue.claim('test-worker')
+    db.execute_write("UPDATE jobs SET heartbeat_at = '2000-01-01 00:00:00' WHERE id = ?", (job_id,))
+    db.commit()
+
+    queue.run(job)
+    job = queue.get(job_id)
+    assert job['status'] == 'done'
+    assert job['result'] != '2000-01-01 00:00:00'
+    assert queue.find_active('slow:slow') is None
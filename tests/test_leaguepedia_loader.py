@@ -0,0 +1,47 @@
+"""
+Leaguepedia Loader Tests - paging through Cargo results
+"""
+
+import pytest
+
+pytest.importorskip('requests')
+
+from core.leaguepedia_loader import CargoQueryError, LeaguepediaLoader
+
+
+def _loader(monkeypatch, pages, failing=()):
+    """Loader without session whose Cargo pages come from a list"""
+    loader = LeaguepediaLoader.__new__(LeaguepediaLoader)
+    monkeypatch.setattr(loader, 'CARGO_PAGE_SIZE', 2, raising=False)
+
+    def query_cargo(tables, fields, offset=0, raise_errors=False, **kwargs):
+        index = offset // 2
+        if index in failing:
+            return loader._query_failed("ratelimited", raise_errors)
+        return pages[index] if index < len(pages) else []
+
+    monkeypatch.setattr(loader, '_query_cargo', query_cargo, raising=False)
+    return loader
+
+
+def test_iter_cargo_pages_until_a_short_page(monkeypatch):
+    loader = _loader(monkeypatch, [[{'n': 1}, {'n': 2}], [{'n': 3}]])
+    assert [row['n'] for row in loader.iter_cargo('Teams', 'Name')] == [1, 2, 3]
+
+
+def test_iter_cargo_raises_when_a_later_page_fails(monkeypatch):
+    loader = _loader(monkeypatch, [[{'n': 1}, {'n': 2}], [{'n': 3}, {'n': 4}]], failing={1})
+
+    rows = []
+    with pytest.raises(CargoQueryError):
+        for row in loader.iter_cargo('Teams', 'Name'):
+            rows.append(row)
+    assert len(rows) == 2
+
+
+def test_iter_cargo_first_page_failure_follows_raise_errors(monkeypatch):
+    loader = _loader(monkeypatch, [[{'n': 1}]], failing={0})
+
+    assert list(loader.iter_cargo('Teams', 'Name')) == []
+    with pytest.raises(CargoQueryError):
+        list(loader.iter_cargo('Teams', 'Name', raise_errors=True))
@@ -0,0 +1,62 @@
+"""
+Leaguepedia Sync Tests - watermark, upserts of corrected matches
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('requests')
+
+from core.leaguepedia_loader import CargoQueryError
+from core.leaguepedia_sync import SYNC_NAME, LeaguepediaSync
+
+from tests.conftest import FakeCargo, schedule_rows
+
+
+PAGE = 'LCK/2026 Season/Spring Season'
+
+
+def _sync(cargo, db):
+    cargo.limiter = SimpleNamespace(requests=0)
+    return LeaguepediaSync(cargo, db, leagues=['LCK/%'], manifests=[])
+
+
+def test_sync_upserts_and_advances_watermark(db):
+    cargo = FakeCargo(schedule_rows(PAGE, 10, start=datetime(2026, 3, 1)))
+    sync = _sync(cargo, db)
+
+    first = sync.run(since=datetime(2026, 1, 1))
+    assert (first['inserted'], first['updated'], first['unchanged']) == (10, 0, 0)
+    assert db.get_sync_watermark(SYNC_NAME) == '2026-03-10 00:00:00'
+
+    # A corrected result inside the lookback window and a new match
+    cargo.rows[-1].update({'Team1Score': '0', 'Team2Score': '2', 'Winner': '2'})
+    cargo.rows.extend(schedule_rows(PAGE, 1, start=datetime(2026, 3, 12), prefix='late'))
+
+    second = sync.run()
+    assert "DateTime_UTC >= '2026-03-07 00:00:00'" in cargo.queries[-1]
+    assert (second['inserted'], second['updated'], second['unchanged']) == (1, 1, 3)
+    assert db.get_sync_watermark(SYNC_NAME) == '2026-03-12 00:00:00'
+
+    winner = db.conn.execute("""
+        SELECT t.name FROM matches m JOIN teams t ON t.id = m.winner_id WHERE m.external_id = ?
+    """, (f"{PAGE}_9",)).fetchone()[0]
+    assert winner == cargo.rows[9]['Team2']
+
+
+def test_failed_sync_keeps_watermark(db, monkeypatch):
+    cargo = FakeCargo(schedule_rows(PAGE, 5, start=datetime(2026, 3, 1)))
+    sync = _sync(cargo, db)
+    sync.run(since=datetime(2026, 1, 1))
+
+    def give_up(*args, **kwargs):
+        raise CargoQueryError("ratelimited")
+
+    monkeypatch.setattr(cargo, 'iter_cargo', give_up)
+    stats = sync.run()
+
+    assert stats['error'] == 'ratelimited'
+    assert stats['inserted'] == stats['updated'] == 0
+    assert db.get_sync_watermark(SYNC_NAME) == '2026-03-05 00:00:00'
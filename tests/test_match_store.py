@@ -0,0 +1,60 @@
+"""
+Match Store Tests - undated matches, concurrent exports, stale versions
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from core.match_store import MatchStore
+
+from tests.conftest import add_matches
+
+
+def test_undated_matches_export_as_nat(db, tmp_path):
+    add_matches(db, 5)
+    db.insert_match('Team 1', 'Team 2', 2, 1, 'Jan 5 2024', external_id='undated')
+
+    store = MatchStore.export(db, base_dir=tmp_path / 'store')
+    df = store.to_dataframe()
+
+    assert len(df) == 6
+    assert df['date'].isna().sum() == 1
+    assert df['date'].min() == pd.Timestamp(2024, 1, 1)
+    assert sum(pd.isna(match['date']) for match in store.to_dicts()) == 1
+    assert json.loads((tmp_path / 'store' / 'current.json').read_text())['undated'] == 1
+
+
+def test_export_of_an_existing_version_succeeds(db, tmp_path):
+    add_matches(db, 5)
+    base = tmp_path / 'store'
+    first = MatchStore.export(db, base_dir=base)
+    inode = (base / first.version).stat().st_ino
+
+    # Same data exported again (e.g. by another process at the same time)
+    second = MatchStore.export(db, base_dir=base)
+
+    assert second.version == first.version
+    # The store other readers may have open is left in place
+    assert (base / first.version).stat().st_ino == inode
+    assert len(second) == 5
+    assert not [entry for entry in base.iterdir() if entry.name.startswith('.')]
+
+
+def test_remove_stale_keeps_versions_newer_than_current(db, tmp_path):
+    add_matches(db, 5)
+    base = tmp_path / 'store'
+    store = MatchStore.export(db, base_dir=base)
+    current_mtime = (base / store.version).stat().st_mtime
+
+    older, newer = base / 'older', base / 'newer'
+    for directory, offset in ((older, -60), (newer, 60)):
+        directory.mkdir()
+        os.utime(directory, (current_mtime + offset, current_mtime + offset))
+
+    MatchStore._remove_stale(base)
+
+    assert not older.exists()
+    assert newer.exists()
+    assert (base / store.version).exists()
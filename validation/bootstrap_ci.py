@@ -143,7 +143,7 @@ def analyze_cross_regional_ci(df: pd.DataFrame,
 
     print(f"\n[DATA] Processing {len(df)} matches...")
 
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -265,7 +265,7 @@ if __name__ == "__main__":
 
     # Load data
     print("\n[LOADING] Loading data...")
-    with UnifiedDataLoader() as loader:
+    with UnifiedDataLoader(use_store=True) as loader:
         df = loader.load_matches(source='auto')
 
     print(f"[OK] Loaded {len(df)} matches")
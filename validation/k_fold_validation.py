@@ -76,7 +76,7 @@ def evaluate_fold(train_df: pd.DataFrame, test_df: pd.DataFrame,
     )
 
     # Train on training data
-    for _, row in train_df.iterrows():
+    for row in train_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -100,7 +100,7 @@ def evaluate_fold(train_df: pd.DataFrame, test_df: pd.DataFrame,
     total = 0
     predictions = []
 
-    for _, row in test_df.iterrows():
+    for row in test_df.to_dict('records'):
         try:
             team1 = row['team1']
             team2 = row['team2']
@@ -168,7 +168,7 @@ def run_k_fold_validation(k: int = 5, variant_class=DynamicOffsetElo) -> Dict:
 
     # Load data
     print("\n[LOADING] Loading data...")
-    with UnifiedDataLoader() as loader:
+    with UnifiedDataLoader(use_store=True) as loader:
         df = loader.load_matches(source='auto')
 
     print(f"[OK] Loaded {len(df)} matches")